@@ -0,0 +1,31 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import vid_edit_utils as veu
+
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                                     reason = "ffmpeg & ffprobe must be on PATH")
+
+
+@pytest.fixture(autouse = True)
+def _isolated_caches(tmp_path, monkeypatch):
+    """ Keeps each test's on-disk caches out of the repo & away from other tests """
+    monkeypatch.setattr(veu, "PROBE_CACHE_DB_PATH", str(tmp_path / "probe_cache.sqlite"))
+    monkeypatch.setattr(veu, "PREVIEW_CACHE_DIR_PATH", str(tmp_path / "preview_cache"))
+    veu.clear_probe_cache()
+
+
+@pytest.fixture(scope = "session")
+def test_vid_path(tmp_path_factory):
+    """ 4 sec 320x240 25 fps vid w/ audio """
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        pytest.skip("ffmpeg & ffprobe must be on PATH")
+    vid_path = str(tmp_path_factory.mktemp("vids") / "test_vid.mp4")
+    veu.make_synthetic_test_vid(vid_path, vid_dim_tup = (320, 240), vid_len = 4, fps = 25)
+    return vid_path
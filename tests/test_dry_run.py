@@ -0,0 +1,86 @@
+import os
+import subprocess
+
+import pytest
+
+import vid_edit_utils as veu
+from conftest import requires_ffmpeg
+
+
+@pytest.fixture
+def ffmpeg_call_l(monkeypatch):
+    """ argv lists of every ffmpeg (not ffprobe) process started while the test runs, from any thread """
+    call_l = []
+    real_popen = subprocess.Popen
+
+    def recording_popen(args, *popen_args, **popen_kwargs):
+        if os.path.basename(str(args[0])) == "ffmpeg":
+            call_l.append(list(args))
+        return real_popen(args, *popen_args, **popen_kwargs)
+
+    monkeypatch.setattr(subprocess, "Popen", recording_popen)
+    return call_l
+
+
+@requires_ffmpeg
+def test_dry_run_plans_op_without_running_it(test_vid_path, tmp_path, ffmpeg_call_l):
+    out_vid_path = tmp_path / "out" / "scaled.mp4"
+    with veu.dry_run() as planned_cmd_l:
+        veu.scale_vid((160, 120), test_vid_path, str(out_vid_path))
+
+    assert len(planned_cmd_l) == 1
+    assert planned_cmd_l[0][0] == "ffmpeg" and planned_cmd_l[0][-1] == str(out_vid_path)
+    assert ffmpeg_call_l == []
+    assert not out_vid_path.parent.exists()
+
+
+@requires_ffmpeg
+def test_dry_run_reaches_worker_threads(test_vid_path, tmp_path, ffmpeg_call_l):
+    out_vid_path_time_tup_l = [(str(tmp_path / "a.mp4"), (0, 1)), (str(tmp_path / "b.mp4"), (2, 3))]
+    planned_cmd_l = veu.plan_op("trim_vid_multi", test_vid_path, out_vid_path_time_tup_l, mode = "reencode", num_workers = 2)
+
+    assert len(planned_cmd_l) == 2
+    assert ffmpeg_call_l == []
+    assert not any(os.path.exists(out_vid_path) for out_vid_path, _ in out_vid_path_time_tup_l)
+
+
+@requires_ffmpeg
+def test_dry_run_reaches_pipeline_chunks(test_vid_path, tmp_path, ffmpeg_call_l):
+    out_vid_path = tmp_path / "chunked.mp4"
+    with veu.dry_run() as planned_cmd_l:
+        veu.Vid_Pipeline(test_vid_path).scale((160, 120)).run(str(out_vid_path), num_chunks = 2)
+
+    assert len(planned_cmd_l) >= 2 # Chunks + concat
+    assert ffmpeg_call_l == []
+    assert not out_vid_path.exists()
+
+
+@requires_ffmpeg
+def test_dry_run_is_reset_on_exit(test_vid_path, tmp_path):
+    with veu.dry_run():
+        pass
+    out_vid_path = tmp_path / "scaled.mp4"
+    veu.scale_vid((160, 120), test_vid_path, str(out_vid_path))
+    assert out_vid_path.is_file()
+
+
+@requires_ffmpeg
+def test_pipeline_chunks_stay_in_thread_budget(test_vid_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(veu, "FFMPEG_THREADS", 1)
+    with veu.dry_run() as planned_cmd_l:
+        veu.Vid_Pipeline(test_vid_path).scale((160, 120)).run(str(tmp_path / "chunked.mp4"), num_chunks = 2)
+
+    for cmd_l in planned_cmd_l[:-1]: # Chunks, not concat
+        assert cmd_l.count("-threads") == 1
+        assert cmd_l[cmd_l.index("-threads") + 1] == "1"
+
+
+@requires_ffmpeg
+def test_dry_run_doesnt_index_vid(test_vid_path, tmp_path, ffmpeg_call_l):
+    vid_path = tmp_path / "vid.mp4"
+    vid_path.write_bytes(open(test_vid_path, "rb").read())
+    planned_cmd_l = veu.plan_op("get_vid_index", str(vid_path))
+
+    assert len(planned_cmd_l) == 1 and planned_cmd_l[0][0] == "ffmpeg"
+    assert ffmpeg_call_l == []
+    assert not os.path.exists(veu._get_vid_index_path(str(vid_path)))
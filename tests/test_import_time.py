@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import requires_ffmpeg
+
+REPO_DIR_PATH = str(Path(__file__).resolve().parents[1])
+HEAVY_MODULE_NAME_L = ["numpy", "moviepy", "PIL", "cv2", "ffmpeg"]
+MAX_IMPORT_SEC = 1.0 # Importing moviepy.editor alone used to take seconds
+
+
+def _run_in_fresh_python(code_str):
+    """ Runs code_str in a new interpreter, so modules imported by other tests don't count, returns what it prints as json """
+    env = dict(os.environ, PYTHONPATH = os.pathsep.join(filter(None, [REPO_DIR_PATH, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run([sys.executable, "-c", code_str], capture_output = True, text = True, env = env, check = True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_is_fast_and_skips_heavy_deps():
+    out_d = _run_in_fresh_python(f"""
+import json, sys, time
+start_time = time.perf_counter()
+import vid_edit_utils
+import_sec = time.perf_counter() - start_time
+print(json.dumps({{"import_sec": import_sec,
+                  "loaded_heavy_module_name_l": [name for name in {HEAVY_MODULE_NAME_L!r} if name in sys.modules]}}))
+""")
+    assert out_d["loaded_heavy_module_name_l"] == []
+    assert out_d["import_sec"] < MAX_IMPORT_SEC
+
+
+@requires_ffmpeg
+def test_metadata_functions_skip_heavy_deps(test_vid_path):
+    out_d = _run_in_fresh_python(f"""
+import json, sys
+import vid_edit_utils
+vid_edit_utils.PROBE_CACHE_DB_PATH = None
+vid_len = vid_edit_utils.get_vid_length({test_vid_path!r})
+vid_dim_tup = vid_edit_utils.get_vid_dims({test_vid_path!r})
+print(json.dumps({{"vid_len": vid_len, "vid_dim_tup": vid_dim_tup,
+                  "loaded_heavy_module_name_l": [name for name in {HEAVY_MODULE_NAME_L!r} if name in sys.modules]}}))
+""")
+    assert out_d["loaded_heavy_module_name_l"] == []
+    assert abs(out_d["vid_len"] - 4) < 0.1
+    assert out_d["vid_dim_tup"] == [320, 240]
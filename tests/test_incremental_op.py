@@ -0,0 +1,37 @@
+import os
+from pathlib import Path
+
+import vid_edit_utils as veu
+from conftest import requires_ffmpeg
+
+pytestmark = requires_ffmpeg
+
+
+def test_up_to_date_output_is_skipped(test_vid_path, tmp_path, monkeypatch):
+    out_vid_path = Path(tmp_path / "scaled.mp4")
+    assert veu.scale_vid((160, 120), test_vid_path, out_vid_path, prep_mode = "skip_if_up_to_date") == out_vid_path
+    assert os.path.isfile(veu._get_op_manifest_path(out_vid_path))
+
+    def fail_run_cmd(*args, **kwargs):
+        raise AssertionError("skip_if_up_to_date re-ran an up to date op")
+    monkeypatch.setattr(veu, "_run_cmd", fail_run_cmd)
+    assert veu.scale_vid((160, 120), test_vid_path, out_vid_path, prep_mode = "skip_if_up_to_date") == out_vid_path
+    assert veu.scale_vid((160, 120), test_vid_path, str(out_vid_path), prep_mode = "skip_if_up_to_date") == str(out_vid_path)
+    assert [path.name for path in tmp_path.iterdir() if path.name.endswith(".tmp")] == []
+
+
+def test_changed_params_rerun_op(test_vid_path, tmp_path):
+    out_vid_path = str(tmp_path / "scaled.mp4")
+    veu.scale_vid((160, 120), test_vid_path, out_vid_path, prep_mode = "skip_if_up_to_date")
+    mtime_ns = os.stat(out_vid_path).st_mtime_ns
+
+    veu.scale_vid((80, 60), test_vid_path, out_vid_path, prep_mode = "skip_if_up_to_date")
+    assert os.stat(out_vid_path).st_mtime_ns != mtime_ns
+
+
+def test_overwrite_mode_writes_no_manifest(test_vid_path, tmp_path):
+    out_vid_path = str(tmp_path / "scaled.mp4")
+    veu.scale_vid((160, 120), test_vid_path, out_vid_path, prep_mode = "overwrite")
+
+    assert os.path.isfile(out_vid_path)
+    assert not os.path.exists(veu._get_op_manifest_path(out_vid_path))
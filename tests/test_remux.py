@@ -0,0 +1,52 @@
+import pytest
+
+import vid_edit_utils as veu
+
+
+def _get_stream_d(codec_type, codec_name, index = 0, attached_pic = 0):
+    return {"index": index, "codec_type": codec_type, "codec_name": codec_name, "disposition": {"attached_pic": attached_pic}}
+
+
+@pytest.mark.parametrize("stream_d, out_ext, action, out_codec", [
+    (_get_stream_d("video", "h264"), ".mp4", "copy", "h264"),
+    (_get_stream_d("video", "hevc"), ".mov", "copy", "hevc"),
+    (_get_stream_d("video", "vp8"), ".mp4", "transcode", "libx264"),
+    (_get_stream_d("video", "h264"), ".webm", "transcode", "libvpx-vp9"),
+    (_get_stream_d("video", "mjpeg", attached_pic = 1), ".mkv", "drop", None), # Cover art
+    (_get_stream_d("audio", "opus"), ".mp4", "copy", "opus"),
+    (_get_stream_d("audio", "vorbis"), ".mp4", "transcode", "aac"),
+    (_get_stream_d("audio", "pcm_s16le"), ".mkv", "copy", "pcm_s16le"), # mkv holds anything
+    (_get_stream_d("subtitle", "subrip"), ".mp4", "transcode", "mov_text"),
+    (_get_stream_d("subtitle", "mov_text"), ".mkv", "transcode", "srt"),
+    (_get_stream_d("subtitle", "hdmv_pgs_subtitle"), ".mkv", "copy", "hdmv_pgs_subtitle"),
+    (_get_stream_d("subtitle", "hdmv_pgs_subtitle"), ".mp4", "drop", None), # Bitmap subs can't become text
+    (_get_stream_d("data", "bin_data"), ".mp4", "drop", None),
+    (_get_stream_d("attachment", "ttf"), ".mkv", "copy", "ttf"),
+    (_get_stream_d("attachment", "ttf"), ".mp4", "drop", None),
+    (_get_stream_d("data", "bin_data"), ".avi", "copy", "bin_data"), # Unknown container, copied like before
+])
+def test_get_remux_stream_action(stream_d, out_ext, action, out_codec):
+    stream_action = veu._get_remux_stream_action(1, stream_d, out_ext)
+    assert (stream_action.in_i, stream_action.action, stream_action.out_codec) == (1, action, out_codec)
+
+
+@pytest.mark.parametrize("audio_codec, out_ext, is_strict", [("opus", ".mp4", True), ("flac", ".m4v", True),
+                                                             ("aac", ".mp4", False), ("opus", ".mkv", False)])
+def test_remux_cmd_allows_experimental_codecs_only_when_needed(audio_codec, out_ext, is_strict):
+    stream_action_l = [veu._get_remux_stream_action(0, _get_stream_d("video", "h264", 0), out_ext),
+                       veu._get_remux_stream_action(0, _get_stream_d("audio", audio_codec, 1), out_ext)]
+    cmd_l = veu._get_remux_cmd_l(["in.mkv"], f"out{out_ext}", stream_action_l)
+
+    assert cmd_l[-1] == f"out{out_ext}"
+    assert cmd_l[cmd_l.index("-map"):cmd_l.index("-map") + 4] == ["-map", "0:0", "-c:0", "copy"]
+    assert ("-strict" in cmd_l) == is_strict
+
+
+def test_remux_cmd_numbers_output_streams_after_drops():
+    stream_action_l = [veu._get_remux_stream_action(0, _get_stream_d("data", "bin_data", 0), ".mp4"),
+                       veu._get_remux_stream_action(0, _get_stream_d("video", "hevc", 1), ".mp4"),
+                       veu._get_remux_stream_action(1, _get_stream_d("subtitle", "subrip", 0), ".mp4")]
+    cmd_l = veu._get_remux_cmd_l(["in.mkv", "in.srt"], "out.mp4", stream_action_l)
+
+    assert cmd_l[cmd_l.index("-map"):] == ["-map", "0:1", "-c:0", "copy", "-tag:0", "hvc1",
+                                            "-map", "1:0", "-c:1", "mov_text", "out.mp4"]
@@ -0,0 +1,112 @@
+import subprocess
+
+import pytest
+
+import vid_edit_utils as veu
+from conftest import requires_ffmpeg
+
+
+@requires_ffmpeg
+def test_extracting_subs_overwrites_old_output(test_vid_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(veu, "VERIFY_LEVEL", "exists")
+    in_sub_path = tmp_path / "in.srt"
+    in_sub_path.write_text("1\n00:00:01,000 --> 00:00:02,000\nHello\n\n", encoding = "utf-8")
+    vid_path = str(tmp_path / "vid_w_subs.mkv")
+    subprocess.run(["ffmpeg", "-y", "-v", "error", "-i", test_vid_path, "-i", str(in_sub_path), "-map", "0", "-map", "1",
+                    "-c", "copy", vid_path], check = True)
+    out_sub_path = tmp_path / "out.srt"
+    out_sub_path.write_text("old", encoding = "utf-8")
+
+    veu.extract_embedded_subs_from_vid_to_separate_file(vid_path, str(out_sub_path))
+    assert [cue.text for cue in veu.read_subs(str(out_sub_path))] == ["Hello"]
+
+
+SUB_CUE_L = [veu.Sub_Cue(0.5, 1.25, "Hello"),
+             veu.Sub_Cue(61.0, 62.5, "Two\nlines"),
+             veu.Sub_Cue(3601.5, 3603.0, 'Tom & Jerry, <3 "quoted" it\'s 5 > 4')]
+
+
+@pytest.mark.parametrize("ext", list(veu.SUB_FORMAT_D))
+def test_subs_round_trip(tmp_path, ext):
+    sub_path = str(tmp_path / f"subs{ext}")
+    veu.write_subs(SUB_CUE_L, sub_path)
+    read_sub_cue_l = veu.read_subs(sub_path)
+
+    assert [cue.text for cue in read_sub_cue_l] == [cue.text for cue in SUB_CUE_L]
+    for read_cue, cue in zip(read_sub_cue_l, SUB_CUE_L):
+        assert read_cue.start == pytest.approx(cue.start, abs = 0.01) # ASS only has centisecs
+        assert read_cue.end == pytest.approx(cue.end, abs = 0.01)
+
+
+def test_read_srt_w_bom_crlf_markup_and_entities(tmp_path):
+    sub_path = tmp_path / "subs.srt"
+    sub_path.write_bytes("﻿1\r\n00:00:01,000 --> 00:00:02,500\r\n<i>Hi</i> &amp; bye\r\n\r\n"
+                         "2\r\n00:01:00,000 --> 00:01:01,000 X1:10 X2:20\r\nLast\r\n".encode("utf-8"))
+    assert veu.read_subs(str(sub_path)) == [veu.Sub_Cue(1.0, 2.5, "Hi & bye"), veu.Sub_Cue(60.0, 61.0, "Last")]
+
+
+def test_read_vtt_skips_header_notes_ids_and_settings(tmp_path):
+    sub_path = tmp_path / "subs.vtt"
+    sub_path.write_text("WEBVTT - Title\n\nNOTE a comment\n\nintro\n00:01.000 --> 00:02.000 align:start line:0\n"
+                        "<c.yellow>Hi</c> &lt;there&gt;\n\n01:00:00.000 --> 01:00:01.500\nLast\n", encoding = "utf-8")
+    assert veu.read_subs(str(sub_path)) == [veu.Sub_Cue(1.0, 2.0, "Hi <there>"), veu.Sub_Cue(3600.0, 3601.5, "Last")]
+
+
+def test_read_ttml_time_formats(tmp_path):
+    sub_path = tmp_path / "subs.ttml"
+    sub_path.write_text('<?xml version="1.0" encoding="utf-8"?>\n'
+                        '<tt xmlns="http://www.w3.org/ns/ttml" xmlns:ttp="http://www.w3.org/ns/ttml#parameter" ttp:frameRate="25">'
+                        '<body><div>'
+                        '<p begin="00:00:01:05" end="00:00:02.000">A <span>b</span><br/>c</p>'
+                        '<p begin="3s" dur="500ms">  spaced\n   out  </p>'
+                        '<p begin="100f" end="4.5s">Frames &amp; more</p>'
+                        '</div></body></tt>', encoding = "utf-8")
+    assert veu.read_subs(str(sub_path)) == [veu.Sub_Cue(1.2, 2.0, "A b\nc"), veu.Sub_Cue(3.0, 3.5, "spaced out"),
+                                            veu.Sub_Cue(4.0, 4.5, "Frames & more")]
+
+
+def test_read_ass_drops_overrides_and_sorts(tmp_path):
+    sub_path = tmp_path / "subs.ass"
+    sub_path.write_text("[Script Info]\nScriptType: v4.00+\n\n[Events]\n"
+                        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+                        "Dialogue: 0,0:00:05.00,0:00:06.00,Default,,0,0,0,,Later, w/ a comma\n"
+                        "Comment: 0,0:00:00.00,0:00:01.00,Default,,0,0,0,,Not shown\n"
+                        "Dialogue: 0,0:00:01.50,0:00:02.25,Default,,0,0,0,,{\\i1}First{\\i0}\\Nline\\htwo\n",
+                        encoding = "utf-8")
+    assert veu.read_subs(str(sub_path)) == [veu.Sub_Cue(1.5, 2.25, "First\nline two"), veu.Sub_Cue(5.0, 6.0, "Later, w/ a comma")]
+
+
+def test_unsupported_sub_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        veu.write_subs(SUB_CUE_L, str(tmp_path / "subs.scc"))
+
+
+@pytest.mark.parametrize("offset, shifted_sub_cue_l", [
+    (0, [(1.0, 2.0, "a"), (3.0, 4.0, "b")]),
+    (1.5, [(2.5, 3.5, "a"), (4.5, 5.5, "b")]),
+    (-1.5, [(0, 0.5, "a"), (1.5, 2.5, "b")]), # Starts at 0 if it ends after it
+    (-2.0, [(1.0, 2.0, "b")]), # Ending at 0 is dropped
+])
+def test_shift_subs(offset, shifted_sub_cue_l):
+    sub_cue_l = [veu.Sub_Cue(1.0, 2.0, "a"), veu.Sub_Cue(3.0, 4.0, "b")]
+    assert veu.shift_subs(sub_cue_l, offset) == [veu.Sub_Cue(*cue_tup) for cue_tup in shifted_sub_cue_l]
+
+
+@pytest.mark.parametrize("time_tup, clipped_sub_cue_l", [
+    ((0, 10), [(1.0, 2.0, "a"), (3.0, 4.0, "b")]),
+    ((1.5, 3.5), [(0, 0.5, "a"), (1.5, 2.0, "b")]), # Both clipped
+    ((2.0, 3.0), []), # Touching isn't overlapping
+    ((3.0, 3.5), [(0, 0.5, "b")]),
+    ((4.0, 10), []),
+])
+def test_clip_subs(time_tup, clipped_sub_cue_l):
+    sub_cue_l = [veu.Sub_Cue(1.0, 2.0, "a"), veu.Sub_Cue(3.0, 4.0, "b")]
+    assert veu.clip_subs(sub_cue_l, time_tup) == [veu.Sub_Cue(*cue_tup) for cue_tup in clipped_sub_cue_l]
+
+
+def test_trim_subs_writes_clipped_subs(tmp_path):
+    in_sub_path = str(tmp_path / "in.srt")
+    veu.write_subs(SUB_CUE_L, in_sub_path)
+    veu.trim_subs(in_sub_path, str(tmp_path / "out.vtt"), (60, 3602))
+    assert veu.read_subs(str(tmp_path / "out.vtt")) == [veu.Sub_Cue(1.0, 2.5, "Two\nlines"),
+                                                        veu.Sub_Cue(3541.5, 3542.0, SUB_CUE_L[2].text)]
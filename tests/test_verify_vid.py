@@ -0,0 +1,52 @@
+import pytest
+
+import vid_edit_utils as veu
+
+
+def _get_probe_data(stream_type_l, duration = 4.0):
+    has_vid = "video" in stream_type_l
+    return veu.Vid_Probe_Data(w = 320 if has_vid else None, h = 240 if has_vid else None, duration = duration,
+                              fps = 25.0 if has_vid else None, vid_codec = "h264" if has_vid else None,
+                              audio_codec = "aac" if "audio" in stream_type_l else None,
+                              stream_d_l = [{"index": i, "codec_type": stream_type} for i, stream_type in enumerate(stream_type_l)],
+                              ffprobe_d = {})
+
+
+@pytest.fixture
+def out_path(tmp_path):
+    out_path = tmp_path / "out.bin"
+    out_path.write_bytes(b"not empty")
+    return str(out_path)
+
+
+@pytest.mark.parametrize("stream_type_l, duration, expected_stream_type_l, expected_duration, is_valid", [
+    (["video", "audio"], 4.0, ["video"], 4.0, True),
+    (["audio"], 4.0, None, 4.0, True),
+    (["audio"], 4.0, ["video"], None, False),
+    (["video"], 2.0, None, 4.0, False), # Truncated
+    (["data"], 4.0, None, None, False),
+    (["subtitle"], 0.0, ["subtitle"], 4.0, True), # Like .sup from a 4 sec vid
+    (["subtitle"], 1.0, None, 4.0, True), # Like .scc, ends at its last cue
+    (["subtitle"], 1.0, ["video"], None, False),
+])
+def test_verify_vid_streams_level(out_path, monkeypatch, stream_type_l, duration, expected_stream_type_l, expected_duration, is_valid):
+    monkeypatch.setattr(veu, "get_vid_probe_data", lambda vid_path: _get_probe_data(stream_type_l, duration))
+    if is_valid:
+        assert veu.verify_vid(out_path, "streams", expected_duration, expected_stream_type_l) == out_path
+    else:
+        with pytest.raises(veu.Invalid_Vid_Exception):
+            veu.verify_vid(out_path, "streams", expected_duration, expected_stream_type_l)
+
+
+def test_verify_vid_rejects_empty_file(tmp_path):
+    (tmp_path / "empty.mp4").touch()
+    with pytest.raises(veu.Invalid_Vid_Exception):
+        veu.verify_vid(str(tmp_path / "empty.mp4"), "exists")
+
+
+def test_sub_extraction_output_only_needs_sub_streams(out_path, monkeypatch):
+    monkeypatch.setattr(veu, "get_vid_probe_data", lambda vid_path: _get_probe_data(["video", "audio"] if vid_path == "in.mp4" else ["subtitle"]))
+    monkeypatch.setattr(veu.Path, "is_file", lambda path: True)
+    with pytest.raises(veu.Invalid_Vid_Exception):
+        veu._verify_op_out(out_path, in_arg_l = ["in.mp4"], out_stream_type_l = ["video"])
+    veu._verify_op_out(out_path, in_arg_l = ["in.mp4"], out_stream_type_l = ["subtitle"])
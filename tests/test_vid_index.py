@@ -0,0 +1,45 @@
+import pytest
+
+import vid_edit_utils as veu
+
+
+@pytest.fixture
+def vid_index():
+    return veu.Vid_Index("vid.mp4", duration = 20.0, scene_cut_time_l = [4.0, 6.0, 13.0],
+                         silence_tup_l = [(0.0, 1.5), (9.0, 10.0), (18.0, 20.0)], keyframe_time_l = [0.0, 5.0, 10.0, 15.0])
+
+
+@pytest.mark.parametrize("t, nearest_scene_cut", [(0, 4.0), (4.9, 4.0), (5.1, 6.0), (9.5, 6.0), (100, 13.0)])
+def test_get_nearest_scene_cut(vid_index, t, nearest_scene_cut):
+    assert vid_index.get_nearest_scene_cut(t) == nearest_scene_cut
+
+
+def test_get_nearest_keyframe_of_vid_w_no_times():
+    assert veu.Vid_Index("vid.mp4", 10.0, [], [], []).get_nearest_keyframe(3) is None
+
+
+@pytest.mark.parametrize("t1, t2, silence_tup_l", [
+    (0, None, [(0.0, 1.5), (9.0, 10.0), (18.0, 20.0)]),
+    (1.5, 9.0, []), # Touching isn't overlapping
+    (9.5, 18.5, [(9.0, 10.0), (18.0, 20.0)]),
+])
+def test_get_silence_tup_l(vid_index, t1, t2, silence_tup_l):
+    assert vid_index.get_silence_tup_l(t1, t2) == silence_tup_l
+
+
+@pytest.mark.parametrize("min_len, max_len, non_overlapping, segment_tup_l", [
+    (2, 7, False, [(0.0, 4.0), (0.0, 6.0), (4.0, 6.0), (6.0, 13.0), (13.0, 20.0)]),
+    (2, 7, True, [(0.0, 6.0), (6.0, 13.0), (13.0, 20.0)]),
+    (8, 20, False, [(0.0, 13.0), (0.0, 20.0), (4.0, 13.0), (4.0, 20.0), (6.0, 20.0)]),
+    (0, 2, False, [(4.0, 6.0)]), # No 0 len segments
+    (0, 2, True, [(4.0, 6.0)]),
+    (0, 100, True, [(0.0, 20.0)]),
+    (30, 40, True, []),
+])
+def test_get_segment_tup_l(vid_index, min_len, max_len, non_overlapping, segment_tup_l):
+    assert vid_index.get_segment_tup_l(min_len, max_len, non_overlapping) == segment_tup_l
+
+
+def test_round_trips_through_d(vid_index):
+    loaded_vid_index = veu.Vid_Index(vid_index.vid_path, **vid_index.to_d())
+    assert loaded_vid_index.to_d() == vid_index.to_d()
@@ -0,0 +1,63 @@
+import os
+import shutil
+
+import pytest
+
+import vid_edit_utils as veu
+from conftest import requires_ffmpeg
+
+pytestmark = requires_ffmpeg
+
+
+def test_previews_are_made_and_indexed(test_vid_path, tmp_path):
+    vid_previews = veu.make_vid_previews(test_vid_path, str(tmp_path / "previews"), num_posters = 3, proxy_h = 120)
+
+    assert len(vid_previews.poster_img_path_l) == 3
+    assert all(os.path.isfile(path) for path in [*vid_previews.poster_img_path_l, *vid_previews.sprite_img_path_l,
+                                                 vid_previews.sprite_vtt_path, vid_previews.proxy_vid_path])
+    vtt_str = open(vid_previews.sprite_vtt_path, encoding = "utf-8").read()
+    assert vtt_str.startswith("WEBVTT")
+    assert "sprite_001.jpg#xywh=0,0," in vtt_str
+    assert [name for name in os.listdir(tmp_path) if "previews" in name] == ["previews"] # No temp dir left behind
+
+
+def test_unchanged_vid_is_not_decoded_again(test_vid_path, tmp_path, monkeypatch):
+    vid_previews = veu.make_vid_previews(test_vid_path, str(tmp_path / "previews"))
+
+    def fail_run_cmd(*args, **kwargs):
+        raise AssertionError("make_vid_previews() re-ran ffmpeg for cached previews")
+    monkeypatch.setattr(veu, "_run_cmd", fail_run_cmd)
+    assert veu.make_vid_previews(test_vid_path, str(tmp_path / "previews")) == vid_previews
+
+
+def test_other_files_in_out_dir_are_kept(test_vid_path, tmp_path):
+    out_dir_path = tmp_path / "previews"
+    out_dir_path.mkdir()
+    (out_dir_path / "notes.txt").write_text("keep me")
+
+    veu.make_vid_previews(test_vid_path, str(out_dir_path), num_posters = 3)
+    vid_previews = veu.make_vid_previews(test_vid_path, str(out_dir_path), num_posters = 2)
+
+    assert (out_dir_path / "notes.txt").read_text() == "keep me"
+    assert sorted(path.name for path in out_dir_path.glob("poster_*.jpg")) == ["poster_01.jpg", "poster_02.jpg"]
+    assert len(vid_previews.poster_img_path_l) == 2
+
+
+def test_out_dir_containing_vid_is_refused(test_vid_path, tmp_path):
+    vid_dir_path = tmp_path / "vids"
+    vid_dir_path.mkdir()
+    shutil.copy(test_vid_path, vid_dir_path / "vid.mp4")
+    (vid_dir_path / "notes.txt").write_text("keep me")
+
+    with pytest.raises(ValueError):
+        veu.make_vid_previews(str(vid_dir_path / "vid.mp4"), str(vid_dir_path))
+    assert sorted(os.listdir(vid_dir_path)) == ["notes.txt", "vid.mp4"]
+
+
+def test_dry_run_makes_nothing(test_vid_path, tmp_path):
+    out_dir_path = tmp_path / "previews"
+    with veu.dry_run() as planned_cmd_l:
+        assert veu.make_vid_previews(test_vid_path, str(out_dir_path)) is None
+
+    assert len(planned_cmd_l) == 1 and planned_cmd_l[0][0] == "ffmpeg"
+    assert [name for name in os.listdir(tmp_path) if "previews" in name] == []
@@ -0,0 +1,101 @@
+import json
+import os
+import time
+
+import pytest
+
+import vid_edit_utils as veu
+from conftest import requires_ffmpeg
+
+
+@pytest.fixture(params = ["sqlite", "dir"])
+def job_queue(request, tmp_path):
+    if request.param == "sqlite":
+        return veu.Sqlite_Job_Queue(tmp_path / "jobs.sqlite")
+    return veu.Dir_Job_Queue(tmp_path / "jobs")
+
+
+def test_jobs_are_claimed_once_in_order(job_queue):
+    job_id_l = job_queue.put_l([("get_vid_length", ["a.mp4"]), ("get_vid_length", ["b.mp4"])])
+
+    queued_job_a = job_queue.claim("w1")
+    queued_job_b = job_queue.claim("w2")
+    assert [queued_job_a.job_id, queued_job_b.job_id] == job_id_l
+    assert queued_job_a.job == ["get_vid_length", ["a.mp4"], {}]
+    assert queued_job_a.attempt_num == 1
+    assert job_queue.claim("w3") is None
+    assert job_queue.get_status_count_d() == {"queued": 0, "running": 2, "done": 0, "failed": 0}
+
+
+def test_complete_stores_result(job_queue):
+    job_id, = job_queue.put_l([("get_vid_length", ["a.mp4"])])
+    job_queue.claim("w1")
+
+    assert job_queue.complete(job_id, "w1", 4.0) is True
+    job_d, = job_queue.get_job_d_l("done")
+    assert job_d["job_id"] == job_id and job_d["result"] == 4.0
+
+
+def test_expired_lease_is_reclaimed_and_stale_worker_cant_finish(job_queue):
+    job_id, = job_queue.put_l([("get_vid_length", ["a.mp4"])])
+    job_queue.claim("dead_worker", lease_sec = 0.2)
+    time.sleep(0.5)
+
+    queued_job = job_queue.claim("w2", lease_sec = 60)
+    assert queued_job.job_id == job_id and queued_job.attempt_num == 2
+    assert job_queue.heartbeat(job_id, "dead_worker") is False
+    assert job_queue.complete(job_id, "dead_worker", "stale") is False
+    assert job_queue.complete(job_id, "w2", "fresh") is True
+    assert job_queue.get_job_d_l("done")[0]["result"] == "fresh"
+
+
+def test_failed_job_is_retried_until_max_attempts(job_queue):
+    job_id, = job_queue.put_l([("get_vid_length", ["a.mp4"])], max_attempts = 2)
+
+    job_queue.claim("w1")
+    assert job_queue.fail(job_id, "w1", "1st error") is True
+    assert job_queue.get_status_count_d()["queued"] == 1
+
+    assert job_queue.claim("w1").attempt_num == 2
+    job_queue.fail(job_id, "w1", "2nd error")
+    job_d, = job_queue.get_job_d_l("failed")
+    assert job_d["error"] == "2nd error"
+    assert job_queue.claim("w1") is None
+
+
+def test_dir_queue_ignores_other_workers_in_progress_files(tmp_path):
+    job_queue = veu.Dir_Job_Queue(tmp_path / "jobs")
+    job_id, = job_queue.put_l([("get_vid_length", ["a.mp4"])])
+    running_dir_path = tmp_path / "jobs" / "running"
+
+    # Another worker mid-requeue & a job whose claim hasn't written its lease yet
+    expired_job_d = {"job_id": "other", "job": ["get_vid_length", [], {}], "attempt_num": 1, "max_attempts": 3,
+                     "lease_sec": 0, "worker_id": "w9", "result": None, "error": None}
+    (running_dir_path / "other.json.123.456.expired").write_text(json.dumps(expired_job_d))
+    (running_dir_path / "unleased.json").write_text(json.dumps(dict(expired_job_d, job_id = "unleased", lease_sec = None)))
+
+    assert job_queue.claim("w1").job_id == job_id
+    assert (running_dir_path / "other.json.123.456.expired").exists()
+    assert (running_dir_path / "unleased.json").exists()
+    assert not os.listdir(tmp_path / "jobs" / "queued")
+
+
+@requires_ffmpeg
+def test_run_queue_worker_runs_every_job(job_queue, test_vid_path, tmp_path):
+    job_queue.put_l([("get_vid_length", [test_vid_path]),
+                     ("get_vid_length", [str(tmp_path / "missing.mp4")])], max_attempts = 1)
+
+    batch_job_result_l = veu.run_queue_worker(job_queue, worker_id = "w1", poll_sec = 0.1, exit_when_empty = True)
+
+    assert len(batch_job_result_l) == 2
+    assert job_queue.get_status_count_d() == {"queued": 0, "running": 0, "done": 1, "failed": 1}
+    assert abs(job_queue.get_job_d_l("done")[0]["result"] - 4) < 0.1
+
+
+def test_jobs_must_name_an_allowed_op(job_queue):
+    with pytest.raises(ValueError):
+        job_queue.put_l([(veu.get_vid_length, ["a.mp4"])])
+
+    job_queue.put_l([("_run_cmd", [["ls"]])], max_attempts = 1)
+    batch_job_result, = veu.run_queue_worker(job_queue, worker_id = "w1", poll_sec = 0.1, exit_when_empty = True)
+    assert "BATCH_OP_NAME_L" in batch_job_result.error
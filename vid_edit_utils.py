@@ -1,33 +1,40 @@
 import json
 # from sms.logger import json_logger as ju
 
-from moviepy.video.io.VideoFileClip import VideoFileClip
-from moviepy.video.tools.subtitles import SubtitlesClip
-from moviepy.editor import *
-
 from typing import NamedTuple
 
 
 import subprocess as sp
 
 import re
-import moviepy.editor as mp
+import html
 
 from pprint import pprint
-from moviepy.tools import subprocess_call
-from moviepy.config import get_setting
 import os
-import cv2
 import subprocess
-from pathlib import Path
-import ffmpeg
-
-from moviepy.editor import VideoFileClip
-from PIL import Image
-from PIL import ImageDraw
-
-import PIL.ImageFont
-import PIL.ImageOps
+import copy
+import collections
+import sqlite3
+import socket
+import functools
+import hashlib
+import inspect
+import time
+import bisect
+import math
+import tempfile
+import threading
+import contextvars
+import asyncio
+import weakref
+import traceback
+from contextlib import ExitStack, closing, contextmanager
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path, PurePath
+
+# Heavy dependencies (moviepy, ffmpeg-python, PIL, numpy) are imported inside the functions that use them, so
+# importing this module just to use light functions like get_vid_length() stays fast
 
 from usms.file_system_utils import file_system_utils as fsu
 
@@ -35,23 +42,48 @@ from usms.file_system_utils import file_system_utils as fsu
 # TODO add something like this to check input and MOST IMPORTANTLY output vids:      if file_not_exist_msg(in_vid_path): raise Exception(file_not_exist_msg(in_vid_path)) # Confirm input vid exists
 
 class Impossible_Dims_Exception(Exception): pass
+class Invalid_Vid_Exception(Exception): pass
 
 
 SCRIPT_PARENT_DIR_PATH = os.path.abspath(os.path.dirname(__file__)) # src
 TEMP_FRAME_IMGS_DIR_PATH = os.path.join(SCRIPT_PARENT_DIR_PATH, "ignore__temp_frame_imgs")
 START_FRAME_IMG_PATH = os.path.join(TEMP_FRAME_IMGS_DIR_PATH, "start_grey_frame_img.jpg")
 END_FRAME_IMG_PATH = os.path.join(TEMP_FRAME_IMGS_DIR_PATH, "end_grey_frame_img.jpg")
+PROBE_CACHE_DB_PATH = os.path.join(SCRIPT_PARENT_DIR_PATH, "ignore__probe_cache.sqlite") # Set to None to disable on-disk probe cache
+PREVIEW_CACHE_DIR_PATH = os.path.join(SCRIPT_PARENT_DIR_PATH, "ignore__preview_cache") # Default parent dir of make_vid_previews() outputs
+
+DEFAULT_PREP_MODE = "overwrite" # prep_mode used by ops decorated w/ @_incremental_op() when not given, see _incremental_op()
+
+VERIFY_LEVEL = "streams" # How much verify_vid() checks each op's output vid, see VERIFY_LEVEL_L, None to only check it exists
+VERIFY_DURATION_TOLERANCE = 0.5 # sec an output vid can be shorter than expected before it counts as truncated
+VERIFY_NUM_DECODE_SAMPLES = 3 # Frames decoded by verify_vid(level = "decode")
+
+FFMPEG_THREADS = None # Max threads per ffmpeg call, None lets ffmpeg decide (usually 1 per core), set per worker by run_batch()
+FFMPEG_PROGRESS_CALLBACK = None # Called w/ each Ffmpeg_Progress_Event of every ffmpeg call, like print or logging.getLogger().info
+
+SUB_GLYPH_CACHE_MAX_BYTES = 256 * 1024 * 1024 # Max bytes of rendered subs the MoviePy burn engine keeps in memory, see get_sub_glyph_img_tup()
+SUB_GLYPH_CACHE_DIR_PATH = None # Set to a dir path to also cache rendered subs on disk, shared across processes
+
+# ffmpeg output args for each named encoding profile, pass the name as encoding_profile to any function that encodes
+# - encoding_profile = None keeps each function's own default args
+# - Use benchmark_encoding_profiles() to compare speed, size & quality of each profile on this machine
+ENCODING_PROFILE_D = {"draft"    : ["-c:v", "libx264", "-preset", "ultrafast", "-crf", "28", "-c:a", "aac", "-b:a", "96k"],
+                      "delivery" : ["-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-pix_fmt", "yuv420p", "-c:a", "aac", "-b:a", "192k"],
+                      "archive"  : ["-c:v", "libx264", "-preset", "slow", "-crf", "12", "-c:a", "aac", "-b:a", "320k"],
+                      "lossless" : ["-c:v", "libx264", "-preset", "ultrafast", "-crf", "0", "-c:a", "aac", "-b:a", "320k"]}
 
 BLACK_COLOR_RGB = 0
 
 
 def file_not_exist_msg(file_path):
-    if Path(file_path).exists():
+    if Path(file_path).exists() or _is_dry_run(): # Outputs are never created in a dry_run()
         return False
     return f"ERROR: File doesn't exist: {file_path}"
 
-# TODO use? decorator?
 def prep_out_path(out_path, out_path_type = "file", prep_mode = "overwrite"):
+    if _is_dry_run():
+        return
+
     if prep_mode == "overwrite":
         fsu.delete_if_exists(out_path)
     else:
@@ -65,16 +97,594 @@ def prep_out_path(out_path, out_path_type = "file", prep_mode = "overwrite"):
         raise ValueError(f"Unrecognized {out_path_type=}")
 
 
+def _get_ffmpeg_thread_arg_l():
+    """ Output args that limit ffmpeg to FFMPEG_THREADS, so parallel jobs don't oversubscribe cores """
+    if FFMPEG_THREADS is None:
+        return []
+    return ["-threads", str(FFMPEG_THREADS)]
+
+
+def _get_encoding_arg_l(encoding_profile, default_arg_l = None):
+    """ Returns ffmpeg output args for encoding_profile (a key of ENCODING_PROFILE_D), or default_arg_l if None """
+    if encoding_profile is None:
+        return list(default_arg_l or [])
+    if encoding_profile not in ENCODING_PROFILE_D:
+        raise ValueError(f"Unrecognized {encoding_profile=}, must be one of {list(ENCODING_PROFILE_D.keys())}")
+    return list(ENCODING_PROFILE_D[encoding_profile])
+
+
+def _escape_filter_arg(arg):
+    """
+        Escapes arg (like a subtitle file path) so it can be used as a filter option value inside a filtergraph
+        - Needs 2 levels of escaping, one for the filter option & one for the filtergraph
+        - https://ffmpeg.org/ffmpeg-filters.html#Notes-on-filtergraph-escaping
+    """
+    arg = str(arg)
+    for c in "\\':":
+        arg = arg.replace(c, "\\" + c)
+    return "".join("\\" + c if c in "\\'[],;" else c for c in arg)
+
+
+####################################################################################################
+# Execution layer
+####################################################################################################
+
+class Ffmpeg_Progress_Event(NamedTuple):
+    op_name: str # Outermost op running the cmd, like "scale_vid"
+    status: str # "start", "continue" or "end"
+    frame: int # Num frames written so far
+    fps: float # Frames written per sec of wall time
+    speed: float # Sec of output written per sec of wall time
+    out_time: float # Sec of output written so far
+    duration: float # Expected sec of output, None if unknown
+    eta: float # Sec of wall time left, None if unknown
+    wall_time: float # Sec since cmd started
+    cpu_time: float # User + sys sec of the ffmpeg process, only set at "end" on platforms w/ os.wait4()
+    peak_rss_kb: int # Peak memory of the ffmpeg process, only set at "end" on platforms w/ os.wait4()
+    in_bytes: int # Total size of input files
+    out_bytes: int # Size of output written so far
+    return_code: int # None until "end"
+
+
+class Op_Timing_Summary(NamedTuple):
+    op_name: str
+    num_cmds: int
+    wall_time: float # sec
+    cpu_time: float # sec
+    peak_rss_kb: int
+    num_frames: int
+    in_bytes: int
+    out_bytes: int
+
+
+_op_name_var = contextvars.ContextVar("op_name", default = None) # Unlike a threading.local, also follows asyncio tasks
+_ffmpeg_event_recorder_l = []
+
+
+@contextmanager
+def _op_scope(op_name):
+    """ Ffmpeg cmds run inside are reported under op_name, unless already inside an outer op's scope """
+    token = _op_name_var.set(op_name) if _op_name_var.get() is None else None
+    try:
+        yield
+    finally:
+        if token is not None:
+            _op_name_var.reset(token)
+
+
+@contextmanager
+def record_ffmpeg_events():
+    """
+        Collects the "end" Ffmpeg_Progress_Event of each ffmpeg call run inside, pass it to print_op_timing_summary()
+        EXAMPLE:
+            with record_ffmpeg_events() as ffmpeg_event_l:
+                scale_vid((1080, 960), in_vid_path, out_vid_path)
+            print_op_timing_summary(ffmpeg_event_l)
+    """
+    ffmpeg_event_l = []
+    _ffmpeg_event_recorder_l.append(ffmpeg_event_l)
+    try:
+        yield ffmpeg_event_l
+    finally:
+        _ffmpeg_event_recorder_l.remove(ffmpeg_event_l)
+
+
+_op_ffmpeg_event_l_l_var = contextvars.ContextVar("op_ffmpeg_event_l_l", default = ())
+
+
+@contextmanager
+def _record_op_ffmpeg_events():
+    """ Like record_ffmpeg_events(), but only collects events of cmds run in this context, not other threads' ops """
+    ffmpeg_event_l = []
+    token = _op_ffmpeg_event_l_l_var.set(_op_ffmpeg_event_l_l_var.get() + (ffmpeg_event_l,))
+    try:
+        yield ffmpeg_event_l
+    finally:
+        _op_ffmpeg_event_l_l_var.reset(token)
+
+
+_dry_run_cmd_l_var = contextvars.ContextVar("dry_run_cmd_l", default = None)
+
+
+def _is_dry_run():
+    return _dry_run_cmd_l_var.get() is not None
+
+
+def _plan_cmd_if_dry_run(cmd_l):
+    """ Returns True if in a dry_run(), after adding cmd_l to its planned cmds """
+    planned_cmd_l = _dry_run_cmd_l_var.get()
+    if planned_cmd_l is None:
+        return False
+    print(f"Dry run, would run: {sp.list2cmdline(cmd_l)}")
+    planned_cmd_l.append(list(cmd_l))
+    return True
+
+
+@contextmanager
+def dry_run():
+    """
+        Ops called inside plan their cmds instead of running them, yields the list each planned cmd (argv list) is added to
+        - Outputs are not deleted, created or checked, inputs are still probed, so must exist
+        - Temp paths in planned cmds, like the segments of trim_vid(mode = "smart"), are gone once the op returns
+        EXAMPLE:
+            with dry_run() as planned_cmd_l:
+                scale_vid((1080, 960), in_vid_path, out_vid_path)
+            print(planned_cmd_l) # [["ffmpeg", "-y", "-hide_banner", "-i", in_vid_path, ..., out_vid_path]]
+    """
+    planned_cmd_l = []
+    token = _dry_run_cmd_l_var.set(planned_cmd_l)
+    try:
+        yield planned_cmd_l
+    finally:
+        _dry_run_cmd_l_var.reset(token)
+
+
+def _get_cmd_in_path_seek_time_tup_l(cmd_l, vid_only = False):
+    """ Returns (path, input-side -ss sec) of cmd_l's input files, if vid_only, skips concat list files """
+    in_path_seek_time_tup_l = []
+    in_format = None
+    seek_time = 0.0
+    for i, arg in enumerate(cmd_l[:-1]):
+        if arg == "-f":
+            in_format = cmd_l[i + 1]
+        elif arg == "-ss":
+            try:
+                seek_time = float(cmd_l[i + 1])
+            except ValueError: # Like "00:01:02", only used to guess durations
+                seek_time = 0.0
+        elif arg == "-i":
+            if os.path.isfile(cmd_l[i + 1]) and not (vid_only and in_format == "concat"):
+                in_path_seek_time_tup_l.append((cmd_l[i + 1], seek_time))
+            in_format = None
+            seek_time = 0.0
+    return in_path_seek_time_tup_l
+
+
+def _get_cmd_in_path_l(cmd_l, vid_only = False):
+    """ Returns paths of cmd_l's input files, if vid_only, skips concat list files """
+    return [in_path for in_path, _ in _get_cmd_in_path_seek_time_tup_l(cmd_l, vid_only)]
+
+
+def _get_cmd_out_duration(cmd_l, in_duration_l):
+    """ Best guess of how many sec of output cmd_l will write, from its input vid durations & -t args, None if unknown """
+    t_l = [float(cmd_l[i + 1]) for i, arg in enumerate(cmd_l[:-1]) if arg == "-t"]
+    if t_l:
+        return min([max(t_l)] + in_duration_l)
+    return max(in_duration_l) if in_duration_l else None
+
+
+def _get_cmd_in_duration_l(cmd_l):
+    """ Returns sec of each input vid cmd_l reads, after its input-side -ss """
+    in_duration_l = []
+    for in_path, seek_time in _get_cmd_in_path_seek_time_tup_l(cmd_l, vid_only = True):
+        try:
+            in_duration_l.append(max(0.0, get_vid_length(in_path) - seek_time))
+        except Exception: # Not a vid, like a sub file
+            pass
+    return in_duration_l
+
+
+def _parse_progress_float(progress_d, key):
+    try:
+        return float(progress_d.get(key, "").rstrip("x"))
+    except ValueError: # Like "N/A"
+        return None
+
+
+def _tracks_progress(cmd_l):
+    """ ffmpeg cmds that write to stdout can't also send progress to it """
+    return Path(cmd_l[0]).stem == "ffmpeg" and not any(arg.startswith("pipe:") for arg in cmd_l)
+
+
+def _get_progress_cmd_l(cmd_l):
+    return [cmd_l[0], "-progress", "pipe:1", "-nostats", *cmd_l[1:]]
+
+
+class _Ffmpeg_Progress_Tracker():
+    """ Turns the lines ffmpeg writes to -progress pipe:1 into Ffmpeg_Progress_Events, used by _run_cmd() & _async_run_cmd() """
+    def __init__(self, cmd_l, op_name, in_duration_l):
+        self.op_name = op_name
+        self.duration = _get_cmd_out_duration(cmd_l, in_duration_l)
+        self.in_bytes = sum(os.path.getsize(in_path) for in_path in _get_cmd_in_path_l(cmd_l))
+        self.start_time = time.perf_counter()
+        self._progress_d = {}
+        self._last_progress_d = {}
+        self._report(self._make_event("start", {}))
+
+    def _make_event(self, status, progress_d, **kwargs):
+        wall_time = time.perf_counter() - self.start_time
+        out_time_us = _parse_progress_float(progress_d, "out_time_us") or _parse_progress_float(progress_d, "out_time_ms")
+        out_time = out_time_us / 1000000 if out_time_us is not None else None
+        speed = _parse_progress_float(progress_d, "speed")
+        eta = None
+        if self.duration is not None and out_time is not None and speed:
+            eta = max(0.0, self.duration - out_time) / speed
+
+        frame = int(_parse_progress_float(progress_d, "frame") or 0)
+
+        return Ffmpeg_Progress_Event(**{"op_name": self.op_name, "status": status,
+                                        "frame": frame, "fps": frame / wall_time if wall_time else 0.0,
+                                        "speed": speed, "out_time": out_time, "duration": self.duration, "eta": eta,
+                                        "wall_time": wall_time, "cpu_time": None, "peak_rss_kb": None,
+                                        "in_bytes": self.in_bytes,
+                                        "out_bytes": int(_parse_progress_float(progress_d, "total_size") or 0),
+                                        "return_code": None, **kwargs})
+
+    def _report(self, event):
+        if FFMPEG_PROGRESS_CALLBACK is not None:
+            FFMPEG_PROGRESS_CALLBACK(event)
+
+    def feed_line(self, line):
+        key, _, val = line.strip().partition("=")
+        self._progress_d[key] = val
+        if key == "progress":
+            if val == "continue":
+                self._report(self._make_event("continue", self._progress_d))
+            self._last_progress_d, self._progress_d = self._progress_d, {}
+
+    def end(self, return_code, cpu_time = None, peak_rss_kb = None):
+        end_event = self._make_event("end", self._last_progress_d,
+                                     cpu_time = cpu_time, peak_rss_kb = peak_rss_kb, return_code = return_code)
+        self._report(end_event)
+        for ffmpeg_event_l in list(_ffmpeg_event_recorder_l) + list(_op_ffmpeg_event_l_l_var.get()):
+            ffmpeg_event_l.append(end_event)
+
+        print(f"Finished {self.op_name} ffmpeg cmd in {end_event.wall_time:.2f}s ({cpu_time=}, {peak_rss_kb=}, {return_code=})")
+        return end_event
+
+
+def _run_cmd(cmd_l, op_name = None):
+    """
+        Runs cmd_l (list of args) w/o a shell, so paths w/ spaces or parentheses don't need quoting
+        - ffmpeg cmds that write files report progress & timing, see FFMPEG_PROGRESS_CALLBACK & record_ffmpeg_events()
+        - op_name defaults to the op this is called from, pass it when running cmds in other threads
+        - Returns the "end" Ffmpeg_Progress_Event for ffmpeg cmds, otherwise None
+        - Only plans cmd_l inside a dry_run()
+    """
+    if _plan_cmd_if_dry_run(cmd_l):
+        return None
+
+    print(f"Running: {sp.list2cmdline(cmd_l)}...")
+    if not _tracks_progress(cmd_l):
+        sp.call(cmd_l)
+        return None
+
+    progress_tracker = _Ffmpeg_Progress_Tracker(cmd_l, op_name or _op_name_var.get() or "ffmpeg",
+                                                _get_cmd_in_duration_l(cmd_l))
+    proc = sp.Popen(_get_progress_cmd_l(cmd_l), stdout = sp.PIPE, universal_newlines = True)
+    for line in proc.stdout:
+        progress_tracker.feed_line(line)
+    proc.stdout.close()
+
+    if not hasattr(os, "wait4"): # Windows
+        return progress_tracker.end(proc.wait())
+
+    _, wait_status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(wait_status)
+    return progress_tracker.end(proc.returncode, rusage.ru_utime + rusage.ru_stime, rusage.ru_maxrss)
+
+
+def _run_cmd_l_in_threads(cmd_l_l, op_name = None):
+    """
+        Runs each cmd_l of cmd_l_l w/ _run_cmd() in its own thread, returns once all are done
+        - Each thread runs in a copy of the caller's context, so dry_run() & the calling op's ffmpeg event recording still apply
+    """
+    with ThreadPoolExecutor(max_workers = len(cmd_l_l) or 1) as executor:
+        future_l = [executor.submit(contextvars.copy_context().run, _run_cmd, cmd_l, op_name) for cmd_l in cmd_l_l]
+        return [future.result() for future in future_l]
+
+
+def get_op_timing_summary_l(ffmpeg_event_l):
+    """ Totals ffmpeg_event_l's "end" events by op, returns an Op_Timing_Summary per op, slowest 1st """
+    summary_d = {}
+    for event in ffmpeg_event_l:
+        if event.status != "end":
+            continue
+        summary = summary_d.get(event.op_name, Op_Timing_Summary(event.op_name, 0, 0.0, 0.0, 0, 0, 0, 0))
+        summary_d[event.op_name] = summary._replace(num_cmds = summary.num_cmds + 1,
+                                                    wall_time = summary.wall_time + event.wall_time,
+                                                    cpu_time = summary.cpu_time + (event.cpu_time or 0.0),
+                                                    peak_rss_kb = max(summary.peak_rss_kb, event.peak_rss_kb or 0),
+                                                    num_frames = summary.num_frames + event.frame,
+                                                    in_bytes = summary.in_bytes + event.in_bytes,
+                                                    out_bytes = summary.out_bytes + event.out_bytes)
+    return sorted(summary_d.values(), key = lambda summary: summary.wall_time, reverse = True)
+
+
+def print_op_timing_summary(ffmpeg_event_l):
+    print(f"{'op_name':<45} {'num_cmds':>8} {'wall_time':>10} {'cpu_time':>10} {'peak_rss_mb':>11} {'fps':>8} {'in_mb':>9} {'out_mb':>9}")
+    for summary in get_op_timing_summary_l(ffmpeg_event_l):
+        fps = summary.num_frames / summary.wall_time if summary.wall_time else 0.0
+        print(f"{summary.op_name:<45} {summary.num_cmds:>8} {summary.wall_time:>10.2f} {summary.cpu_time:>10.2f} "
+              f"{summary.peak_rss_kb / 1024:>11.1f} {fps:>8.1f} {summary.in_bytes / 1024 / 1024:>9.1f} {summary.out_bytes / 1024 / 1024:>9.1f}")
+
+
+
+####################################################################################################
+# Incremental build cache
+####################################################################################################
+
+def _get_op_manifest_path(out_path):
+    """ Manifest is a hidden json file next to out_path, so it moves w/ the output & is shared by all machines that see it """
+    return os.path.join(os.path.dirname(os.path.abspath(out_path)), f".{os.path.basename(out_path)}.vid_edit_manifest.json")
+
+
+def _get_file_content_fingerprint(file_path, sample_size = 1024 * 1024):
+    """
+        Returns hash of file_path's size & 1st, middle & last sample_size bytes
+        - Unlike _get_file_fingerprint(), doesn't change if file_path is copied or touched w/o changing its content
+        - Only reads ~3 MB, so is fast even for huge vids
+    """
+    file_size = os.path.getsize(file_path)
+    file_hash = hashlib.sha1(str(file_size).encode())
+    with open(file_path, "rb") as file:
+        for offset in sorted({0, max(0, file_size // 2 - sample_size // 2), max(0, file_size - sample_size)}):
+            file.seek(offset)
+            file_hash.update(file.read(sample_size))
+    return file_hash.hexdigest()
+
+
+@functools.lru_cache(1)
+def _get_ffmpeg_version():
+    """ Returns 1st line of `ffmpeg -version`, or None if ffmpeg can't be run """
+    try:
+        return sp.run(["ffmpeg", "-version"], capture_output = True, text = True).stdout.split("\n")[0].strip()
+    except OSError:
+        return None
+
+
+def _get_in_fingerprint(in_arg):
+    """ in_arg can be a path, a Vid_Pipeline (whose ops also count) or a list of them """
+    if isinstance(in_arg, (list, tuple)):
+        return [_get_in_fingerprint(sub_in_arg) for sub_in_arg in in_arg]
+    if isinstance(in_arg, Vid_Pipeline):
+        return [repr(in_arg)] + [_get_file_content_fingerprint(in_vid_path) for in_vid_path in in_arg._get_in_vid_path_l()]
+    return _get_file_content_fingerprint(in_arg)
+
+
+def _get_op_manifest_d(op_name, arg_d, out_path_arg_name, in_path_arg_name_l):
+    """ Returns everything that determines op's output - op, params, input content fingerprints & ffmpeg version """
+    param_d = {arg_name: repr(arg) for arg_name, arg in arg_d.items()
+               if arg_name != out_path_arg_name and arg_name not in in_path_arg_name_l}
+    if arg_d.get("encoding_profile") is not None: # Editing ENCODING_PROFILE_D must also invalidate outputs
+        param_d["encoding_arg_l"] = repr(_get_encoding_arg_l(arg_d["encoding_profile"]))
+
+    return {"op": op_name,
+            "param_d": param_d,
+            "in_fingerprint_d": {arg_name: _get_in_fingerprint(arg_d[arg_name]) for arg_name in in_path_arg_name_l},
+            "ffmpeg_version": _get_ffmpeg_version()}
+
+
+def _read_up_to_date_op_manifest_d(out_path, manifest_d):
+    """ Returns saved manifest for out_path if it matches manifest_d & its result is still there unchanged, else None """
+    try:
+        with open(_get_op_manifest_path(out_path)) as manifest_file:
+            saved_manifest_d = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+    if {key: saved_manifest_d.get(key) for key in manifest_d} != manifest_d:
+        return None
+
+    result_path = saved_manifest_d.get("result")
+    if isinstance(result_path, str) and os.path.abspath(result_path) == os.path.abspath(str(out_path)):
+        if not os.path.isfile(out_path) or os.path.getsize(out_path) == 0:
+            return None
+        if list(_get_file_fingerprint(out_path)[1:]) != saved_manifest_d.get("out_fingerprint"): # Modified since created
+            return None
+    return saved_manifest_d
+
+
+def _write_op_manifest_d(out_path, manifest_d, result):
+    saved_manifest_d = dict(manifest_d, result = result)
+    if os.path.isfile(out_path):
+        saved_manifest_d["out_fingerprint"] = list(_get_file_fingerprint(out_path)[1:])
+
+    manifest_path = _get_op_manifest_path(out_path)
+    Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path + ".tmp", "w") as manifest_file:
+        json.dump(saved_manifest_d, manifest_file, indent = 4, default = str) # Saves Path results as str
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+
+def _incremental_op(out_path_arg_name, in_path_arg_name_l, out_stream_type_l = None):
+    """
+        Decorator that adds a prep_mode kwarg to an op that writes 1 output file, like make's up-to-date check
+        - out_stream_type_l - Stream types the output must have, if not those of the inputs, see _verify_op_out()
+        prep_mode:
+            "overwrite"          - Always re-runs op
+            "skip_if_up_to_date" - Skips op & returns what it returned last time if the output's manifest matches this
+                                   call's op, params, input content fingerprints & ffmpeg version & the output hasn't
+                                   been modified since, so re-running a batch only redoes changed or failed outputs
+            None                 - Uses DEFAULT_PREP_MODE
+        - Manifest is only written after op succeeds, so failed or interrupted outputs are always re-done
+        - Inputs are only fingerprinted & the manifest only written in "skip_if_up_to_date" mode, "overwrite" costs nothing extra
+        - Output vids are checked w/ verify_vid() at VERIFY_LEVEL, expecting the duration of the last ffmpeg cmd's inputs
+          & the kind of streams the op's inputs have
+    """
+    def decorator(op_func):
+        op_sig = inspect.signature(op_func)
+
+        @functools.wraps(op_func)
+        def wrapper(*args, prep_mode = None, **kwargs):
+            prep_mode = DEFAULT_PREP_MODE if prep_mode is None else prep_mode
+            if prep_mode not in ("overwrite", "skip_if_up_to_date"):
+                raise NotImplementedError(f"{prep_mode=}")
+
+            bound_args = op_sig.bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            out_path = bound_args.arguments[out_path_arg_name]
+            manifest_d = None
+
+            if prep_mode == "skip_if_up_to_date":
+                manifest_d = _get_op_manifest_d(op_func.__name__, bound_args.arguments, out_path_arg_name, in_path_arg_name_l)
+                saved_manifest_d = _read_up_to_date_op_manifest_d(out_path, manifest_d)
+                if saved_manifest_d is not None:
+                    print(f"Skipping {op_func.__name__}(), {out_path=} is up to date...")
+                    if isinstance(out_path, PurePath) and saved_manifest_d["result"] == str(out_path):
+                        return out_path # Same type as when op ran
+                    return saved_manifest_d["result"]
+
+            if _is_dry_run():
+                with _op_scope(op_func.__name__):
+                    return op_func(*args, **kwargs)
+
+            fsu.delete_if_exists(_get_op_manifest_path(out_path))
+            with _op_scope(op_func.__name__), _record_op_ffmpeg_events() as ffmpeg_event_l:
+                result = op_func(*args, **kwargs)
+            _verify_op_out(out_path, result, ffmpeg_event_l[-1].duration if ffmpeg_event_l else None,
+                           [bound_args.arguments[arg_name] for arg_name in in_path_arg_name_l], out_stream_type_l)
+            if manifest_d is not None:
+                _write_op_manifest_d(out_path, manifest_d, result)
+            return result
+
+        return wrapper
+    return decorator
+
 
 
 ####################################################################################################
 # Get data about given vid
 ####################################################################################################
 
+class Vid_Probe_Data(NamedTuple):
+    w: int
+    h: int
+    duration: float # sec
+    fps: float
+    vid_codec: str # None if no vid stream
+    audio_codec: str # None if no audio stream
+    stream_d_l: list
+    ffprobe_d: dict
+
+
+def _get_file_fingerprint(file_path):
+    """ Returns (abs_path, size, mtime_ns), which changes whenever file_path is modified or replaced """
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+
+def _read_probe_cache_db(file_fingerprint):
+    """ Returns ffprobe json str cached on disk for file_fingerprint, or None if not cached """
+    if PROBE_CACHE_DB_PATH is None:
+        return None
+    abs_path, size, mtime_ns = file_fingerprint
+    try:
+        with closing(sqlite3.connect(PROBE_CACHE_DB_PATH, timeout = 30)) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS probe_cache (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, ffprobe_json TEXT)")
+            row = conn.execute("SELECT ffprobe_json FROM probe_cache WHERE path = ? AND size = ? AND mtime_ns = ?",
+                               (abs_path, size, mtime_ns)).fetchone()
+    except sqlite3.Error as e:
+        print(f"WARNING: Could not read probe cache, will re-probe - {PROBE_CACHE_DB_PATH=}, {e=}")
+        return None
+    return row[0] if row else None
+
+
+def _write_probe_cache_db(file_fingerprint, ffprobe_json):
+    """ Only keeps newest entry per path, so the db doesn't grow every time a vid is overwritten """
+    if PROBE_CACHE_DB_PATH is None:
+        return
+    try:
+        with closing(sqlite3.connect(PROBE_CACHE_DB_PATH, timeout = 30)) as conn:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS probe_cache (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, ffprobe_json TEXT)")
+                conn.execute("INSERT OR REPLACE INTO probe_cache VALUES (?, ?, ?, ?)", (*file_fingerprint, ffprobe_json))
+    except sqlite3.Error as e:
+        print(f"WARNING: Could not write probe cache - {PROBE_CACHE_DB_PATH=}, {e=}")
+
+
+def _frame_rate_str_to_float(frame_rate_str):
+    """ "30000/1001" -> 29.97, "0/0" -> 0.0 """
+    num, _, den = str(frame_rate_str).partition("/")
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _ffprobe_d_to_probe_data(ffprobe_d):
+    stream_d_l = ffprobe_d.get("streams", [])
+    vid_stream_d = next((d for d in stream_d_l if d.get("codec_type") == "video"), {})
+    audio_stream_d = next((d for d in stream_d_l if d.get("codec_type") == "audio"), {})
+
+    w = int(vid_stream_d.get("width", 0))
+    h = int(vid_stream_d.get("height", 0))
+
+    # Match what players (and cv2) show for phone vids recorded sideways
+    rotation = vid_stream_d.get("tags", {}).get("rotate", 0)
+    for side_data_d in vid_stream_d.get("side_data_list", []):
+        rotation = side_data_d.get("rotation", rotation)
+    if int(float(rotation)) % 180:
+        w, h = h, w
+
+    duration = ffprobe_d.get("format", {}).get("duration", vid_stream_d.get("duration", 0))
+
+    fps = _frame_rate_str_to_float(vid_stream_d.get("avg_frame_rate", "0/0"))
+    if not fps:
+        fps = _frame_rate_str_to_float(vid_stream_d.get("r_frame_rate", "0/0"))
+
+    return Vid_Probe_Data(w = w,
+                          h = h,
+                          duration = float(duration),
+                          fps = fps,
+                          vid_codec = vid_stream_d.get("codec_name"),
+                          audio_codec = audio_stream_d.get("codec_name"),
+                          stream_d_l = stream_d_l,
+                          ffprobe_d = ffprobe_d)
+
+
+@functools.lru_cache(maxsize = 1024)
+def _get_vid_probe_data__cached(file_fingerprint):
+    ffprobe_json = _read_probe_cache_db(file_fingerprint)
+
+    if ffprobe_json is None:
+        ffprobe_result = _ffprobe(file_fingerprint[0])
+        if ffprobe_result.return_code != 0:
+            raise ValueError(f"Return code does not equal 0: {ffprobe_result.return_code=}, {file_fingerprint=}")
+        ffprobe_json = ffprobe_result.json
+        _write_probe_cache_db(file_fingerprint, ffprobe_json)
+
+    return _ffprobe_d_to_probe_data(json.loads(ffprobe_json))
+
+
+def get_vid_probe_data(vid_file_path):
+    """
+        Returns Vid_Probe_Data for vid_file_path, only runs ffprobe once per version of the file
+        - Cached in-process (LRU) & on disk at PROBE_CACHE_DB_PATH, keyed by path + size + mtime
+        - Do not modify the returned ffprobe_d / stream_d_l, they are shared w/ the cache
+    """
+    return _get_vid_probe_data__cached(_get_file_fingerprint(vid_file_path))
+
+
+def clear_probe_cache():
+    """ Only clears the in-process caches, delete PROBE_CACHE_DB_PATH to clear the on-disk cache """
+    _get_vid_probe_data__cached.cache_clear()
+    _async_probe_future_d.clear()
+
+
 def get_vid_dims(vid_file_path):
-    vid = cv2.VideoCapture(vid_file_path)
-    vid_w_float, vid_h_float = vid.get(cv2.CAP_PROP_FRAME_WIDTH), vid.get(cv2.CAP_PROP_FRAME_HEIGHT)
-    return(int(vid_w_float), int(vid_h_float))
+    probe_data = get_vid_probe_data(vid_file_path)
+    return (probe_data.w, probe_data.h)
 
 def get_vid_length(filename, error_if_vid_not_exist = True, return_type = "sec_float", time_str_sep = "_"):
     ''' return_type = "min_sec_str", "sec_float" '''
@@ -82,13 +692,10 @@ def get_vid_length(filename, error_if_vid_not_exist = True, return_type = "sec_f
     if error_if_vid_not_exist and not Path(filename).is_file():
         raise Exception(f"Error: Vid file does not exist: {filename}")
 
-    result = sp.run(["ffprobe", "-v", "error", "-show_entries",
-                    "format=duration", "-of",
-                    "default=noprint_wrappers=1:nokey=1", str(Path(filename))],
-                    stdout=sp.PIPE,
-                    stderr=sp.STDOUT)
+    return _format_vid_length(get_vid_probe_data(filename).duration, return_type, time_str_sep)
+
 
-    sec_float = float(result.stdout)
+def _format_vid_length(sec_float, return_type, time_str_sep):
     if return_type == "sec_float":
         return sec_float
 
@@ -103,141 +710,558 @@ def get_vid_length(filename, error_if_vid_not_exist = True, return_type = "sec_f
 
 
 ####################################################################################################
-# Vid Time Related
+# Verify output vids
 ####################################################################################################
 
-def trim_vid(in_vid_path, out_vid_path, time_tup):
-    """ Trims vid time from time_tup[0] to time_tup[1]"""
-    def ffmpeg_extract_subclip(filename, t1, t2, target_name=None):
-        """ Makes a new video file playing video file ``filename`` between
-        the times ``t1`` and ``t2``. """
-        print('in ffmpeg_extract_subclip')
-        name, ext = os.path.splitext(filename)
-        if not target_name:
-            T1, T2 = [int(1000*t) for t in [t1, t2]]
-            target_name = "%sSUB%d_%d.%s" % (name, T1, T2, ext)
+# verify_vid() levels, each also does the checks of the levels before it
+# - "exists"   - File exists & isn't empty
+# - "header"   - ffprobe can read the container's header & index (probe is cached, so the next op doesn't re-probe)
+# - "duration" - Duration > 0 & not more than VERIFY_DURATION_TOLERANCE sec shorter than expected
+# - "streams"  - Has a vid stream w/ dims & every other expected stream type, like "audio"
+# - "decode"   - Decodes 1 frame at VERIFY_NUM_DECODE_SAMPLES points from start to end, catches truncated or corrupt
+#                data the header doesn't show, still much faster than decoding the whole vid
+VERIFY_LEVEL_L = ["exists", "header", "duration", "streams", "decode"]
 
-        cmd = [get_setting("FFMPEG_BINARY"),"-y",
-               "-ss", "%0.2f"%t1,
-               "-i", str(Path(filename)),
-               "-t", "%0.2f"%(t2-t1),
-               "-vcodec", "copy", "-acodec", "copy", str(Path(target_name))]
-        subprocess_call(cmd)
 
-    ffmpeg_extract_subclip(in_vid_path, time_tup[0], time_tup[1], target_name=out_vid_path)
+def _get_sparse_decode_cmd_l(vid_path, duration, num_samples):
+    """ 1 ffmpeg cmd that decodes 1 frame at each of num_samples points, last point is in the last sec """
+    last_sample_time = max(0.0, duration - min(1.0, duration / 2))
+    sample_time_l = [last_sample_time * i / max(1, num_samples - 1) for i in range(num_samples)]
+
+    cmd_l = ["ffmpeg", "-hide_banner", "-nostdin", "-v", "error"]
+    for sample_time in sample_time_l:
+        cmd_l += ["-ss", f"{sample_time:.3f}", "-i", str(Path(vid_path))]
+    for in_i in range(len(sample_time_l)):
+        cmd_l += ["-map", f"{in_i}:v:0", "-frames:v", "1", "-f", "null", "-"]
+    return cmd_l
+
+
+def verify_vid(vid_path, level = None, expected_duration = None, expected_stream_type_l = None):
+    """
+        Raises Invalid_Vid_Exception if vid_path is broken (like 0 bytes or truncated), otherwise returns vid_path
+        - level - One of VERIFY_LEVEL_L, None uses VERIFY_LEVEL
+        - expected_duration - sec vid_path should be, only checked if given
+        - expected_stream_type_l - Like ["video", "audio"], None only requires a vid or audio stream, so audio-only files pass
+        - Files w/ only sub streams (like .scc or .sup) have no duration to check, so only their stream types are
+    """
+    level = level or VERIFY_LEVEL or "exists"
+    if level not in VERIFY_LEVEL_L:
+        raise ValueError(f"Unrecognized {level=}, must be one of {VERIFY_LEVEL_L}")
+    level_i = VERIFY_LEVEL_L.index(level)
+
+    if not Path(vid_path).is_file() or os.path.getsize(vid_path) == 0:
+        raise Invalid_Vid_Exception(f"Vid does not exist or is empty: {vid_path=}")
+    if level_i < VERIFY_LEVEL_L.index("header"):
+        return vid_path
+
+    try:
+        probe_data = get_vid_probe_data(vid_path)
+    except (ValueError, KeyError) as e:
+        raise Invalid_Vid_Exception(f"ffprobe can't read header of {vid_path=}: {e}") from e
+    if level_i < VERIFY_LEVEL_L.index("duration"):
+        return vid_path
+
+    stream_type_set = {stream_d.get("codec_type") for stream_d in probe_data.stream_d_l}
+    if stream_type_set and stream_type_set <= {"subtitle"}: # Their duration is just the last cue's end
+        missing_stream_type_l = [stream_type for stream_type in expected_stream_type_l or [] if stream_type not in stream_type_set]
+        if missing_stream_type_l:
+            raise Invalid_Vid_Exception(f"Vid is missing streams: {vid_path=}, {missing_stream_type_l=}")
+        return vid_path
+
+    if probe_data.duration <= 0:
+        raise Invalid_Vid_Exception(f"Vid has no duration: {vid_path=}")
+    if expected_duration is not None and probe_data.duration < expected_duration - VERIFY_DURATION_TOLERANCE:
+        raise Invalid_Vid_Exception(f"Vid is shorter than expected, may be truncated: {vid_path=}, {probe_data.duration=}, {expected_duration=}")
+    if level_i < VERIFY_LEVEL_L.index("streams"):
+        return vid_path
+
+    if expected_stream_type_l is None and not stream_type_set & {"video", "audio"}:
+        raise Invalid_Vid_Exception(f"Vid has no vid or audio streams: {vid_path=}, {stream_type_set=}")
+    expected_stream_type_l = expected_stream_type_l or []
+    if "video" in expected_stream_type_l and not (probe_data.w and probe_data.h):
+        raise Invalid_Vid_Exception(f"Vid has no vid stream w/ dims: {vid_path=}, {probe_data.vid_codec=}")
+    missing_stream_type_l = [stream_type for stream_type in expected_stream_type_l if stream_type not in stream_type_set]
+    if missing_stream_type_l:
+        raise Invalid_Vid_Exception(f"Vid is missing streams: {vid_path=}, {missing_stream_type_l=}")
+    if level_i < VERIFY_LEVEL_L.index("decode"):
+        return vid_path
+
+    result = sp.run(_get_sparse_decode_cmd_l(vid_path, probe_data.duration, VERIFY_NUM_DECODE_SAMPLES),
+                    stdout = sp.DEVNULL, stderr = sp.PIPE, universal_newlines = True)
+    if result.returncode != 0 or result.stderr.strip():
+        raise Invalid_Vid_Exception(f"Vid failed to decode: {vid_path=}, {result.returncode=}, {result.stderr[-2000:]=}")
+    return vid_path
+
+
+def _get_expected_stream_type_l(in_arg_l):
+    """
+        Returns stream types an op's output must have, given its in_args (paths, Vid_Pipelines or lists of them)
+        - A vid stream if any input has 1, else an audio stream if any input has 1, audio isn't required along w/ vid,
+          as some ops drop it on purpose, like composite_vids(audio_src = None)
+    """
+    in_media_path_l = []
+    for in_arg in in_arg_l:
+        for sub_in_arg in in_arg if isinstance(in_arg, (list, tuple)) else [in_arg]:
+            in_path = sub_in_arg.in_vid_path if isinstance(sub_in_arg, Vid_Pipeline) else sub_in_arg
+            if isinstance(in_path, (str, os.PathLike)) and Path(in_path).suffix.lower() not in SUB_FORMAT_D and Path(in_path).is_file():
+                in_media_path_l.append(in_path)
+
+    in_stream_type_set = set()
+    for in_media_path in in_media_path_l:
+        try:
+            in_stream_type_set |= {stream_d.get("codec_type") for stream_d in get_vid_probe_data(in_media_path).stream_d_l}
+        except (ValueError, KeyError): # Unreadable input, nothing to compare to
+            continue
+    if "video" in in_stream_type_set:
+        return ["video"]
+    if "audio" in in_stream_type_set:
+        return ["audio"]
+    return None
+
+
+def _verify_op_out(out_path, result = None, expected_duration = None, in_arg_l = (), out_stream_type_l = None):
+    """
+        verify_vid()s an op's output at VERIFY_LEVEL, skips ops that returned their input instead
+        - in_arg_l - The op's inputs, the output must have the kind of streams they have, see _get_expected_stream_type_l()
+        - out_stream_type_l - Stream types the output must have instead, like ["subtitle"] for ops that extract subs
+        - Subs written in-process (SUB_FORMAT_D) are skipped, ffprobe can't read some of them (like TTML), other sub
+          files are probed like vids
+    """
+    if VERIFY_LEVEL is None or _is_dry_run() or Path(out_path).suffix.lower() in SUB_FORMAT_D:
+        return
+    if isinstance(result, (str, os.PathLike)) and os.path.abspath(result) != os.path.abspath(out_path): # Like crop_black_border_from_vid_if_needed() w/ no border
+        return
+    verify_vid(out_path, expected_duration = expected_duration,
+               expected_stream_type_l = out_stream_type_l or _get_expected_stream_type_l(in_arg_l))
 
-    if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
-    return out_vid_path
 
 ####################################################################################################
-# Resize Vid
+# Vid Time Related
 ####################################################################################################
 
-# TODO look into better quality? ffmpeg -i input.mp4 -vf scale=1280:720 -preset slow -crf 18 output.mp4    https://ottverse.com/change-resolution-resize-scale-video-using-ffmpeg/
-def scale_vid(new_vid_dim_tup, in_vid_path, out_vid_path):
+# Encoder to re-encode the head / tail of a "smart" trim_vid() with, per source vid codec, so the re-encoded
+# segments can be losslessly concatenated w/ the stream copied middle
+SMART_TRIM_ENCODER_D = {"h264": "libx264",
+                        "hevc": "libx265"}
+
+# Used when trim_vid() needs to re-encode & no encoding_profile is given
+TRIM_REENCODE_ARG_L = ["-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-c:a", "aac"]
+
+
+def _get_packet_times_cmd_l(vid_file_path):
+    return ["ffprobe", "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,dts_time,flags",
+            "-of", "csv=p=0",
+            vid_file_path]
+
+
+@functools.lru_cache(maxsize = 256)
+def _get_vid_packet_times__cached(file_fingerprint):
     """
-        new_vid_dims = w x h
-        Example - ffmpeg -i video.mov -vf "scale=250:150" new_movie.mp4
-        Will reduce H by 1 if not even
+        Returns (packet_time_l, keyframe_time_l, keyframe_dts_time_l)
+        - packet_time_l & keyframe_time_l are sorted pts times of all vid packets & keyframes
+        - keyframe_dts_time_l[i] is the decode time of keyframe_time_l[i], which is earlier if the vid has B-frames
     """
-    # Create out_vid_path if not exist
-    out_vid_parent_dir_path_obj = Path(out_vid_path).parent
-    out_vid_parent_dir_path_obj.mkdir(parents=True,exist_ok=True)
+    result = sp.run(_get_packet_times_cmd_l(file_fingerprint[0]),
+                     stdout=sp.PIPE, stderr=sp.PIPE, universal_newlines=True)
+    if result.returncode != 0:
+        raise ValueError(f"Return code does not equal 0: {result.returncode=}, {file_fingerprint=}, {result.stderr=}")
+    return _parse_packet_times(result.stdout)
+
+
+def _parse_packet_times(packet_times_csv_str):
+    packet_time_l = []
+    keyframe_time_tup_l = []
+    for line in packet_times_csv_str.splitlines():
+        pts_time_str, dts_time_str, flags = (line.split(",") + ["", ""])[:3]
+        if pts_time_str in ("", "N/A"):
+            continue
+        packet_time_l.append(float(pts_time_str))
+        if "K" in flags:
+            dts_time = float(dts_time_str) if dts_time_str not in ("", "N/A") else float(pts_time_str)
+            keyframe_time_tup_l.append((float(pts_time_str), dts_time))
+
+    keyframe_time_tup_l.sort()
+    return (tuple(sorted(packet_time_l)),
+            tuple(pts_time for pts_time, _ in keyframe_time_tup_l),
+            tuple(dts_time for _, dts_time in keyframe_time_tup_l))
+
+
+def get_vid_keyframe_times(vid_file_path):
+    """
+        Returns sorted tuple of keyframe times (sec) of the first vid stream
+        - Only reads packet headers (no decoding), cached per version of the file
+    """
+    return _get_vid_packet_times__cached(_get_file_fingerprint(vid_file_path))[1]
 
-    # Delete out_vid_path if exists
-    fsu.delete_if_exists(out_vid_path)
 
-    w = new_vid_dim_tup[0]
-    h = new_vid_dim_tup[1]
+def _write_concat_list_file(file_path_l, concat_list_file_path):
+    """ Writes list file for ffmpeg's concat demuxer """
+    with open(concat_list_file_path, "w", encoding = "utf-8") as f:
+        for file_path in file_path_l:
+            escaped_file_path = Path(file_path).resolve().as_posix().replace("'", "'\\''")
+            f.write(f"file '{escaped_file_path}'\n")
 
-    # otherwise will get error:  ffmpeg height not divisible by 2
-    if h % 2 != 0:
-        h = h - 1
 
-    cmd = f'ffmpeg -i {in_vid_path} -vf "scale={w}:{h}" {out_vid_path}'
-    print(f"Running: {cmd}...")
-    sp.call(cmd, shell = True)
+def _get_trim_vid__copy_cmd(in_vid_path, out_vid_path, time_tup):
+    """ Fast, but start snaps to the keyframe before time_tup[0] """
+    t1, t2 = time_tup
+    return ["ffmpeg", "-y",
+            "-ss", "%0.2f"%t1,
+            "-i", str(Path(in_vid_path)),
+            "-t", "%0.2f"%(t2-t1),
+            "-vcodec", "copy", "-acodec", "copy", str(Path(out_vid_path))]
 
-    if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
-    return out_vid_path
 
-####################################################################################################
-# Crop vid
-####################################################################################################
+def _get_trim_vid__reencode_cmd(in_vid_path, out_vid_path, time_tup, encoding_profile = None):
+    """ Frame accurate, but re-encodes the whole trimmed vid """
+    return ["ffmpeg", "-y", "-hide_banner",
+            "-ss", f"{time_tup[0]:.6f}",
+            "-i", str(Path(in_vid_path)),
+            "-t", f"{time_tup[1] - time_tup[0]:.6f}",
+            *_get_ffmpeg_thread_arg_l(),
+            *_get_encoding_arg_l(encoding_profile, TRIM_REENCODE_ARG_L),
+            str(Path(out_vid_path))]
 
-def crop_vid(w, h, x, y, in_vid_path, out_vid_path):
-    """
-        w: Width of the output video (out_w). It defaults to iw. This expression is evaluated only once during the filter configuration.
-        h: Height of the output video (out_h). It defaults to ih. This expression is evaluated only once during the filter configuration.
-        x: Horizontal position, in the input video, of the left edge of the output video. It defaults to (in_w-out_w)/2. This expression is evaluated per-frame.
-        y: Vertical position, in the input video, of the top edge of the output video. It defaults to (in_h-out_h)/2. This expression is evaluated per-frame.
 
-        https://www.bogotobogo.com/FFMpeg/ffmpeg_cropping_video_image.php
+def _get_trim_vid__smart_cmd_l(in_vid_path, out_vid_path, time_tup, encoding_profile, tmp_dir_path, probe_data, packet_times_tup):
     """
+        Frame accurate at near stream copy speed:
+            - Only re-encodes the head (time_tup[0] -> 1st keyframe) & tail (last keyframe -> time_tup[1])
+            - Stream copies all the GOPs in between
+            - Audio is re-encoded for the exact time range (cheap compared to vid)
+            - Segments are written as .ts to tmp_dir_path so each keeps its own codec headers, then losslessly concatenated
+        Returns list of cmds to run in order
+        Falls back to re-encoding if there's no keyframe inside time_tup or the codec is not in SMART_TRIM_ENCODER_D
+        - probe_data & packet_times_tup are passed in so async_trim_vid() can get them w/o blocking
+    """
+    t1, t2 = time_tup
+    vid_stream_d = next((d for d in probe_data.stream_d_l if d.get("codec_type") == "video"), {})
+
+    packet_time_l, keyframe_time_l, _ = packet_times_tup
+    first_keyframe_i = bisect.bisect_left(keyframe_time_l, t1)
+    last_keyframe_i = bisect.bisect_right(keyframe_time_l, t2) - 1
+
+    if probe_data.vid_codec not in SMART_TRIM_ENCODER_D or first_keyframe_i >= last_keyframe_i:
+        print(f"Can't smart trim {in_vid_path=} w/ {probe_data.vid_codec=} & {time_tup=}, re-encoding instead...")
+        return [_get_trim_vid__reencode_cmd(in_vid_path, out_vid_path, time_tup, encoding_profile)]
+
+    first_keyframe_time = keyframe_time_l[first_keyframe_i]
+    last_keyframe_time = keyframe_time_l[last_keyframe_i]
+
+    # Seeking to a keyframe's rounded pts_time could land just before it & snap to the previous keyframe
+    keyframe_seek_offset = 0.0005
+
+    # Stream copying w/ -t can let a few reordered (B-frame) packets from after last_keyframe_time through,
+    # which would then be shown twice, so copy an exact num of packets instead
+    num_copy_packets = (bisect.bisect_left(packet_time_l, last_keyframe_time - keyframe_seek_offset)
+                        - bisect.bisect_left(packet_time_l, first_keyframe_time - keyframe_seek_offset))
+
+    # Encoder must match the stream copied segment, so it goes after encoding_profile's args to override its -c:v
+    reencode_arg_l = [*_get_ffmpeg_thread_arg_l(), *_get_encoding_arg_l(encoding_profile, TRIM_REENCODE_ARG_L),
+                      "-c:v", SMART_TRIM_ENCODER_D[probe_data.vid_codec]]
+    if vid_stream_d.get("pix_fmt"):
+        reencode_arg_l += ["-pix_fmt", vid_stream_d["pix_fmt"]]
+
+    cmd_l_l = []
+    seg_vid_path_l = []
+
+    def _add_seg_cmd(seg_t1, seg_len_arg_l, codec_arg_l):
+        seg_vid_path = os.path.join(tmp_dir_path, f"seg_{len(seg_vid_path_l)}.ts")
+        cmd_l_l.append(["ffmpeg", "-y", "-hide_banner",
+                        "-ss", f"{seg_t1:.6f}",
+                        "-i", str(Path(in_vid_path)),
+                        *seg_len_arg_l,
+                        "-map", "0:v:0", "-an", "-sn",
+                        *codec_arg_l,
+                        seg_vid_path])
+        seg_vid_path_l.append(seg_vid_path)
+
+    if first_keyframe_time - t1 >= 0.001:
+        _add_seg_cmd(t1, ["-t", f"{first_keyframe_time - t1:.6f}"], reencode_arg_l)
+    _add_seg_cmd(first_keyframe_time + keyframe_seek_offset, ["-frames:v", str(num_copy_packets)], ["-c:v", "copy"])
+    if t2 - last_keyframe_time >= 0.001:
+        _add_seg_cmd(last_keyframe_time, ["-t", f"{t2 - last_keyframe_time:.6f}"], reencode_arg_l)
+
+    concat_list_file_path = os.path.join(tmp_dir_path, "concat_list.txt")
+    _write_concat_list_file(seg_vid_path_l, concat_list_file_path)
+
+    cmd_l_l.append(["ffmpeg", "-y", "-hide_banner",
+                    "-f", "concat", "-safe", "0", "-i", concat_list_file_path,
+                    "-ss", f"{t1:.6f}", "-t", f"{t2 - t1:.6f}", "-i", str(Path(in_vid_path)),
+                    "-map", "0:v:0", "-map", "1:a:0?",
+                    "-c:v", "copy", "-c:a", "aac",
+                    str(Path(out_vid_path))])
+    return cmd_l_l
+
+
+def _get_trim_vid_cmd_l(in_vid_path, out_vid_path, time_tup, mode, encoding_profile, tmp_dir_path,
+                        probe_data = None, packet_times_tup = None):
+    """ Returns list of cmds to run in order for trim_vid(), probe_data & packet_times_tup are only used by "smart" mode """
+    if mode == "copy":
+        return [_get_trim_vid__copy_cmd(in_vid_path, out_vid_path, time_tup)]
+    if mode == "smart":
+        return _get_trim_vid__smart_cmd_l(in_vid_path, out_vid_path, time_tup, encoding_profile, tmp_dir_path,
+                                          probe_data, packet_times_tup)
+    if mode == "reencode":
+        return [_get_trim_vid__reencode_cmd(in_vid_path, out_vid_path, time_tup, encoding_profile)]
+    raise ValueError(f"Unrecognized {mode=}")
+
+
+@_incremental_op("out_vid_path", ["in_vid_path"])
+def trim_vid(in_vid_path, out_vid_path, time_tup, mode = "copy", encoding_profile = None):
+    """
+        Trims vid time from time_tup[0] to time_tup[1]
+        mode:
+            "copy"     - Stream copy, fastest, but start snaps to the keyframe before time_tup[0]
+            "smart"    - Frame accurate, only re-encodes the partial GOPs at the start & end, near "copy" speed
+            "reencode" - Frame accurate, re-encodes the whole trimmed vid
+        encoding_profile - Key of ENCODING_PROFILE_D to re-encode w/, not used by "copy" mode
+    """
+    probe_data = packet_times_tup = None
+    if mode == "smart":
+        probe_data = get_vid_probe_data(in_vid_path)
+        packet_times_tup = _get_vid_packet_times__cached(_get_file_fingerprint(in_vid_path))
 
-    fsu.delete_if_exists(out_vid_path)
-
-    cmd = f'ffmpeg -i {in_vid_path} -vf "crop={w}:{h}:{x}:{y}" {out_vid_path}'
-    print(f"Running: {cmd}...")
-    sp.call(cmd, shell = True)
+    with tempfile.TemporaryDirectory() as tmp_dir_path:
+        for cmd_l in _get_trim_vid_cmd_l(in_vid_path, out_vid_path, time_tup, mode, encoding_profile, tmp_dir_path,
+                                         probe_data, packet_times_tup):
+            _run_cmd(cmd_l)
 
     if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
+    return out_vid_path
 
 
-def crop_black_border_from_vid_if_needed(in_vid_path, out_vid_path):
-    fsu.delete_if_exists(out_vid_path)
-    Path(out_vid_path).parent.mkdir(parents=True, exist_ok=True)
-
-    cropdetect_output = sp.run(['ffmpeg', '-hide_banner', '-i', str(Path(in_vid_path)), '-vf', 'cropdetect', '-t', '1', '-f', 'null', 'pipe:'], stdout=sp.PIPE, stderr=sp.STDOUT, universal_newlines=True).stdout
-
-    # print(f"{cropdetect_output=}")
-    # # print(f"{cropdetect_output.=}")
-    # line_l = []
-    # for line in cropdetect_output.split("\n"):
-    #     line_l.append(line)
-    # pprint(line_l)
-    # print("========================================================================")
-    # print("========================================================================")
-    # print("========================================================================")
-    # print("========================================================================")
-
-    # Return: crop=480:304:72:4
-    crop_str = re.search('crop=.*', cropdetect_output).group(0)  # Find the first match of "crop=", and return all characters from "crop=" up to new line.
-
-    # ffmpeg -hide_banner -i in_vid_path -vf crop=480:304:72:4,setsar=1 out_vid_path
-    # Can fail with msg like "Invalid too big or non positive size for width '-1264' or height '-704'"
-    # - If this happens, will not throw exception, but will make out_vid_path w/ 0 bytes
-    # - This fail happens almost immediately, no significant time lost
-    # - Therefore, just return in_vid_path if no new vid created
-    # sp.run(['ffmpeg', '-hide_banner', '-i', f'"{in_vid_path}"', '-vf', crop_str+',setsar=1', f'"{out_vid_path}"'])
-    sp.run(['ffmpeg', '-hide_banner', '-i', str(Path(in_vid_path)), '-vf', crop_str+',setsar=1', str(Path(out_vid_path))])
-
-    if not Path(out_vid_path).is_file():
-        raise FileNotFoundError(f"File does not exist, not sure what could cause this: {out_vid_path=}")
-
-    # just return in_vid_path if no new vid created
-    if os.path.getsize(out_vid_path) == 0:
-        fsu.delete_if_exists(out_vid_path)
-        return in_vid_path
+def _get_trim_vid_multi__copy_cmd(in_vid_path, out_vid_path_time_tup_l):
+    """
+        All outputs are cut from 1 demux of in_vid_path, so have to seek on the output side, which drops packets by
+        decode time, so seek to the decode time of the keyframe before each start to keep its whole GOP
+    """
+    _, keyframe_time_l, keyframe_dts_time_l = _get_vid_packet_times__cached(_get_file_fingerprint(in_vid_path))
+
+    cmd_l = ["ffmpeg", "-y", "-hide_banner", "-i", str(Path(in_vid_path))]
+    for out_vid_path, (t1, t2) in out_vid_path_time_tup_l:
+        keyframe_i = max(0, bisect.bisect_right(keyframe_time_l, t1 + 0.0005) - 1)
+        seek_time = keyframe_dts_time_l[keyframe_i] - 0.0005 if keyframe_time_l else t1
+        if seek_time > 0: # 1st keyframe's decode time can be < 0, seeking to 0 would drop it
+            cmd_l += ["-ss", f"{seek_time:.6f}"]
+        cmd_l += ["-t", f"{t2 - max(0, seek_time):.6f}",
+                  "-map", "0:v:0?", "-map", "0:a:0?",
+                  "-c", "copy",
+                  str(Path(out_vid_path))]
+    return cmd_l
+
+
+def _get_trim_vid_multi__reencode_cmd(in_vid_path, out_vid_path_time_tup_l, encoding_profile = None):
+    """ Seeks the input to the earliest start, then each output discards decoded frames until its own start """
+    in_seek_time = min(t1 for _, (t1, _) in out_vid_path_time_tup_l)
+
+    cmd_l = ["ffmpeg", "-y", "-hide_banner", "-ss", f"{in_seek_time:.6f}", "-i", str(Path(in_vid_path))]
+    for out_vid_path, (t1, t2) in out_vid_path_time_tup_l:
+        cmd_l += ["-ss", f"{t1 - in_seek_time:.6f}",
+                  "-t", f"{t2 - t1:.6f}",
+                  "-map", "0:v:0?", "-map", "0:a:0?",
+                  *_get_ffmpeg_thread_arg_l(),
+                  *_get_encoding_arg_l(encoding_profile, TRIM_REENCODE_ARG_L),
+                  str(Path(out_vid_path))]
+    return cmd_l
+
+
+def trim_vid_multi(in_vid_path, out_vid_path_time_tup_l, mode = "copy", num_workers = 1, encoding_profile = None):
+    """
+        Like calling trim_vid(in_vid_path, out_vid_path, time_tup) for each (out_vid_path, time_tup) in
+        out_vid_path_time_tup_l, but reads in_vid_path once instead of re-opening & re-seeking it for each clip
+        mode:
+            "copy"     - Same as trim_vid(mode = "copy"), all clips are written by 1 ffmpeg call
+            "reencode" - Same as trim_vid(mode = "reencode"), each decoded frame is shared by all clips that need it
+                         - If num_workers > 1, clips are split into num_workers groups of nearby time ranges, which
+                           are decoded & encoded in parallel
+        encoding_profile - Key of ENCODING_PROFILE_D to re-encode w/, not used by "copy" mode
+        Returns list of out_vid_paths
+    """
+    for out_vid_path, _ in out_vid_path_time_tup_l:
+        prep_out_path(out_vid_path)
+
+    op_name = _op_name_var.get() or "trim_vid_multi"
+    if mode == "copy":
+        _run_cmd(_get_trim_vid_multi__copy_cmd(in_vid_path, out_vid_path_time_tup_l), op_name)
+    elif mode == "reencode":
+        sorted_out_vid_path_time_tup_l = sorted(out_vid_path_time_tup_l, key = lambda tup: tup[1][0])
+        group_size = -(-len(sorted_out_vid_path_time_tup_l) // max(1, num_workers)) # Round up
+        cmd_l_l = [_get_trim_vid_multi__reencode_cmd(in_vid_path, sorted_out_vid_path_time_tup_l[i:i + group_size], encoding_profile)
+                   for i in range(0, len(sorted_out_vid_path_time_tup_l), group_size)]
+
+        _run_cmd_l_in_threads(cmd_l_l, op_name)
     else:
-        return out_vid_path
+        raise ValueError(f"Unrecognized {mode=}")
+
+    for out_vid_path, _ in out_vid_path_time_tup_l:
+        if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
+        _verify_op_out(out_vid_path, in_arg_l = [in_vid_path])
+    return [out_vid_path for out_vid_path, _ in out_vid_path_time_tup_l]
+
+####################################################################################################
+# Scene, silence & keyframe index
+####################################################################################################
+
+VID_INDEX_VERSION = 1 # Bump to rebuild all saved indexes when how they're made changes
 
 
-def crop_sides_of_vid_to_match_aspect_ratio(vid_dim_tup_to_match_aspect_ratio, in_vid_path, out_vid_path):
+class Vid_Index():
     """
-        Makes in_vid match given aspect ratio by only cropping the sides of video
-        Good for trimming sides of MC Parkour vids while keeping center
+        Scene cut, silence & keyframe times of a vid, made by get_vid_index(), for picking clip time ranges fast
+        - scene_cut_time_l - Sorted times (sec) of frames that differ a lot from the frame before
+        - silence_tup_l - Sorted (start, end) times of silent parts of the first audio stream
+        - keyframe_time_l - Sorted keyframe times, trim_vid(mode = "copy") is exact if cut on these
+    """
+    def __init__(self, vid_path, duration, scene_cut_time_l, silence_tup_l, keyframe_time_l):
+        self.vid_path = vid_path
+        self.duration = duration
+        self.scene_cut_time_l = list(scene_cut_time_l)
+        self.silence_tup_l = [tuple(silence_tup) for silence_tup in silence_tup_l]
+        self.keyframe_time_l = list(keyframe_time_l)
+
+    def to_d(self):
+        return {"duration": self.duration,
+                "scene_cut_time_l": self.scene_cut_time_l,
+                "silence_tup_l": self.silence_tup_l,
+                "keyframe_time_l": self.keyframe_time_l}
+
+    @staticmethod
+    def _get_nearest_time(time_l, t):
+        i = bisect.bisect_left(time_l, t)
+        near_time_l = time_l[max(0, i - 1):i + 1]
+        if not near_time_l:
+            return None
+        return min(near_time_l, key = lambda near_time: abs(near_time - t))
+
+    def get_nearest_scene_cut(self, t):
+        """ Returns scene cut time nearest to t (sec), or None if no scene cuts """
+        return self._get_nearest_time(self.scene_cut_time_l, t)
+
+    def get_nearest_keyframe(self, t):
+        return self._get_nearest_time(self.keyframe_time_l, t)
+
+    def get_silence_tup_l(self, t1 = 0, t2 = None):
+        """ Returns (start, end) of silences that overlap t1 -> t2 """
+        t2 = self.duration if t2 is None else t2
+        return [(start, end) for start, end in self.silence_tup_l if start < t2 and end > t1]
+
+    def get_segment_tup_l(self, min_len, max_len, non_overlapping = False):
+        """
+            Returns sorted (t1, t2) time ranges between 2 scene cuts (or the start / end of the vid) w/ length from
+            min_len to max_len sec
+            - non_overlapping - If True, greedily picks the longest segment from each start, then continues from its end
+        """
+        bound_time_l = sorted({0.0, *self.scene_cut_time_l, self.duration})
+
+        segment_tup_l = []
+        start_i = 0
+        while start_i < len(bound_time_l):
+            t1 = bound_time_l[start_i]
+            # Never end at start_i, a 0 len segment would also stop non_overlapping from moving on when min_len is 0
+            end_i_l = range(max(start_i + 1, bisect.bisect_left(bound_time_l, t1 + min_len)),
+                            bisect.bisect_right(bound_time_l, t1 + max_len))
+            if not non_overlapping:
+                segment_tup_l += [(t1, bound_time_l[end_i]) for end_i in end_i_l]
+                start_i += 1
+            elif end_i_l:
+                segment_tup_l.append((t1, bound_time_l[end_i_l[-1]]))
+                start_i = end_i_l[-1]
+            else:
+                start_i += 1
+        return segment_tup_l
+
+
+def _get_vid_index_path(vid_path):
+    """ Index is a hidden json file next to vid_path, so it moves w/ the vid & is shared by all jobs that use it """
+    return os.path.join(os.path.dirname(os.path.abspath(vid_path)), f".{os.path.basename(vid_path)}.vid_index.json")
+
+
+def _parse_scene_cut_and_silence_output(ffmpeg_output, duration):
+    """ Returns (scene_cut_time_l, silence_tup_l) from ffmpeg's stderr w/ the showinfo & silencedetect filters """
+    scene_cut_time_l = sorted(float(time_str) for time_str in re.findall(r"\bn:\s*\d+\s+pts:\s*\S+\s+pts_time:([-\d.e]+)", ffmpeg_output))
+
+    silence_tup_l = []
+    silence_start = None
+    for match in re.finditer(r"silence_(start|end): ([-\d.e]+)", ffmpeg_output):
+        if match.group(1) == "start":
+            silence_start = max(0.0, float(match.group(2)))
+        elif silence_start is not None:
+            silence_tup_l.append((silence_start, float(match.group(2))))
+            silence_start = None
+    if silence_start is not None: # Silent until the end
+        silence_tup_l.append((silence_start, duration))
+    return scene_cut_time_l, silence_tup_l
+
+
+def get_vid_index(vid_path, scene_threshold = 0.3, silence_noise_db = -30, silence_min_len = 0.5, analysis_w = 320):
     """
-    in_vid_dim_tup = get_vid_dims(in_vid_path)
-    in_vid_w = in_vid_dim_tup[0]
-    in_vid_h = in_vid_dim_tup[1]
-    print(f"    {in_vid_w=}")
-    print(f"    {in_vid_h=}")
+        Returns Vid_Index of vid_path, scene cuts & silences are found in 1 decode of the vid, keyframes from
+        packet headers w/o decoding
+        - Saved next to vid_path by _get_vid_index_path(), reused by later calls until the vid's content or
+          these params change
+        - scene_threshold - 0 to 1, min scene score (ffmpeg's select filter) for a frame to count as a scene cut
+        - silence_noise_db & silence_min_len - Quieter than silence_noise_db for at least silence_min_len sec is silence
+        - analysis_w - Frames are downscaled to this width before scoring, which is much faster & about as accurate
+        - Returns None in a dry_run() if the vid isn't indexed yet
+    """
+    param_d = {"version": VID_INDEX_VERSION,
+               "scene_threshold": scene_threshold,
+               "silence_noise_db": silence_noise_db,
+               "silence_min_len": silence_min_len,
+               "analysis_w": analysis_w}
+    vid_fingerprint = _get_file_content_fingerprint(vid_path)
+    vid_index_path = _get_vid_index_path(vid_path)
+
+    try:
+        with open(vid_index_path) as vid_index_file:
+            vid_index_file_d = json.load(vid_index_file)
+        if vid_index_file_d.get("vid_fingerprint") == vid_fingerprint and vid_index_file_d.get("param_d") == param_d:
+            return Vid_Index(vid_path, **vid_index_file_d["vid_index_d"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    probe_data = get_vid_probe_data(vid_path)
+
+    cmd_l = ["ffmpeg", "-hide_banner", "-nostats", "-i", str(Path(vid_path)),
+             "-map", "0:v:0", "-vf", f"scale={analysis_w}:-2,select='gt(scene,{scene_threshold})',showinfo"]
+    if probe_data.audio_codec:
+        cmd_l += ["-map", "0:a:0", "-af", f"silencedetect=noise={silence_noise_db}dB:d={silence_min_len}"]
+    cmd_l += ["-f", "null", "-"]
+    if _plan_cmd_if_dry_run(cmd_l): # Nothing is decoded or saved
+        return None
+
+    print(f"Running: {sp.list2cmdline(cmd_l)}...")
+    result = sp.run(cmd_l, stdout = sp.DEVNULL, stderr = sp.PIPE, universal_newlines = True)
+    if result.returncode != 0:
+        raise ValueError(f"Return code does not equal 0: {result.returncode=}, {vid_path=}, {result.stderr[-2000:]=}")
+
+    scene_cut_time_l, silence_tup_l = _parse_scene_cut_and_silence_output(result.stderr, probe_data.duration)
+    vid_index = Vid_Index(vid_path, probe_data.duration, scene_cut_time_l, silence_tup_l, get_vid_keyframe_times(vid_path))
+
+    try:
+        with open(vid_index_path + ".tmp", "w") as vid_index_file:
+            json.dump({"vid_fingerprint": vid_fingerprint, "param_d": param_d, "vid_index_d": vid_index.to_d()}, vid_index_file)
+        os.replace(vid_index_path + ".tmp", vid_index_path)
+    except OSError as e: # Like a read-only dir, index still works, just isn't reused
+        print(f"WARNING: Could not save vid index - {vid_index_path=}, {e=}")
+    return vid_index
+
+
+
+####################################################################################################
+# Fused filter-graph pipeline
+####################################################################################################
+
+def _get_crop_tup_to_match_aspect_ratio(in_vid_dim_tup, vid_dim_tup_to_match_aspect_ratio, in_vid_path = None):
+    """ Returns (w, h, x, y) crop that makes in_vid_dim_tup match given aspect ratio by only cropping the sides """
+    in_vid_w, in_vid_h = in_vid_dim_tup
 
     aspect_ratio = vid_dim_tup_to_match_aspect_ratio[0] / vid_dim_tup_to_match_aspect_ratio[1]
 
     new_vid_w = int(in_vid_h * aspect_ratio) # TMP NOT SURE IF ADDING INT BREAKS SOMETHING
-    print(f"    new vid dims {new_vid_w} x {in_vid_h}")
 
     if new_vid_w > in_vid_w:
         raise Impossible_Dims_Exception(f"ERROR: {new_vid_w=} > {in_vid_w=}, This means it's impossible to make \
@@ -253,38 +1277,568 @@ or by stretching) or by cropping height of in_vid, which is out of the scope of
         w_diff = w_diff - 1
 
     num_pixels_to_trim_from_both_sides = int(w_diff / 2)
-    # print(f"----------------")
-
-    # print(f"{in_vid_w=}")
-    # print(f"{new_vid_w=}")
-    # print(f"{w_diff=}")
-    # print(f"----------------")
-
-
-    # crop_vid(w = w_diff,
-    crop_vid(w = new_vid_w,
-             h = in_vid_h,
-             x = num_pixels_to_trim_from_both_sides,
-             y = 0,
-             in_vid_path = in_vid_path, out_vid_path = out_vid_path)
-
-    print(f"    ----------------")
-    print(f"    {vid_dim_tup_to_match_aspect_ratio=}")
-    print(f"    {in_vid_dim_tup=}")
-    print(f"    {in_vid_w=}")
-    print(f"    {new_vid_w=}")
-    print(f"    {w_diff=}")
-    print(f"    ----------------")
-
-    print(f"    {in_vid_dim_tup=}")
-    print(f"    {aspect_ratio=}")
-    print(f"    {new_vid_w=}")
-    print(f"    {w_diff=}")
-    print(f"    {num_pixels_to_trim_from_both_sides=}")
-    # exit()
-    return out_vid_path
+    return (new_vid_w, in_vid_h, num_pixels_to_trim_from_both_sides, 0)
+
+
+def _get_crop_tup_to_trim_sides_by_percent(in_vid_dim_tup, trim_percent):
+    """ Returns (w, h, x, y) crop that removes trim_percent of total width evenly from both sides """
+    in_vid_w, in_vid_h = in_vid_dim_tup
+
+    num_pixels_wide_to_remove_total = int(in_vid_w * (trim_percent / 100))
+    num_pixels_wide_to_keep_total = in_vid_w - num_pixels_wide_to_remove_total
+    num_pixels_to_trim_from_both_sides = int(num_pixels_wide_to_remove_total / 2)
+    return (num_pixels_wide_to_keep_total, in_vid_h, num_pixels_to_trim_from_both_sides, 0)
+
+
+def _get_col_energy_arr(frame_iter, saliency_weight = 0.25):
+    """
+        Returns (num_frames, w) float32 array of how much motion + detail each column of each gray frame has
+        - Motion is the abs diff from the previous frame, detail (a cheap saliency) is the abs horizontal gradient
+    """
+    import numpy as np
+
+    col_energy_l = []
+    prev_frame = None
+    for frame in frame_iter:
+        frame = frame.astype(np.float32)
+        col_energy = np.zeros(frame.shape[1], dtype = np.float32)
+        col_energy[1:] += saliency_weight * np.abs(np.diff(frame, axis = 1)).sum(axis = 0)
+        if prev_frame is not None:
+            col_energy += np.abs(frame - prev_frame).sum(axis = 0)
+        col_energy_l.append(col_energy)
+        prev_frame = frame
+    return np.array(col_energy_l, dtype = np.float32).reshape(len(col_energy_l), -1)
+
+
+def _get_moving_avg_arr(arr, win_len):
+    """ Centered moving average along axis 0, edges are padded w/ the edge values so the length is kept """
+    import numpy as np
+
+    pad_len = win_len // 2
+    padded_arr = np.pad(arr, [(pad_len, win_len - 1 - pad_len)] + [(0, 0)] * (arr.ndim - 1), mode = "edge")
+    cumsum_arr = np.cumsum(np.concatenate([np.zeros_like(padded_arr[:1], dtype = np.float64), padded_arr]), axis = 0)
+    return (cumsum_arr[win_len:] - cumsum_arr[:-win_len]) / win_len
+
+
+def _get_reframe_x_arr(col_energy_arr, crop_w, fps, smooth_sec, max_speed_px, center_bias):
+    """
+        Returns x of a crop_w wide window for each frame of col_energy_arr, following where the energy is
+        - Energy is smoothed over smooth_sec before picking each frame's best window & the path is smoothed after,
+          then its speed is capped at max_speed_px per sec, so the crop pans instead of jumping
+        - center_bias pulls the window to the center when nothing stands out, like static shots
+    """
+    import numpy as np
+
+    num_frames, w = col_energy_arr.shape
+    smooth_len = max(1, round(smooth_sec * fps))
+    col_energy_arr = _get_moving_avg_arr(col_energy_arr, smooth_len)
+
+    # Energy inside the window at every x, from a cumsum over columns
+    col_cumsum_arr = np.concatenate([np.zeros((num_frames, 1)), np.cumsum(col_energy_arr, axis = 1)], axis = 1)
+    window_energy_arr = col_cumsum_arr[:, crop_w:] - col_cumsum_arr[:, :-crop_w]
+    window_energy_arr /= window_energy_arr.max(axis = 1, keepdims = True) + 1e-6 # Flat (or empty) frames become all ~equal
+
+    max_x = w - crop_w
+    x_arr = np.arange(max_x + 1)
+    window_energy_arr += center_bias * (1 - np.abs(x_arr - max_x / 2) / (max_x / 2 + 1e-6))
+
+    reframe_x_arr = _get_moving_avg_arr(window_energy_arr.argmax(axis = 1).astype(np.float64), smooth_len)
+
+    max_step = max_speed_px / fps
+    for frame_i in range(1, num_frames):
+        reframe_x_arr[frame_i] = np.clip(reframe_x_arr[frame_i], reframe_x_arr[frame_i - 1] - max_step,
+                                         reframe_x_arr[frame_i - 1] + max_step)
+    return reframe_x_arr
+
+
+@functools.lru_cache(maxsize = 256)
+def _get_reframe_x_tup__cached(analysis_cmd_tup, analysis_frame_shape_tup, analysis_fps, analysis_crop_w, smooth_sec,
+                               max_speed_px, center_bias, in_vid_fingerprint_tup):
+    """
+        Returns the crop window x (in analysis px) per analysis frame, or None if the analysis cmd gave no frames
+        - in_vid_fingerprint_tup is only part of the cache key, so the path is re-analyzed if an input changes
+    """
+    col_energy_arr = _get_col_energy_arr(_iter_pipe_frames(list(analysis_cmd_tup), analysis_frame_shape_tup))
+    if not len(col_energy_arr):
+        return None
+    return tuple(_get_reframe_x_arr(col_energy_arr, analysis_crop_w, analysis_fps, smooth_sec, max_speed_px, center_bias).tolist())
+
+
+def _get_reframe_sendcmd_str(x_l, fps, crop_label):
+    """ sendcmd cmds that move crop_label's x linearly between each x of x_l (1 per 1 / fps sec), as crop re-evaluates x per frame """
+    cmd_str_l = []
+    for x_i, x in enumerate(x_l):
+        next_x = x_l[min(x_i + 1, len(x_l) - 1)]
+        frame_time = x_i / fps
+        cmd_str_l.append(f"{frame_time:.3f} {crop_label} x {x:.1f}+{(next_x - x) * fps:.3f}*(t-{frame_time:.3f});")
+    return "\n".join(cmd_str_l) + "\n"
+
+
+def _parse_cropdetect_output(cropdetect_output):
+    """
+        Returns last valid (w, h, x, y) in cropdetect_output, or None if none found
+        - cropdetect accumulates over the frames it has seen, so the last line covers all of them
+        - Can be invalid like "crop=-1264:-704:..." if the frames checked were all black
+    """
+    crop_tup = None
+    for crop_match in re.finditer(r'crop=(-?\d+):(-?\d+):(-?\d+):(-?\d+)', cropdetect_output):
+        w, h, x, y = [int(g) for g in crop_match.groups()]
+        if w > 0 and h > 0 and x >= 0 and y >= 0:
+            crop_tup = (w, h, x, y)
+    return crop_tup
+
+
+@functools.lru_cache(maxsize = 1024)
+def _detect_black_border_crop_tup__cached(cropdetect_cmd_tup_tup, in_vid_fingerprint_tup):
+    """
+        Runs each cropdetect cmd (1 per sample point) in parallel, returns the smallest (w, h, x, y) that contains
+        every sample's crop, so content seen in any sample is never cropped, or None if no sample had a valid crop
+        - in_vid_fingerprint_tup is only part of the cache key, so the crop is re-detected if an input changes
+    """
+    def _run_cropdetect(cropdetect_cmd_tup):
+        return sp.run(list(cropdetect_cmd_tup), stdout=sp.PIPE, stderr=sp.STDOUT, universal_newlines=True).stdout
+
+    with ThreadPoolExecutor(max_workers = len(cropdetect_cmd_tup_tup)) as executor:
+        cropdetect_output_l = list(executor.map(_run_cropdetect, cropdetect_cmd_tup_tup))
+
+    crop_tup_l = [_parse_cropdetect_output(cropdetect_output) for cropdetect_output in cropdetect_output_l]
+    crop_tup_l = [crop_tup for crop_tup in crop_tup_l if crop_tup is not None]
+    if not crop_tup_l:
+        return None
+
+    x = min(crop_tup[2] for crop_tup in crop_tup_l)
+    y = min(crop_tup[3] for crop_tup in crop_tup_l)
+    w = max(crop_tup[2] + crop_tup[0] for crop_tup in crop_tup_l) - x
+    h = max(crop_tup[3] + crop_tup[1] for crop_tup in crop_tup_l) - y
+    return (w - w % 2, h - h % 2, x, y)
+
+
+def _get_chunk_start_time_l(keyframe_time_l, duration, num_chunks):
+    """ Returns start times of up to num_chunks chunks of about equal length, each starting at a keyframe, 1st is 0 """
+    chunk_start_time_set = {0.0}
+    for chunk_i in range(1, num_chunks):
+        target_time = duration * chunk_i / num_chunks
+        keyframe_i = bisect.bisect_left(keyframe_time_l, target_time)
+        near_keyframe_time_l = keyframe_time_l[max(0, keyframe_i - 1):keyframe_i + 1]
+        if near_keyframe_time_l:
+            chunk_start_time_set.add(min(near_keyframe_time_l, key = lambda keyframe_time: abs(keyframe_time - target_time)))
+    return sorted(chunk_start_time for chunk_start_time in chunk_start_time_set if chunk_start_time < duration)
+
+
+def _get_audio_arg_l(out_arg_l):
+    """ Returns only the audio related args of out_arg_l, like ["-c:a", "aac", "-b:a", "192k"] """
+    audio_arg_l = []
+    for arg_i, arg in enumerate(out_arg_l[:-1]):
+        if arg.endswith(":a") or arg in ("-acodec", "-ar", "-ac", "-af"):
+            audio_arg_l += [arg, out_arg_l[arg_i + 1]]
+    return audio_arg_l
+
+
+class Vid_Pipeline():
+    """
+        Lazily records crop / scale / stack / burn_subs ops on in_vid_path, then compiles them into a single
+        ffmpeg filter graph when run(), so the whole chain is decoded & encoded once instead of once per op
+        with a full intermediate vid written to disk between each op
+        - Each op returns self, so ops can be chained
+        - The other vid given to vstack() can be a path or another Vid_Pipeline, whose ops are fused into the same graph
+        EXAMPLE:
+            Vid_Pipeline(in_vid_path).crop_black_border().crop_sides_to_match_aspect_ratio((1080, 960)) \\
+                                     .vstack(Vid_Pipeline(bottom_vid_path).scale((1080, 960))) \\
+                                     .burn_subs(in_sub_path).run(out_vid_path)
+    """
+    def __init__(self, in_vid_path):
+        self.in_vid_path = in_vid_path
+        self.step_l = [] # [("filter", filter_str, new_dim_tup or None) or ("vstack", bottom_pipeline, None), ...]
+        self._in_vid_dim_tup = None
+        self._tmp_file_str_d = {} # {path: content} of files the ops' filters read, only on disk while cmds run, see _tmp_files()
+
+    def __repr__(self):
+        return f"Vid_Pipeline({self.in_vid_path!r}, step_l={self.step_l!r})"
+
+    ################################################################################################
+    # Ops
+    ################################################################################################
+
+    def crop(self, w, h, x, y):
+        """ Same args as crop_vid() """
+        self.step_l.append(("filter", f"crop={w}:{h}:{x}:{y}", (w, h)))
+        return self
+
+    def crop_sides_to_match_aspect_ratio(self, vid_dim_tup_to_match_aspect_ratio, mode = "center"):
+        """
+            mode:
+                "center" - Keeps the center of the vid
+                "track"  - Crop window pans to follow the action, see track_crop_sides_to_match_aspect_ratio()
+        """
+        if mode == "track":
+            return self.track_crop_sides_to_match_aspect_ratio(vid_dim_tup_to_match_aspect_ratio)
+        if mode != "center":
+            raise ValueError(f"Unrecognized {mode=}")
+        return self.crop(*_get_crop_tup_to_match_aspect_ratio(self.get_dims(), vid_dim_tup_to_match_aspect_ratio,
+                                                               self.in_vid_path))
+
+    def track_crop_sides_to_match_aspect_ratio(self, vid_dim_tup_to_match_aspect_ratio, analysis_w = 160, analysis_fps = 5,
+                                               smooth_sec = 1.5, max_speed = 0.25, center_bias = 0.2):
+        """
+            Like crop_sides_to_match_aspect_ratio(), but the crop window pans to follow motion & detail, like for 9:16
+            reframing of speakers that aren't centered
+            - Analyzes the output of the ops recorded so far at analysis_w px wide & analysis_fps, much faster than real time
+            - max_speed - Max fraction of the vid's w the window can pan per sec
+            - The path is applied in the same ffmpeg pass as the other ops w/ a sendcmd file, which only exists in the
+              temp dir while this pipeline's cmds run, the path itself is cached in-process per input vid version
+        """
+        w, h = self.get_dims()
+        crop_w, crop_h, center_x, _ = _get_crop_tup_to_match_aspect_ratio((w, h), vid_dim_tup_to_match_aspect_ratio, self.in_vid_path)
+        analysis_w = min(analysis_w, w)
+        analysis_h = max(2, round(h * analysis_w / w / 2) * 2)
+        analysis_cmd_l = self.build_cmd("pipe:", extra_filter_str = f"fps={analysis_fps},scale={analysis_w}:{analysis_h},format=gray",
+                                        out_arg_l = ["-v", "error", "-an", "-sn", "-f", "rawvideo", "-pix_fmt", "gray"])
+
+        in_vid_fingerprint_tup = tuple(_get_file_fingerprint(in_vid_path) for in_vid_path in self._get_in_vid_path_l())
+
+        with self._tmp_files():
+            reframe_x_tup = _get_reframe_x_tup__cached(tuple(analysis_cmd_l), (analysis_h, analysis_w), analysis_fps,
+                                                       max(1, round(crop_w * analysis_w / w)), smooth_sec,
+                                                       max_speed * analysis_w, center_bias, in_vid_fingerprint_tup)
+        if reframe_x_tup is None:
+            return self.crop(crop_w, crop_h, center_x, 0)
+
+        crop_label = f"crop@reframe{len(self.step_l)}"
+        x_l = [min(max(x * w / analysis_w, 0), w - crop_w) for x in reframe_x_tup]
+        sendcmd_path = os.path.join(tempfile.gettempdir(), f"vid_edit_utils_reframe_{os.urandom(8).hex()}.sendcmd")
+        self._tmp_file_str_d[sendcmd_path] = _get_reframe_sendcmd_str(x_l, analysis_fps, crop_label)
+
+        self.step_l.append(("filter", f"sendcmd=f={_escape_filter_arg(sendcmd_path)},{crop_label}={crop_w}:{crop_h}:{center_x}:0",
+                            (crop_w, crop_h)))
+        return self
+
+    def crop_sides_by_percent(self, trim_percent):
+        if trim_percent == 0:
+            return self
+        return self.crop(*_get_crop_tup_to_trim_sides_by_percent(self.get_dims(), trim_percent))
+
+    def crop_black_border(self, num_samples = 5, sample_len = 1, min_crop_px = 16):
+        """
+            Runs cropdetect on the output of the ops recorded so far, then crops the detected black border
+            - Samples sample_len sec at num_samples points spread across the vid in parallel, so dark intros don't
+              cause a bad crop, result is cached per version of the input vid(s)
+            - Does nothing if no valid crop is detected, or if the crop would remove < min_crop_px from both w & h
+              (cropdetect rounds to 16 px, so a vid w/ no border can still give a tiny crop)
+        """
+        duration = get_vid_length(self.in_vid_path)
+        seek_time_l = [duration * (sample_i + 0.5) / num_samples for sample_i in range(num_samples)]
+
+        cropdetect_cmd_tup_tup = tuple(tuple(self.build_cmd("pipe:", extra_filter_str = "cropdetect",
+                                                            in_arg_l = ["-ss", f"{max(0, seek_time - sample_len / 2):.3f}"],
+                                                            out_arg_l = ["-t", str(sample_len), "-f", "null"]))
+                                       for seek_time in seek_time_l)
+        in_vid_fingerprint_tup = tuple(_get_file_fingerprint(in_vid_path) for in_vid_path in self._get_in_vid_path_l())
+
+        with self._tmp_files():
+            crop_tup = _detect_black_border_crop_tup__cached(cropdetect_cmd_tup_tup, in_vid_fingerprint_tup)
+        if crop_tup is None:
+            return self
+
+        w, h = self.get_dims()
+        if w - crop_tup[0] < min_crop_px and h - crop_tup[1] < min_crop_px:
+            print(f"No black border to crop ({crop_tup=} vs {(w, h)=}), skipping crop...")
+            return self
+
+        self.crop(*crop_tup)
+        self.step_l.append(("filter", "setsar=1", None))
+        return self
+
+    def scale(self, new_vid_dim_tup):
+        """ new_vid_dim_tup = (w, h), will reduce h by 1 if not even """
+        w = new_vid_dim_tup[0]
+        h = new_vid_dim_tup[1]
+
+        # otherwise will get error:  ffmpeg height not divisible by 2
+        if h % 2 != 0:
+            h = h - 1
+
+        self.step_l.append(("filter", f"scale={w}:{h}", (w, h)))
+        return self
+
+    def vstack(self, bottom_vid):
+        """ bottom_vid - vid path or Vid_Pipeline to stack under the current vid, audio is kept from the top vid """
+        if not isinstance(bottom_vid, Vid_Pipeline):
+            bottom_vid = Vid_Pipeline(bottom_vid)
+        self.step_l.append(("vstack", bottom_vid, None))
+        return self
+
+    def burn_subs(self, in_sub_path, force_style = None):
+        """
+            Burns in_sub_path into vid w/ ffmpeg's subtitles filter, force_style is an ASS style override str
+            - .ass / .ssa subs use the ass filter instead, so their own styling is kept & force_style is ignored
+        """
+        if Path(in_sub_path).suffix.lower() in (".ass", ".ssa"):
+            filter_str = f"ass={_escape_filter_arg(in_sub_path)}"
+        else:
+            filter_str = f"subtitles={_escape_filter_arg(in_sub_path)}"
+            if force_style:
+                filter_str += f":force_style={_escape_filter_arg(force_style)}"
+        self.step_l.append(("filter", filter_str, None))
+        return self
+
+    ################################################################################################
+    # Compile & run
+    ################################################################################################
+
+    def get_dims(self):
+        """ Returns (w, h) of the vid that would be output by the ops recorded so far """
+        if self._in_vid_dim_tup is None:
+            self._in_vid_dim_tup = get_vid_dims(self.in_vid_path)
+
+        dim_tup = self._in_vid_dim_tup
+        for step_type, step_val, step_dim_tup in self.step_l:
+            if step_type == "vstack":
+                dim_tup = (dim_tup[0], dim_tup[1] + step_val.get_dims()[1])
+            elif step_dim_tup is not None:
+                dim_tup = step_dim_tup
+        return dim_tup
+
+    def _get_in_vid_path_l(self):
+        """ Returns all input vid paths in the same order as the -i args of build_cmd() """
+        in_vid_path_l = [self.in_vid_path]
+        for step_type, step_val, _ in self.step_l:
+            if step_type == "vstack":
+                in_vid_path_l += step_val._get_in_vid_path_l()
+        return in_vid_path_l
+
+    def _get_tmp_file_str_d(self):
+        """ Returns _tmp_file_str_d of this pipeline & all pipelines fused into it """
+        tmp_file_str_d = dict(self._tmp_file_str_d)
+        for step_type, step_val, _ in self.step_l:
+            if step_type == "vstack":
+                tmp_file_str_d.update(step_val._get_tmp_file_str_d())
+        return tmp_file_str_d
+
+    @contextmanager
+    def _tmp_files(self):
+        """
+            Writes the files this pipeline's filters read (like sendcmd files) for the cmds run inside, then deletes them,
+            so nothing is left behind & input dirs can be read-only
+            - Don't run cmds of the same pipeline in parallel from separate _tmp_files() calls, the 1st to exit deletes them
+        """
+        tmp_file_str_d = {} if _is_dry_run() else self._get_tmp_file_str_d()
+        try:
+            for tmp_file_path, tmp_file_str in tmp_file_str_d.items():
+                with open(tmp_file_path, "w") as tmp_file:
+                    tmp_file.write(tmp_file_str)
+            yield
+        finally:
+            for tmp_file_path in tmp_file_str_d:
+                fsu.delete_if_exists(tmp_file_path)
+
+    def _uses_filter_complex(self):
+        return any(step_type == "vstack" for step_type, _, _ in self.step_l)
+
+    def _compile(self, in_vid_path_l, graph_part_l, in_filter_str = None):
+        """
+            Adds this pipeline's inputs to in_vid_path_l & its filter chains to graph_part_l
+            Returns label of this pipeline's output vid stream
+        """
+        in_i = len(in_vid_path_l)
+        in_vid_path_l.append(self.in_vid_path)
+
+        cur_label = f"{in_i}:v"
+        filter_str_l = [in_filter_str] if in_filter_str else []
+
+        def _flush_filter_str_l(cur_label):
+            if not filter_str_l:
+                return cur_label
+            new_label = f"v{in_i}_{len(graph_part_l)}"
+            graph_part_l.append(f"[{cur_label}]{','.join(filter_str_l)}[{new_label}]")
+            filter_str_l.clear()
+            return new_label
+
+        for step_type, step_val, _ in self.step_l:
+            if step_type == "filter":
+                filter_str_l.append(step_val)
+            elif step_type == "vstack":
+                cur_label = _flush_filter_str_l(cur_label)
+                bottom_label = step_val._compile(in_vid_path_l, graph_part_l, in_filter_str)
+                new_label = f"v{in_i}_{len(graph_part_l)}"
+                graph_part_l.append(f"[{cur_label}][{bottom_label}]vstack=inputs=2[{new_label}]")
+                cur_label = new_label
+            else:
+                raise ValueError(f"Unrecognized {step_type=}")
+
+        return _flush_filter_str_l(cur_label)
+
+    def build_cmd(self, out_vid_path, out_arg_l = None, extra_filter_str = None, in_arg_l = None, in_filter_str = None):
+        """
+            Returns ffmpeg cmd as list of args
+            - out_arg_l - Extra output args like ["-c:v", "libx264", "-crf", "18"], ffmpeg defaults are used if None
+            - in_arg_l - Args to put before every -i, like ["-ss", "10"]
+            - in_filter_str - Filter to put before every input's ops, extra_filter_str goes after all ops
+            - If no stacking, uses a simple -vf chain so ffmpeg's default stream selection is unchanged
+        """
+        cmd_l = ["ffmpeg", "-y", "-hide_banner"]
+
+        if self._uses_filter_complex():
+            in_vid_path_l = []
+            graph_part_l = []
+            out_label = self._compile(in_vid_path_l, graph_part_l, in_filter_str)
+            if extra_filter_str:
+                graph_part_l.append(f"[{out_label}]{extra_filter_str}[vout]")
+                out_label = "vout"
+
+            for in_vid_path in in_vid_path_l:
+                cmd_l += (in_arg_l or []) + ["-i", str(Path(in_vid_path))]
+            cmd_l += ["-filter_complex", ";".join(graph_part_l),
+                      "-map", f"[{out_label}]",
+                      "-map", "0:a?"]
+        else:
+            cmd_l += (in_arg_l or []) + ["-i", str(Path(self.in_vid_path))]
+            filter_str_l = ([in_filter_str] if in_filter_str else []) + [step_val for _, step_val, _ in self.step_l]
+            if extra_filter_str:
+                filter_str_l.append(extra_filter_str)
+            if filter_str_l:
+                cmd_l += ["-vf", ",".join(filter_str_l)]
+
+        out_arg_l = out_arg_l or []
+        cmd_l += ([] if "-threads" in out_arg_l else _get_ffmpeg_thread_arg_l()) + out_arg_l # So out_arg_l can override FFMPEG_THREADS
+        return cmd_l + [out_vid_path if out_vid_path == "pipe:" else str(Path(out_vid_path))]
+
+    def _run_chunked(self, out_vid_path, out_arg_l, num_chunks):
+        """
+            Splits the vid into num_chunks time ranges starting at keyframes, encodes each chunk's vid in its own ffmpeg
+            in parallel, then losslessly concats the chunks & muxes in the audio, which is encoded in 1 piece
+            - Each chunk's frames are shifted back to their original time before the ops, so burned subs stay in sync
+        """
+        chunk_start_time_l = _get_chunk_start_time_l(get_vid_keyframe_times(self.in_vid_path), get_vid_length(self.in_vid_path),
+                                                     num_chunks)
+        # Chunks share the cores, but never get more than FFMPEG_THREADS each (run_batch()'s per job budget), a -threads
+        # in out_arg_l still wins
+        num_cpus = os.cpu_count() or 1
+        chunk_thread_arg_l = [] if "-threads" in out_arg_l else \
+            ["-threads", str(min(FFMPEG_THREADS or num_cpus, max(1, num_cpus // len(chunk_start_time_l))))]
+        op_name = _op_name_var.get() or "Vid_Pipeline.run"
+
+        with tempfile.TemporaryDirectory() as tmp_dir_path:
+            chunk_vid_path_l = []
+            chunk_cmd_l_l = []
+            for chunk_i, chunk_start_time in enumerate(chunk_start_time_l):
+                in_arg_l = ["-ss", f"{chunk_start_time:.6f}"]
+                if chunk_i + 1 < len(chunk_start_time_l):
+                    in_arg_l += ["-t", f"{chunk_start_time_l[chunk_i + 1] - chunk_start_time:.6f}"]
+
+                # Not .mkv, its duration leaves out the last frame's, which makes the concat demuxer overlap chunks
+                chunk_vid_path = os.path.join(tmp_dir_path, f"chunk_{chunk_i}.mp4")
+                chunk_cmd_l_l.append(self.build_cmd(chunk_vid_path, chunk_thread_arg_l + out_arg_l + ["-an", "-sn"],
+                                                    extra_filter_str = "setpts=PTS-STARTPTS",
+                                                    in_arg_l = in_arg_l,
+                                                    in_filter_str = f"setpts=PTS+{chunk_start_time:.6f}/TB"))
+                chunk_vid_path_l.append(chunk_vid_path)
+
+            _run_cmd_l_in_threads(chunk_cmd_l_l, op_name)
+            for chunk_vid_path in chunk_vid_path_l:
+                if file_not_exist_msg(chunk_vid_path): raise FileNotFoundError(file_not_exist_msg(chunk_vid_path)) # Raise Error if chunk not created
+
+            concat_list_file_path = os.path.join(tmp_dir_path, "concat_list.txt")
+            _write_concat_list_file(chunk_vid_path_l, concat_list_file_path)
+            _run_cmd(["ffmpeg", "-y", "-hide_banner",
+                      "-f", "concat", "-safe", "0", "-i", concat_list_file_path,
+                      "-i", str(Path(self.in_vid_path)),
+                      "-map", "0:v:0", "-map", "1:a:0?",
+                      "-c:v", "copy", *_get_audio_arg_l(out_arg_l),
+                      str(Path(out_vid_path))], op_name)
+
+    def run(self, out_vid_path, out_arg_l = None, encoding_profile = None, num_chunks = 1):
+        """
+            Executes all recorded ops in a single ffmpeg pass, returns out_vid_path
+            - encoding_profile - Key of ENCODING_PROFILE_D, its args go before out_arg_l, so out_arg_l can override them
+            - num_chunks - If > 1, splits long vids at keyframes & encodes the chunks in parallel, which scales across
+                           cores much better than 1 encoder w/ many threads, see _run_chunked()
+        """
+        prep_out_path(out_vid_path)
+
+        with _op_scope("Vid_Pipeline.run"), self._tmp_files():
+            if num_chunks > 1:
+                self._run_chunked(out_vid_path, _get_encoding_arg_l(encoding_profile) + (out_arg_l or []), num_chunks)
+            else:
+                _run_cmd(self.build_cmd(out_vid_path, _get_encoding_arg_l(encoding_profile) + (out_arg_l or [])))
+
+        if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
+        return out_vid_path
+
+    async def async_run(self, out_vid_path, out_arg_l = None, encoding_profile = None):
+        """ Async run(), if cancelled, ffmpeg is stopped & the partial out_vid_path is deleted """
+        prep_out_path(out_vid_path)
+
+        with _op_scope("Vid_Pipeline.async_run"), self._tmp_files():
+            await _async_run_cmd(self.build_cmd(out_vid_path, _get_encoding_arg_l(encoding_profile) + (out_arg_l or [])),
+                                 [out_vid_path])
+
+        if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
+        return out_vid_path
+
+####################################################################################################
+# Resize Vid
+####################################################################################################
+
+# TODO look into better quality? ffmpeg -i input.mp4 -vf scale=1280:720 -preset slow -crf 18 output.mp4    https://ottverse.com/change-resolution-resize-scale-video-using-ffmpeg/
+@_incremental_op("out_vid_path", ["in_vid_path"])
+def scale_vid(new_vid_dim_tup, in_vid_path, out_vid_path, encoding_profile = None, num_chunks = 1):
+    """
+        new_vid_dims = w x h
+        Example - ffmpeg -i video.mov -vf "scale=250:150" new_movie.mp4
+        Will reduce H by 1 if not even
+        num_chunks - If > 1, encodes that many chunks in parallel, see Vid_Pipeline.run()
+    """
+    return Vid_Pipeline(in_vid_path).scale(new_vid_dim_tup).run(out_vid_path, encoding_profile = encoding_profile,
+                                                                num_chunks = num_chunks)
+
+####################################################################################################
+# Crop vid
+####################################################################################################
+
+@_incremental_op("out_vid_path", ["in_vid_path"])
+def crop_vid(w, h, x, y, in_vid_path, out_vid_path, encoding_profile = None, num_chunks = 1):
+    """
+        w: Width of the output video (out_w). It defaults to iw. This expression is evaluated only once during the filter configuration.
+        h: Height of the output video (out_h). It defaults to ih. This expression is evaluated only once during the filter configuration.
+        x: Horizontal position, in the input video, of the left edge of the output video. It defaults to (in_w-out_w)/2. This expression is evaluated per-frame.
+        y: Vertical position, in the input video, of the top edge of the output video. It defaults to (in_h-out_h)/2. This expression is evaluated per-frame.
+
+        num_chunks - If > 1, encodes that many chunks in parallel, see Vid_Pipeline.run()
+
+        https://www.bogotobogo.com/FFMpeg/ffmpeg_cropping_video_image.php
+    """
+    return Vid_Pipeline(in_vid_path).crop(w, h, x, y).run(out_vid_path, encoding_profile = encoding_profile, num_chunks = num_chunks)
+
+
+@_incremental_op("out_vid_path", ["in_vid_path"])
+def crop_black_border_from_vid_if_needed(in_vid_path, out_vid_path, num_samples = 5, encoding_profile = None, num_chunks = 1):
+    """
+        Returns in_vid_path w/o re-encoding if no black border is detected, otherwise returns out_vid_path
+        - See Vid_Pipeline.crop_black_border() for how the border is detected
+    """
+    prep_out_path(out_vid_path)
+
+    vid_pipeline = Vid_Pipeline(in_vid_path).crop_black_border(num_samples)
+    if not vid_pipeline.step_l:
+        return in_vid_path
+    return vid_pipeline.run(out_vid_path, encoding_profile = encoding_profile, num_chunks = num_chunks)
+
 
-def crop_sides_of_vid_by_percent(trim_percent, in_vid_path, out_vid_path):
+@_incremental_op("out_vid_path", ["in_vid_path"])
+def crop_sides_of_vid_to_match_aspect_ratio(vid_dim_tup_to_match_aspect_ratio, in_vid_path, out_vid_path, encoding_profile = None,
+                                            num_chunks = 1, mode = "center"):
+    """
+        Makes in_vid match given aspect ratio by only cropping the sides of video
+        Good for trimming sides of MC Parkour vids while keeping center
+        mode - "center" keeps the center, "track" pans to follow the action, like for 9:16 reframing of speakers near
+               the edge, see Vid_Pipeline.track_crop_sides_to_match_aspect_ratio()
+    """
+    return Vid_Pipeline(in_vid_path).crop_sides_to_match_aspect_ratio(vid_dim_tup_to_match_aspect_ratio, mode).run(out_vid_path,
+                                                                                                                encoding_profile = encoding_profile,
+                                                                                                                num_chunks = num_chunks)
+
+@_incremental_op("out_vid_path", ["in_vid_path"])
+def crop_sides_of_vid_by_percent(trim_percent, in_vid_path, out_vid_path, encoding_profile = None, num_chunks = 1):
     """
         Crops trim_percent of total width of in_vid from the sides evenly, leaving the video centered
         - Good for trimming non-important sides of shows like Family Guy
@@ -298,55 +1852,34 @@ def crop_sides_of_vid_by_percent(trim_percent, in_vid_path, out_vid_path):
 
     if trim_percent == 0:
         print(f"Told to trim sides of video by 0%, so just returning {in_vid_path=} and deleting {out_vid_path=} if exists to remove confusion...")
-        fsu.delete_if_exists(out_vid_path)
+        prep_out_path(out_vid_path)
         return in_vid_path
 
-    in_vid_dim_tup = get_vid_dims(in_vid_path)
-    in_vid_w = in_vid_dim_tup[0]
-    in_vid_h = in_vid_dim_tup[1]
-
-    num_pixels_wide_to_remove_total = int(in_vid_w * (trim_percent / 100))
-    num_pixels_wide_to_keep_total = in_vid_w - num_pixels_wide_to_remove_total
-    num_pixels_to_trim_from_both_sides = int(num_pixels_wide_to_remove_total / 2)
-
-    print(f"{num_pixels_wide_to_remove_total=}")
-    print(f"{num_pixels_wide_to_keep_total=}")
-    print(f"{num_pixels_to_trim_from_both_sides=}")
-    print(f"{in_vid_dim_tup=}")
-
-    crop_vid(w = num_pixels_wide_to_keep_total,
-                h = in_vid_h,
-                x = num_pixels_to_trim_from_both_sides,
-                y = 0,
-                in_vid_path = in_vid_path, out_vid_path = out_vid_path)
-
-    print(f"{(trim_percent / 100)=}")
-    print(f"{num_pixels_wide_to_remove_total=}")
-    print(f"{num_pixels_to_trim_from_both_sides * 2=}")
-    print(f"{in_vid_w - (num_pixels_to_trim_from_both_sides * 2)=}")
-    print(f"{num_pixels_wide_to_keep_total=}")
-    print(f"{num_pixels_to_trim_from_both_sides=}")
-    print(f"{in_vid_dim_tup=}")
-    # exit()
-    return out_vid_path
+    return Vid_Pipeline(in_vid_path).crop_sides_by_percent(trim_percent).run(out_vid_path, encoding_profile = encoding_profile,
+                                                                             num_chunks = num_chunks)
 
 ####################################################################################################
 # Combine multiple vids into new vid
 ####################################################################################################
 
-def stack_vids(top_vid_path, bottom_vid_path, out_vid_path):
-    top_vid_dim_tup = get_vid_dims(top_vid_path)
+def _check_stack_vids_dims(top_vid_dim_tup, bottom_vid_dim_tup):
     top_vid_w = top_vid_dim_tup[0]
-    bottom_vid_dim_tup = get_vid_dims(bottom_vid_path)
     print(f"{bottom_vid_dim_tup=}")
     bottom_vid_w = bottom_vid_dim_tup[0]
 
     if top_vid_w != bottom_vid_w:
         raise Exception(f"Widths of vids not the same, behavior for this not implemented - {top_vid_dim_tup=} , {bottom_vid_dim_tup=}")
 
-    fsu.delete_if_exists(out_vid_path)
-    Path(out_vid_path).parent.mkdir(parents=True, exist_ok=True)
 
+# Used by stack_vids() when no encoding_profile is given
+STACK_VIDS_ARG_L = ["-c:v", "libx264",
+                    "-crf", "18",
+                    "-preset", "veryfast"]
+
+
+@_incremental_op("out_vid_path", ["top_vid_path", "bottom_vid_path"])
+def stack_vids(top_vid_path, bottom_vid_path, out_vid_path, encoding_profile = None, num_chunks = 1):
+    _check_stack_vids_dims(get_vid_dims(top_vid_path), get_vid_dims(bottom_vid_path))
 
     # This command does the following:
     #     ffmpeg is the command to run ffmpeg.
@@ -366,29 +1899,404 @@ def stack_vids(top_vid_path, bottom_vid_path, out_vid_path):
     # Note that this command assumes that both input videos have the same length. If the videos have different lengths,
     # you may need to specify an additional filter to pad one of the videos to match the length of the other. You can
     # also adjust the parameters (e.g. codec, quality, etc.) to suit your needs.
-    cmd = f'ffmpeg \
-        -i {top_vid_path} \
-        -i {bottom_vid_path} \
-        -filter_complex "[0:v][1:v]vstack=inputs=2[v]" \
-        -map "[v]" \
-        -map 0:a \
-        -c:v libx264 \
-        -crf 18 \
-        -preset veryfast \
-        {out_vid_path}'
-
-    print(f"Running: {cmd}...")
-    sp.call(cmd, shell = True)
+    stack_vids_arg_l = _get_encoding_arg_l(encoding_profile, STACK_VIDS_ARG_L)
+    return Vid_Pipeline(top_vid_path).vstack(bottom_vid_path).run(out_vid_path, out_arg_l = stack_vids_arg_l, num_chunks = num_chunks)
 
+
+####################################################################################################
+# Compositor
+####################################################################################################
+
+def _get_fit_filter_str_l(dim_tup, cell_dim_tup, fit_mode):
+    """ Returns filters that fit a vid of dim_tup into cell_dim_tup """
+    if tuple(dim_tup) == tuple(cell_dim_tup):
+        return []
+
+    cell_w, cell_h = cell_dim_tup
+    if fit_mode == "crop":
+        return [f"scale={cell_w}:{cell_h}:force_original_aspect_ratio=increase", f"crop={cell_w}:{cell_h}", "setsar=1"]
+    if fit_mode == "pad":
+        return [f"scale={cell_w}:{cell_h}:force_original_aspect_ratio=decrease",
+                f"pad={cell_w}:{cell_h}:(ow-iw)/2:(oh-ih)/2:black", "setsar=1"]
+    if fit_mode == "stretch":
+        return [f"scale={cell_w}:{cell_h}", "setsar=1"]
+    raise ValueError(f"Unrecognized {fit_mode=}")
+
+
+def _get_composite_duration(in_duration_l, duration_mode):
+    if duration_mode == "first":
+        return in_duration_l[0]
+    if duration_mode == "shortest":
+        return min(in_duration_l)
+    if duration_mode == "longest":
+        return max(in_duration_l)
+    if isinstance(duration_mode, (int, float)):
+        return float(duration_mode)
+    raise ValueError(f"Unrecognized {duration_mode=}")
+
+
+@_incremental_op("out_vid_path", ["in_vid_l"])
+def composite_vids(in_vid_l, out_vid_path, layout = "vstack", num_cols = None, cell_dim_tup = None, fit_mode = "crop",
+                   duration_mode = "first", extend_mode = "freeze", audio_src = 0, encoding_profile = None):
+    """
+        Stacks / tiles any num of vids into 1 in a single ffmpeg pass, all scaling, padding, cropping & duration
+        alignment is done inside the filter graph, so inputs never need their own encode to match each other
+        - in_vid_l - Vid paths or Vid_Pipelines, whose ops are fused into the same graph
+        layout:
+            "vstack" - Top to bottom, w/o cell_dim_tup, inputs are scaled to the 1st's width, keeping aspect ratio
+            "hstack" - Left to right, w/o cell_dim_tup, inputs are scaled to the 1st's height, keeping aspect ratio
+            "grid"   - Rows of num_cols (default ~sqrt(len(in_vid_l))) cells of cell_dim_tup (default the 1st's dims),
+                       left over cells are black
+        fit_mode - How each input is fit into cell_dim_tup:
+            "crop"    - Scale to fill the cell, crop the overflow evenly from both sides
+            "pad"     - Scale to fit in the cell, pad the rest w/ black
+            "stretch" - Scale to the cell, ignoring aspect ratio
+        duration_mode - Length of output - "first", "shortest", "longest" or num of sec
+        extend_mode - What inputs shorter than the output do - "freeze" on the last frame, "loop" or go "black"
+        audio_src - Index of in_vid_l to take audio from, "mix" to mix the audio of all inputs, or None for no audio
+        encoding_profile - Key of ENCODING_PROFILE_D, defaults to the same args as stack_vids()
+    """
+    vid_pipeline_l = [in_vid if isinstance(in_vid, Vid_Pipeline) else Vid_Pipeline(in_vid) for in_vid in in_vid_l]
+    dim_tup_l = [vid_pipeline.get_dims() for vid_pipeline in vid_pipeline_l]
+    in_duration_l = [get_vid_length(vid_pipeline.in_vid_path) for vid_pipeline in vid_pipeline_l]
+    out_duration = _get_composite_duration(in_duration_l, duration_mode)
+
+    if layout == "grid":
+        num_cols = num_cols or math.ceil(len(vid_pipeline_l) ** 0.5)
+        cell_dim_tup = cell_dim_tup or dim_tup_l[0]
+    elif layout not in ("vstack", "hstack"):
+        raise ValueError(f"Unrecognized {layout=}")
+
+    in_vid_path_l = []
+    graph_part_l = []
+    in_arg_l_l = [] # Per input file
+    first_in_i_l = [] # Index of each vid_pipeline's own input file in in_vid_path_l
+    for vid_pipeline_i, (vid_pipeline, dim_tup, in_duration) in enumerate(zip(vid_pipeline_l, dim_tup_l, in_duration_l)):
+        first_in_i_l.append(len(in_vid_path_l))
+        label = vid_pipeline._compile(in_vid_path_l, graph_part_l)
+
+        extend_duration = out_duration - in_duration
+        loop = extend_mode == "loop" and extend_duration > 0
+        in_arg_l_l += [["-stream_loop", "-1"] if loop else []] * (len(in_vid_path_l) - first_in_i_l[-1])
+
+        if cell_dim_tup:
+            filter_str_l = _get_fit_filter_str_l(dim_tup, cell_dim_tup, fit_mode)
+        elif layout == "vstack" and dim_tup[0] != dim_tup_l[0][0]:
+            filter_str_l = [f"scale={dim_tup_l[0][0]}:-2", "setsar=1"]
+        elif layout == "hstack" and dim_tup[1] != dim_tup_l[0][1]:
+            filter_str_l = [f"scale=-2:{dim_tup_l[0][1]}", "setsar=1"]
+        else:
+            filter_str_l = []
+
+        if extend_duration > 0 and not loop:
+            if extend_mode == "freeze":
+                filter_str_l.append(f"tpad=stop_mode=clone:stop_duration={extend_duration:.6f}")
+            elif extend_mode == "black":
+                filter_str_l.append(f"tpad=stop_mode=add:color=black:stop_duration={extend_duration:.6f}")
+            else:
+                raise ValueError(f"Unrecognized {extend_mode=}")
+
+        graph_part_l.append(f"[{label}]{','.join(filter_str_l) or 'null'}[cell{vid_pipeline_i}]")
+
+    cell_label_str = "".join(f"[cell{vid_pipeline_i}]" for vid_pipeline_i in range(len(vid_pipeline_l)))
+    if len(vid_pipeline_l) == 1:
+        graph_part_l.append(f"{cell_label_str}null[vout]")
+    elif layout == "grid":
+        cell_w, cell_h = cell_dim_tup
+        layout_str = "|".join(f"{(cell_i % num_cols) * cell_w}_{(cell_i // num_cols) * cell_h}" for cell_i in range(len(vid_pipeline_l)))
+        graph_part_l.append(f"{cell_label_str}xstack=inputs={len(vid_pipeline_l)}:layout={layout_str}:fill=black[vout]")
+    else:
+        graph_part_l.append(f"{cell_label_str}{layout}=inputs={len(vid_pipeline_l)}[vout]")
+
+    audio_map_arg_l = []
+    if audio_src == "mix":
+        audio_in_i_l = [first_in_i for first_in_i, vid_pipeline in zip(first_in_i_l, vid_pipeline_l)
+                        if get_vid_probe_data(vid_pipeline.in_vid_path).audio_codec]
+        if audio_in_i_l:
+            graph_part_l.append("".join(f"[{in_i}:a:0]" for in_i in audio_in_i_l) + f"amix=inputs={len(audio_in_i_l)}:duration=longest[aout]")
+            audio_map_arg_l = ["-map", "[aout]"]
+    elif audio_src is not None:
+        if get_vid_probe_data(vid_pipeline_l[audio_src].in_vid_path).audio_codec:
+            graph_part_l.append(f"[{first_in_i_l[audio_src]}:a:0]apad[aout]") # Pad w/ silence if shorter than the output
+            audio_map_arg_l = ["-map", "[aout]"]
+
+    cmd_l = ["ffmpeg", "-y", "-hide_banner"]
+    for in_arg_l, in_vid_path in zip(in_arg_l_l, in_vid_path_l):
+        cmd_l += in_arg_l + ["-i", str(Path(in_vid_path))]
+    cmd_l += ["-filter_complex", ";".join(graph_part_l), "-map", "[vout]", *audio_map_arg_l,
+              "-t", f"{out_duration:.6f}",
+              *_get_ffmpeg_thread_arg_l(), *_get_encoding_arg_l(encoding_profile, STACK_VIDS_ARG_L),
+              str(Path(out_vid_path))]
+
+    prep_out_path(out_vid_path)
+    with ExitStack() as exit_stack:
+        for vid_pipeline in vid_pipeline_l:
+            exit_stack.enter_context(vid_pipeline._tmp_files())
+        _run_cmd(cmd_l)
     if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
     return out_vid_path
 
 
+####################################################################################################
+# Subtitles
+####################################################################################################
+
+class Sub_Cue(NamedTuple):
+    start: float # sec
+    end: float # sec
+    text: str # Plain text, lines separated by "\n", styling & markup are dropped when parsing
+
+
+# Text sub codecs ffmpeg can convert to any of SUB_FORMAT_D's formats, bitmap subs like hdmv_pgs_subtitle can't be
+TEXT_SUB_CODEC_L = ["subrip", "srt", "ass", "ssa", "webvtt", "mov_text", "text", "ttml"]
+
+_SUB_TIME_RE = re.compile(r"(?:(\d+):)?(\d{1,2}):(\d{1,2})(?:[.,](\d+))?")
+_SUB_TIMING_LINE_RE = re.compile(r"^\s*([\d:.,]+)\s*-->\s*([\d:.,]+)")
+# Only SRT / VTT tags & VTT timestamps, so text like "<3" or "5 > 4" is kept
+_SUB_MARKUP_RE = re.compile(r"</?(?:[ibus]|font|c|v|lang|ruby|rt)(?:[\s.][^>]*)?>|<[\d:.]+>", re.IGNORECASE)
+_ASS_OVERRIDE_RE = re.compile(r"{[^}]*}")
+
+
+def _parse_sub_time(time_str):
+    """ "01:02:03,456", "02:03.456" or "1:02:03.45" -> sec """
+    match = _SUB_TIME_RE.fullmatch(time_str.strip())
+    if not match:
+        raise ValueError(f"Invalid sub time: {time_str=}")
+    h, m, s, frac = match.groups()
+    return int(h or 0) * 3600 + int(m) * 60 + int(s) + (int(frac) / 10 ** len(frac) if frac else 0)
+
+
+def _format_sub_time(sec, ms_sep = ",", num_frac_digits = 3, num_h_digits = 2):
+    """ sec -> "01:02:03,456", ms_sep, num_frac_digits & num_h_digits set the format of each sub format """
+    frac_units = round(max(0, sec) * 10 ** num_frac_digits)
+    s, frac = divmod(frac_units, 10 ** num_frac_digits)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:0{num_h_digits}d}:{m:02d}:{s:02d}{ms_sep}{frac:0{num_frac_digits}d}"
+
+
+def _get_plain_sub_text(text):
+    """ Drops <i> like tags & unescapes &amp; like entities of SRT & VTT text """
+    return html.unescape(_SUB_MARKUP_RE.sub("", text)).strip()
+
+
+def _parse_srt_str(sub_str):
+    """ Also parses VTT, cue ids, settings after the end time & blocks w/o a timing line (like WEBVTT / NOTE) are skipped """
+    sub_cue_l = []
+    for block_str in re.split(r"\n\s*\n", sub_str.replace("\r\n", "\n").replace("\r", "\n")):
+        line_l = block_str.strip("\n").split("\n")
+        timing_line_i = next((i for i, line in enumerate(line_l[:2]) if "-->" in line), None)
+        if timing_line_i is None:
+            continue
+        match = _SUB_TIMING_LINE_RE.match(line_l[timing_line_i])
+        if not match:
+            continue
+        text = "\n".join(_get_plain_sub_text(line) for line in line_l[timing_line_i + 1:])
+        sub_cue_l.append(Sub_Cue(_parse_sub_time(match.group(1)), _parse_sub_time(match.group(2)), text.strip("\n")))
+    return sub_cue_l
+
+
+def _get_srt_str(sub_cue_l):
+    return "".join(f"{cue_i}\n{_format_sub_time(cue.start)} --> {_format_sub_time(cue.end)}\n{cue.text}\n\n"
+                   for cue_i, cue in enumerate(sub_cue_l, start = 1))
+
+
+def _get_vtt_str(sub_cue_l):
+    return "WEBVTT\n\n" + "".join(f"{_format_sub_time(cue.start, '.')} --> {_format_sub_time(cue.end, '.')}\n{html.escape(cue.text, quote = False)}\n\n"
+                                  for cue in sub_cue_l)
+
+
+def _parse_ttml_time(time_str, frame_rate, tick_rate):
+    """ Parses TTML clock times like "00:00:01.500" / "00:00:01:12" (frames) & offset times like "1.5s" / "1500ms" / "30f" """
+    time_str = time_str.strip()
+    offset_match = re.fullmatch(r"([\d.]+)(h|ms|m|s|f|t)", time_str)
+    if offset_match:
+        num = float(offset_match.group(1))
+        return num * {"h": 3600, "m": 60, "s": 1, "ms": 0.001, "f": 1 / frame_rate, "t": 1 / tick_rate}[offset_match.group(2)]
+
+    part_l = time_str.split(":")
+    if len(part_l) == 4:
+        h, m, s, frames = part_l
+        return int(h) * 3600 + int(m) * 60 + int(s) + float(frames) / frame_rate
+    return _parse_sub_time(time_str)
+
+
+def _parse_ttml_str(sub_str):
+    import xml.etree.ElementTree as ET
+
+    root = ET.fromstring(sub_str.encode("utf-8"))
+    attrib_d = {attrib_name.split("}")[-1] : val for attrib_name, val in root.attrib.items()}
+    frame_rate = float(attrib_d.get("frameRate", 30))
+    tick_rate = float(attrib_d.get("tickRate", frame_rate if "frameRate" in attrib_d else 1))
+
+    def get_text(elem): # Only <br/> breaks lines, newlines in the XML are whitespace like any other
+        text = " ".join((elem.text or "").split("\n"))
+        for child in elem:
+            text += "\n" if child.tag.split("}")[-1] == "br" else get_text(child)
+            text += " ".join((child.tail or "").split("\n"))
+        return text
+
+    sub_cue_l = []
+    for p_elem in root.iter():
+        if p_elem.tag.split("}")[-1] != "p" or "begin" not in p_elem.attrib:
+            continue
+        start = _parse_ttml_time(p_elem.attrib["begin"], frame_rate, tick_rate)
+        if "end" in p_elem.attrib:
+            end = _parse_ttml_time(p_elem.attrib["end"], frame_rate, tick_rate)
+        else:
+            end = start + _parse_ttml_time(p_elem.attrib.get("dur", "0s"), frame_rate, tick_rate)
+        text = "\n".join(" ".join(line.split()) for line in get_text(p_elem).split("\n")) # XML whitespace collapses
+        sub_cue_l.append(Sub_Cue(start, end, text.strip("\n")))
+    return sub_cue_l
+
+
+def _get_ttml_str(sub_cue_l):
+    from xml.sax.saxutils import escape
+
+    p_str = "".join(f'      <p begin="{_format_sub_time(cue.start, ".")}" end="{_format_sub_time(cue.end, ".")}">{escape(cue.text).replace(chr(10), "<br/>")}</p>\n'
+                    for cue in sub_cue_l)
+    return ('<?xml version="1.0" encoding="utf-8"?>\n'
+            '<tt xmlns="http://www.w3.org/ns/ttml" xml:lang="en">\n'
+            f'  <body>\n    <div>\n{p_str}    </div>\n  </body>\n</tt>\n')
+
+
+def _parse_ass_str(sub_str):
+    """ Parses the [Events] Dialogue lines of ASS / SSA subs, override tags like {\\i1} are dropped """
+    sub_cue_l = []
+    format_l = None
+    in_events = False
+    for line in sub_str.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            in_events = line.lower() == "[events]"
+        elif in_events and line.startswith("Format:"):
+            format_l = [field.strip().lower() for field in line[len("Format:"):].split(",")]
+        elif in_events and line.startswith("Dialogue:") and format_l:
+            field_d = dict(zip(format_l, line[len("Dialogue:"):].split(",", len(format_l) - 1)))
+            text = _ASS_OVERRIDE_RE.sub("", field_d.get("text", "")).replace("\\N", "\n").replace("\\n", "\n").replace("\\h", " ")
+            sub_cue_l.append(Sub_Cue(_parse_sub_time(field_d["start"]), _parse_sub_time(field_d["end"]), text.strip()))
+    return sorted(sub_cue_l, key = lambda cue: cue.start) # Dialogue lines don't have to be in time order
+
+
+def _get_ass_str(sub_cue_l):
+    dialogue_str = "".join(f"Dialogue: 0,{_format_sub_time(cue.start, '.', 2, 1)},{_format_sub_time(cue.end, '.', 2, 1)},Default,,0,0,0,,{cue.text.replace(chr(10), chr(92) + 'N')}\n"
+                           for cue in sub_cue_l)
+    return ("[Script Info]\nScriptType: v4.00+\n"
+            f"PlayResY: {LIBASS_SRT_PLAY_RES_Y}\n\n"
+            "[V4+ Styles]\n"
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+            "Style: Default,Arial,16,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,1,0,2,10,10,10,1\n\n"
+            "[Events]\n"
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+            f"{dialogue_str}")
+
+
+# Sub file ext -> (parse func, get str func), formats not in here (like .scc) fall back to the tt CLI in convert_subs()
+SUB_FORMAT_D = {".srt"  : (_parse_srt_str,  _get_srt_str),
+                ".vtt"  : (_parse_srt_str,  _get_vtt_str),
+                ".ttml" : (_parse_ttml_str, _get_ttml_str),
+                ".dfxp" : (_parse_ttml_str, _get_ttml_str),
+                ".xml"  : (_parse_ttml_str, _get_ttml_str),
+                ".ass"  : (_parse_ass_str,  _get_ass_str),
+                ".ssa"  : (_parse_ass_str,  _get_ass_str)}
+
+
+def _get_sub_format_tup(sub_path):
+    ext = Path(sub_path).suffix.lower()
+    if ext not in SUB_FORMAT_D:
+        raise ValueError(f"Unsupported sub format {ext=} of {sub_path=}, supported: {list(SUB_FORMAT_D)}")
+    return SUB_FORMAT_D[ext]
+
+
+@functools.lru_cache(maxsize = 1024)
+def _read_subs__cached(file_fingerprint):
+    sub_path = file_fingerprint[0]
+    with open(sub_path, encoding = "utf-8-sig", errors = "replace") as sub_file:
+        return tuple(_get_sub_format_tup(sub_path)[0](sub_file.read()))
+
+
+def read_subs(sub_path):
+    """
+        Returns list of Sub_Cues parsed from sub_path (.srt, .vtt, .ttml, .ass, see SUB_FORMAT_D)
+        - Parsed in-process & cached (LRU) per version of the file, so re-reading the same subs is free
+    """
+    if file_not_exist_msg(sub_path): raise FileNotFoundError(file_not_exist_msg(sub_path))
+    return list(_read_subs__cached(_get_file_fingerprint(sub_path)))
+
+
+def write_subs(sub_cue_l, out_sub_path):
+    """ Writes sub_cue_l to out_sub_path in the format of its ext, see SUB_FORMAT_D """
+    sub_str = _get_sub_format_tup(out_sub_path)[1](sub_cue_l)
+    if _is_dry_run():
+        print(f"Dry run, would write {len(sub_cue_l)} subs to {out_sub_path}")
+        return out_sub_path
+
+    prep_out_path(out_sub_path)
+    with open(out_sub_path, "w", encoding = "utf-8") as out_sub_file:
+        out_sub_file.write(sub_str)
+    return out_sub_path
+
+
+def shift_subs(sub_cue_l, offset):
+    """ Returns sub_cue_l shifted by offset sec, subs shifted to before 0 are dropped or start at 0 if they end after it """
+    return [Sub_Cue(max(0, cue.start + offset), cue.end + offset, cue.text) for cue in sub_cue_l if cue.end + offset > 0]
+
+
+def clip_subs(sub_cue_l, time_tup):
+    """
+        Returns the subs of sub_cue_l that overlap time_tup, clipped to it & shifted to start at 0, like trim_vid()
+        - trim_vid(mode = "copy") starts at the keyframe before time_tup[0], so pass that time to keep subs in sync
+    """
+    t1, t2 = time_tup
+    return shift_subs([Sub_Cue(max(cue.start, t1), min(cue.end, t2), cue.text) for cue in sub_cue_l
+                       if cue.end > t1 and cue.start < t2], -t1)
+
+
+@_incremental_op("out_sub_path", ["in_sub_path"], out_stream_type_l = ["subtitle"])
+def trim_subs(in_sub_path, out_sub_path, time_tup):
+    """ Writes subs of in_sub_path from time_tup[0] to time_tup[1] to out_sub_path, see clip_subs() """
+    write_subs(clip_subs(read_subs(in_sub_path), time_tup), out_sub_path)
+    if file_not_exist_msg(out_sub_path): raise FileNotFoundError(file_not_exist_msg(out_sub_path)) # Raise Error if output not created
+    return out_sub_path
+
+
+def extract_all_embedded_subs(vid_path, out_dir_path = None, out_sub_ext = ".srt"):
+    """
+        Extracts every text sub stream of vid_path in 1 ffmpeg demux pass, returns list of new sub paths
+        - Subs are named like <vid_stem>.<sub stream #>.<lang>.srt, in out_dir_path (defaults to vid_path's dir)
+        - Bitmap sub streams (like PGS / VobSub) can't be converted to text, so are skipped
+    """
+    out_dir_path = out_dir_path or Path(vid_path).parent
+    cmd_l = ["ffmpeg", "-y", "-hide_banner", "-i", str(Path(vid_path))]
+    out_sub_path_l = []
+    sub_stream_d_l = [d for d in get_vid_probe_data(vid_path).stream_d_l if d.get("codec_type") == "subtitle"]
+    for sub_i, stream_d in enumerate(sub_stream_d_l):
+        if stream_d.get("codec_name") not in TEXT_SUB_CODEC_L:
+            print(f"Skipping bitmap sub stream {sub_i} of {vid_path=}, {stream_d.get('codec_name')=}")
+            continue
+        lang = stream_d.get("tags", {}).get("language", "und")
+        out_sub_path = str(Path(out_dir_path) / f"{Path(vid_path).stem}.{sub_i}.{lang}{out_sub_ext}")
+        cmd_l += ["-map", f"0:{stream_d['index']}", out_sub_path]
+        out_sub_path_l.append(out_sub_path)
+
+    if not out_sub_path_l:
+        return []
+
+    for out_sub_path in out_sub_path_l:
+        prep_out_path(out_sub_path)
+    _run_cmd(cmd_l)
+    for out_sub_path in out_sub_path_l:
+        if file_not_exist_msg(out_sub_path): raise FileNotFoundError(file_not_exist_msg(out_sub_path)) # Raise Error if output not created
+    return out_sub_path_l
+
+
 def embed_sub_file_into_vid_file(sub_file_path, in_vid_path, out_vid_path):
     ''' // TMP might not work at all '''
+    import ffmpeg
+
     video = ffmpeg.input(in_vid_path)
     audio = video.audio
-    ffmpeg.concat(video.filter("subtitles", os.path.abspath(sub_file_path)), audio, v=1, a=1).output(out_vid_path).run()
+    _run_cmd(ffmpeg.concat(video.filter("subtitles", os.path.abspath(sub_file_path)), audio, v=1, a=1).output(out_vid_path).overwrite_output().compile())
     if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
 
 # def burn_subs_into_vid(sub_file_path, in_vid_path, out_vid_path):
@@ -399,35 +2307,163 @@ def embed_sub_file_into_vid_file(sub_file_path, in_vid_path, out_vid_path):
 
 
 # TODO move to subtitle utils?
+@_incremental_op("out_sub_path", ["in_sub_path"], out_stream_type_l = ["subtitle"])
 def convert_subs(in_sub_path, out_sub_path):
-    cmd = f'tt convert -i "{in_sub_path}" -o "{out_sub_path}"'
-    print(f"Running {cmd}...")
-    sp.call(cmd, shell=True)
+    """
+        Converts between sub formats in-process, like .ttml -> .srt, see SUB_FORMAT_D
+        - Formats not in SUB_FORMAT_D are converted w/ the tt CLI
+    """
+    if Path(in_sub_path).suffix.lower() in SUB_FORMAT_D and Path(out_sub_path).suffix.lower() in SUB_FORMAT_D:
+        write_subs(read_subs(in_sub_path), out_sub_path)
+    else:
+        _run_cmd(["tt", "convert", "-i", str(Path(in_sub_path)), "-o", str(Path(out_sub_path))])
     if file_not_exist_msg(out_sub_path): raise FileNotFoundError(file_not_exist_msg(out_sub_path)) # Raise Error if output not created
 
 
+@_incremental_op("new_sub_file_path", ["vid_path"], out_stream_type_l = ["subtitle"])
 def extract_embedded_subs_from_vid_to_separate_file(vid_path, new_sub_file_path):
-    cmd = f'ffmpeg -i {vid_path} -map 0:s:0 {new_sub_file_path}'
-    print(f"Running {cmd}...")
-    sp.call(cmd, shell=True)
+    prep_out_path(new_sub_file_path)
+    _run_cmd(["ffmpeg", "-y", "-i", str(Path(vid_path)), "-map", "0:s:0", str(Path(new_sub_file_path))])
     if file_not_exist_msg(new_sub_file_path): raise FileNotFoundError(file_not_exist_msg(new_sub_file_path)) # Raise Error if output not created
 
 
-def convert_vid_to_diff_format__no_subs(in_vid_path, out_vid_path):
-    """ Can use to convert .mp4 to .mkv """
-    fsu.delete_if_exists(out_vid_path)
-    Path(out_vid_path).parent.mkdir(parents=True, exist_ok=True)
+####################################################################################################
+# Container conversion
+####################################################################################################
 
-    cmd = f'ffmpeg -i "{in_vid_path}" -c copy -c:s copy "{out_vid_path}"'
-    print(f"Running {cmd}...")
-    sp.call(cmd, shell=True)
+# Codecs each container can hold as is, per stream type, None means any codec
+# - Streams w/ other codecs are transcoded w/ CONTAINER_TRANSCODE_ARG_D, types not listed (like data) are dropped
+CONTAINER_CODEC_D = {".mp4"  : {"video"    : {"h264", "hevc", "mpeg4", "av1", "vp9"},
+                                "audio"    : {"aac", "mp3", "ac3", "eac3", "opus", "flac", "alac"},
+                                "subtitle" : {"mov_text"}},
+                     ".mov"  : {"video"    : {"h264", "hevc", "mpeg4", "prores", "mjpeg"},
+                                "audio"    : {"aac", "mp3", "ac3", "alac", "pcm_s16le", "pcm_s24le"},
+                                "subtitle" : {"mov_text"}},
+                     ".mkv"  : {"video"    : None,
+                                "audio"    : None,
+                                "subtitle" : {"subrip", "ass", "ssa", "webvtt", "hdmv_pgs_subtitle", "dvd_subtitle"},
+                                "attachment" : None}, # Like fonts for ASS subs
+                     ".webm" : {"video"    : {"vp8", "vp9", "av1"},
+                                "audio"    : {"vorbis", "opus"},
+                                "subtitle" : {"webvtt"}}}
+CONTAINER_CODEC_D[".m4v"] = CONTAINER_CODEC_D[".mp4"]
+
+# Per-stream ffmpeg output args (w/o the ":<stream #>" part) to transcode streams the container can't hold as is
+CONTAINER_TRANSCODE_ARG_D = {".mp4"  : {"video"    : ["-c", "libx264", "-preset", "veryfast", "-crf", "18", "-pix_fmt", "yuv420p"],
+                                        "audio"    : ["-c", "aac", "-b", "192k"],
+                                        "subtitle" : ["-c", "mov_text"]},
+                             ".mov"  : {"video"    : ["-c", "libx264", "-preset", "veryfast", "-crf", "18", "-pix_fmt", "yuv420p"],
+                                        "audio"    : ["-c", "aac", "-b", "192k"],
+                                        "subtitle" : ["-c", "mov_text"]},
+                             ".mkv"  : {"subtitle" : ["-c", "srt"]},
+                             ".webm" : {"video"    : ["-c", "libvpx-vp9", "-crf", "32", "-b", "0"],
+                                        "audio"    : ["-c", "libopus", "-b", "128k"],
+                                        "subtitle" : ["-c", "webvtt"]}}
+CONTAINER_TRANSCODE_ARG_D[".m4v"] = CONTAINER_TRANSCODE_ARG_D[".mp4"]
+
+# Codecs older ffmpeg builds only put in the container w/ "-strict -2" (experimental), newer builds ignore the flag
+CONTAINER_EXPERIMENTAL_CODEC_D = {".mp4" : {"opus", "flac"}}
+CONTAINER_EXPERIMENTAL_CODEC_D[".m4v"] = CONTAINER_EXPERIMENTAL_CODEC_D[".mp4"]
+
+# Bitmap subs can only be copied, never converted to a text sub codec
+BITMAP_SUB_CODEC_L = ["hdmv_pgs_subtitle", "dvd_subtitle", "dvb_subtitle", "xsub"]
+
+
+class Remux_Stream_Action(NamedTuple):
+    in_i: int # Index of the input file
+    stream_i: int # Index of the stream in the input file
+    codec_type: str
+    codec_name: str
+    action: str # "copy", "transcode" or "drop"
+    out_codec: str # None if dropped
+
+
+class Remux_Result(NamedTuple):
+    out_vid_path: str
+    mode: str # "copy" if every kept stream was stream copied, otherwise "transcode"
+    stream_action_l: list
+
+
+def _get_remux_stream_action(in_i, stream_d, out_ext):
+    codec_type = stream_d.get("codec_type")
+    codec_name = stream_d.get("codec_name")
+    make_action = functools.partial(Remux_Stream_Action, in_i, stream_d.get("index"), codec_type, codec_name)
+
+    if out_ext not in CONTAINER_CODEC_D: # Unknown container, let ffmpeg try to copy everything like before
+        return make_action("copy", codec_name)
+
+    codec_d = CONTAINER_CODEC_D[out_ext]
+    if codec_type not in codec_d or stream_d.get("disposition", {}).get("attached_pic"): # Like data streams & cover art
+        return make_action("drop", None)
+    if codec_d[codec_type] is None or codec_name in codec_d[codec_type]:
+        return make_action("copy", codec_name)
+
+    transcode_arg_l = CONTAINER_TRANSCODE_ARG_D.get(out_ext, {}).get(codec_type)
+    if transcode_arg_l is None or (codec_type == "subtitle" and codec_name in BITMAP_SUB_CODEC_L):
+        return make_action("drop", None)
+    return make_action("transcode", transcode_arg_l[transcode_arg_l.index("-c") + 1])
+
+
+def _get_remux_cmd_l(in_path_l, out_vid_path, stream_action_l):
+    out_ext = Path(out_vid_path).suffix.lower()
+    cmd_l = ["ffmpeg", "-y", "-hide_banner"]
+    for in_path in in_path_l:
+        cmd_l += ["-i", str(Path(in_path))]
+
+    out_stream_i = 0
+    for stream_action in stream_action_l:
+        if stream_action.action == "drop":
+            continue
+        cmd_l += ["-map", f"{stream_action.in_i}:{stream_action.stream_i}"]
+        if stream_action.action == "copy":
+            cmd_l += [f"-c:{out_stream_i}", "copy"]
+            if stream_action.codec_name == "hevc" and out_ext in (".mp4", ".m4v", ".mov"): # So Apple players play it
+                cmd_l += [f"-tag:{out_stream_i}", "hvc1"]
+        else:
+            transcode_arg_l = CONTAINER_TRANSCODE_ARG_D[out_ext][stream_action.codec_type]
+            for arg_i in range(0, len(transcode_arg_l), 2):
+                cmd_l += [f"{transcode_arg_l[arg_i]}:{out_stream_i}", transcode_arg_l[arg_i + 1]]
+        out_stream_i += 1
+
+    if any(stream_action.action == "transcode" for stream_action in stream_action_l):
+        cmd_l += _get_ffmpeg_thread_arg_l()
+    if any(stream_action.action == "copy" and stream_action.out_codec in CONTAINER_EXPERIMENTAL_CODEC_D.get(out_ext, ())
+           for stream_action in stream_action_l):
+        cmd_l += ["-strict", "-2"]
+    return cmd_l + [str(Path(out_vid_path))]
+
+
+def remux_vid(in_path_l, out_vid_path):
+    """
+        Puts every stream of in_path_l (vids & sub files) into out_vid_path's container, returns Remux_Result
+        - Streams out_vid_path's container can hold are stream copied, only the others are transcoded, like .srt subs
+          -> mov_text for .mp4, see CONTAINER_CODEC_D & CONTAINER_TRANSCODE_ARG_D
+        - Streams that can't be converted (like bitmap subs into .mp4) are dropped
+    """
+    out_ext = Path(out_vid_path).suffix.lower()
+    stream_action_l = [_get_remux_stream_action(in_i, stream_d, out_ext)
+                       for in_i, in_path in enumerate(in_path_l)
+                       for stream_d in get_vid_probe_data(in_path).stream_d_l]
+
+    prep_out_path(out_vid_path)
+    _run_cmd(_get_remux_cmd_l(in_path_l, out_vid_path, stream_action_l))
     if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
 
+    mode = "transcode" if any(stream_action.action == "transcode" for stream_action in stream_action_l) else "copy"
+    print(f"Remuxed to {out_vid_path} w/ {mode=}: " + ", ".join(f"{a.codec_type} {a.codec_name} -> {a.action}" for a in stream_action_l))
+    return Remux_Result(out_vid_path, mode, stream_action_l)
+
+
+@_incremental_op("out_vid_path", ["in_vid_path"])
+def convert_vid_to_diff_format__no_subs(in_vid_path, out_vid_path):
+    """ Can use to convert .mp4 to .mkv, only transcodes streams the new container can't hold, see remux_vid() """
+    remux_vid([in_vid_path], out_vid_path)
+
 
 def convert_to_mp4(mkv_file): # TODO remove?
     name, ext = os.path.splitext(mkv_file)
     out_name = name + ".mp4"
-    ffmpeg.input(mkv_file).output(out_name).run()
+    remux_vid([mkv_file], out_name)
     print("Finished converting {}".format(mkv_file))
 
 
@@ -441,12 +2477,10 @@ def convert_to_mp4(mkv_file): # TODO remove?
 #     print(f"Running {cmd}...")
 #     sp.call(cmd, shell=True)
 
+@_incremental_op("out_mkv_path", ["in_mp4_path", "in_sub_path"])
 def combine_mp4_and_sub_into_mkv(in_mp4_path, in_sub_path, out_mkv_path):
-    """ sub may need to be .srt """
-    cmd = f'ffmpeg -i {in_mp4_path} -i {in_sub_path} -c copy -c:s copy {out_mkv_path}'
-    print(f"Running {cmd}...")
-    sp.call(cmd, shell=True)
-    if file_not_exist_msg(out_mkv_path): raise FileNotFoundError(file_not_exist_msg(out_mkv_path)) # Raise Error if output not created
+    """ Sub is converted if out_mkv_path's container can't hold it as is, like mov_text subs into .mkv, see remux_vid() """
+    remux_vid([in_mp4_path, in_sub_path], out_mkv_path)
 
 
 # def burn_subs_into_vid(in_vid_path, in_sub_path, out_vid_path):
@@ -487,32 +2521,316 @@ def combine_mp4_and_sub_into_mkv(in_mp4_path, in_sub_path, out_mkv_path):
 
 
 
-def burn_subs_into_vid(in_vid_path, in_sub_path, out_vid_path, 
-                       sub_pos_tup = ("center", "bottom"), font_name = 'Arial', font_size = 24, font_color = 'white', stroke_color = 'black', stroke_width = 1, num_threads = 8):
-    if in_vid_path != out_vid_path:
-        fsu.delete_if_exists(out_vid_path)
-    Path(out_vid_path).parent.mkdir(parents=True, exist_ok=True)
+# libass renders .srt subs on a canvas this tall, then scales it to the vid's height
+LIBASS_SRT_PLAY_RES_Y = 288
+
+
+def _color_to_ass_color(color):
+    """ 'white', '#FFA500', etc. -> '&H00FFFFFF' (ASS colors are &HAABBGGRR) """
+    import PIL.ImageColor
+
+    r, g, b = PIL.ImageColor.getrgb(color)[:3]
+    return f"&H00{b:02X}{g:02X}{r:02X}"
+
+
+def _get_ass_alignment(sub_pos_tup):
+    """ ("center", "bottom") -> 2, uses numpad layout like ASS, only supports MoviePy's str positions """
+    h_pos, v_pos = sub_pos_tup
+    h_pos_d = {"left": 1, "center": 2, "right": 3}
+    v_pos_d = {"bottom": 0, "center": 3, "top": 6}
+    if h_pos not in h_pos_d or v_pos not in v_pos_d:
+        raise ValueError(f"ffmpeg subtitle engine only supports str positions like ('center', 'bottom'), use engine='moviepy' for {sub_pos_tup=}")
+    return h_pos_d[h_pos] + v_pos_d[v_pos]
+
+
+def _get_ass_force_style(vid_h, sub_pos_tup, font_name, font_size, font_color, stroke_color, stroke_width):
+    """ Maps burn_subs_into_vid()'s MoviePy TextClip params to an ASS force_style str for ffmpeg's subtitles filter """
+    # font_size & stroke_width are in vid pixels, but libass measures them in LIBASS_SRT_PLAY_RES_Y units
+    px_to_play_res = LIBASS_SRT_PLAY_RES_Y / vid_h
+
+    return ",".join([f"Fontname={font_name}",
+                     f"Fontsize={round(font_size * px_to_play_res, 2)}",
+                     f"PrimaryColour={_color_to_ass_color(font_color)}",
+                     f"OutlineColour={_color_to_ass_color(stroke_color)}",
+                     "BorderStyle=1",
+                     f"Outline={round(stroke_width * px_to_play_res, 2)}",
+                     "Shadow=0",
+                     f"Alignment={_get_ass_alignment(sub_pos_tup)}"])
+
+
+class _Sub_Glyph_Cache:
+    """ Thread-safe LRU cache of rendered subs, bounded by the bytes of the cached imgs (SUB_GLYPH_CACHE_MAX_BYTES) """
+    def __init__(self):
+        self._img_tup_d = collections.OrderedDict()
+        self._num_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._img_tup_d:
+                return None
+            self._img_tup_d.move_to_end(key)
+            return self._img_tup_d[key]
+
+    def put(self, key, img_tup):
+        img_num_bytes = sum(img.nbytes for img in img_tup)
+        with self._lock:
+            if key in self._img_tup_d or img_num_bytes > SUB_GLYPH_CACHE_MAX_BYTES:
+                return
+            self._img_tup_d[key] = img_tup
+            self._num_bytes += img_num_bytes
+            while self._num_bytes > SUB_GLYPH_CACHE_MAX_BYTES:
+                _, evicted_img_tup = self._img_tup_d.popitem(last = False)
+                self._num_bytes -= sum(img.nbytes for img in evicted_img_tup)
+
+    def clear(self):
+        with self._lock:
+            self._img_tup_d.clear()
+            self._num_bytes = 0
+
+
+_sub_glyph_cache = _Sub_Glyph_Cache()
 
 
+def clear_sub_glyph_cache():
+    """ Only clears the in-process cache, delete SUB_GLYPH_CACHE_DIR_PATH to clear the on-disk cache """
+    _sub_glyph_cache.clear()
+
+
+def _get_sub_glyph_disk_path(key):
+    return os.path.join(SUB_GLYPH_CACHE_DIR_PATH, hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest() + ".npz")
+
+
+def _render_sub_glyph_img_tup(txt, font_name, font_size, font_color, stroke_color, stroke_width):
+    """ Returns (rgb_img, mask_img) of txt rendered by MoviePy's TextClip (ImageMagick) """
+    from moviepy.editor import TextClip
+
+    text_clip = TextClip(txt, font=font_name, fontsize=font_size, color=font_color, stroke_color=stroke_color, stroke_width=stroke_width, print_cmd=True)
+    img_tup = (text_clip.get_frame(0), text_clip.mask.get_frame(0))
+    text_clip.close()
+    return img_tup
+
+
+def get_sub_glyph_img_tup(txt, font_name, font_size, font_color, stroke_color, stroke_width):
+    """
+        Returns (rgb_img, mask_img) of txt rendered like TextClip(), only renders each distinct sub once
+        - Cached in-process (LRU, bounded by SUB_GLYPH_CACHE_MAX_BYTES) & on disk at SUB_GLYPH_CACHE_DIR_PATH if set
+        - Do not modify the returned imgs, they are shared w/ the cache
+    """
+    import numpy as np
+
+    key = (txt, font_name, font_size, font_color, stroke_color, stroke_width)
+    img_tup = _sub_glyph_cache.get(key)
+    if img_tup is not None:
+        return img_tup
+
+    disk_path = _get_sub_glyph_disk_path(key) if SUB_GLYPH_CACHE_DIR_PATH else None
+    if disk_path and Path(disk_path).is_file():
+        try:
+            with np.load(disk_path) as npz:
+                img_tup = (npz["rgb_img"], npz["mask_img"])
+        except (OSError, ValueError, KeyError): # Partially written by a killed process
+            img_tup = None
+
+    if img_tup is None:
+        img_tup = _render_sub_glyph_img_tup(*key)
+        if disk_path:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            tmp_disk_path = f"{disk_path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+            np.savez(tmp_disk_path, rgb_img = img_tup[0], mask_img = img_tup[1])
+            os.replace(tmp_disk_path, disk_path)
+
+    for img in img_tup:
+        img.setflags(write = False)
+    _sub_glyph_cache.put(key, img_tup)
+    return img_tup
+
+
+def _get_sub_glyph_clip(txt, font_name, font_size, font_color, stroke_color, stroke_width):
+    """ Drop-in for the TextClip SubtitlesClip's generator makes per sub, but built from get_sub_glyph_img_tup() """
+    from moviepy.editor import ImageClip
+
+    rgb_img, mask_img = get_sub_glyph_img_tup(txt, font_name, font_size, font_color, stroke_color, stroke_width)
+    return ImageClip(rgb_img).set_mask(ImageClip(mask_img, ismask = True))
+
+
+def _burn_subs_into_vid__moviepy(in_vid_path, in_sub_path, out_vid_path, sub_pos_tup, font_name, font_size, font_color,
+                                 stroke_color, stroke_width, num_threads, encoding_profile, num_chunks):
+    if num_chunks != 1:
+        raise ValueError(f"Chunked encoding is only supported by the ffmpeg engine, {num_chunks=}")
+    if _is_dry_run():
+        print(f"Dry run, would render subs of {in_sub_path} onto frames of {in_vid_path} w/ MoviePy into {out_vid_path}")
+        return
+
+    from moviepy.editor import VideoFileClip, CompositeVideoClip
+    from moviepy.video.tools.subtitles import SubtitlesClip
+
     video = VideoFileClip(in_vid_path)
 
-    generator = lambda txt: TextClip(txt, font=font_name, fontsize=font_size, color=font_color, stroke_color='black', stroke_width=stroke_width, print_cmd=True)
+    # Repeated subs (like "[laughs]") are only rendered once per process, see get_sub_glyph_img_tup()
+    generator = lambda txt: _get_sub_glyph_clip(txt, font_name, font_size, font_color, stroke_color, stroke_width)
 
-    subtitles = SubtitlesClip(in_sub_path, generator)
+    subtitles = SubtitlesClip([((cue.start, cue.end), cue.text) for cue in read_subs(in_sub_path)], generator)
 
     result = CompositeVideoClip([video, subtitles.set_pos(sub_pos_tup)])
 
     # Currently set to output highest quality and prioritize speed over final file size
     # preset="ultrafast" does not affect quality, just gets it done faster while creating larger file
-    result.write_videofile(out_vid_path, fps=video.fps, temp_audiofile="temp-audio.m4a", remove_temp=True, codec="libx264", audio_codec="aac",
-                           preset="ultrafast",
-                           bitrate='8000k',
-                           threads = num_threads,
-                           ffmpeg_params = ['-crf', '0'])
+    # temp audio goes in a per-job temp dir, so jobs running in the same CWD don't overwrite each other's
+    with tempfile.TemporaryDirectory() as tmp_dir_path:
+        result.write_videofile(str(out_vid_path), fps=video.fps, temp_audiofile=os.path.join(tmp_dir_path, "temp-audio.m4a"), remove_temp=True, codec="libx264", audio_codec="aac",
+                               preset="ultrafast",
+                               bitrate='8000k',
+                               threads = num_threads,
+                               ffmpeg_params = _get_encoding_arg_l(encoding_profile, ['-crf', '0'])) # Overrides args above
+    video.close()
+
+
+def _get_sub_xy(sub_pos_tup, vid_dim_tup, sub_dim_tup):
+    """ Top left (x, y) of a sub of sub_dim_tup placed like MoviePy's set_pos(sub_pos_tup), strs like "center" or px """
+    xy_l = []
+    for pos, vid_len, sub_len in zip(sub_pos_tup, vid_dim_tup, sub_dim_tup):
+        if pos in ("left", "top"):
+            xy_l.append(0)
+        elif pos == "center":
+            xy_l.append(int((vid_len - sub_len) / 2))
+        elif pos in ("right", "bottom"):
+            xy_l.append(vid_len - sub_len)
+        else:
+            xy_l.append(int(pos))
+    return tuple(xy_l)
+
+
+def _get_sub_overlay_tup(txt, vid_dim_tup, sub_pos_tup, font_name, font_size, font_color, stroke_color, stroke_width):
+    """ Returns (y_slice, x_slice, rgb * alpha, 1 - alpha) to blend sub txt onto frames, or None if it's off screen """
+    import numpy as np
+
+    rgb_img, mask_img = get_sub_glyph_img_tup(txt, font_name, font_size, font_color, stroke_color, stroke_width)
+    sub_h, sub_w = mask_img.shape
+    x, y = _get_sub_xy(sub_pos_tup, vid_dim_tup, (sub_w, sub_h))
+
+    # Clip to the frame
+    x1, y1 = max(0, x), max(0, y)
+    x2, y2 = min(vid_dim_tup[0], x + sub_w), min(vid_dim_tup[1], y + sub_h)
+    if x1 >= x2 or y1 >= y2:
+        return None
+
+    alpha = mask_img[y1 - y:y2 - y, x1 - x:x2 - x, np.newaxis].astype(np.float32)
+    return (slice(y1, y2), slice(x1, x2), rgb_img[y1 - y:y2 - y, x1 - x:x2 - x] * alpha, 1 - alpha)
+
+
+def _burn_subs_into_vid__stream(in_vid_path, in_sub_path, out_vid_path, sub_pos_tup, font_name, font_size, font_color,
+                                stroke_color, stroke_width, num_threads, encoding_profile, num_chunks):
+    """
+        Same look as the MoviePy engine, but streams frames from 1 ffmpeg pipe into another & blends subs w/ NumPy
+        - Only 1 frame is held at a time & rendered subs are capped at SUB_GLYPH_CACHE_MAX_BYTES, so RSS doesn't grow
+          w/ vid length
+        - Audio is copied from in_vid_path by the encoding ffmpeg, so no temp files
+    """
+    if num_chunks != 1:
+        raise ValueError(f"Chunked encoding is only supported by the ffmpeg engine, {num_chunks=}")
+    if _is_dry_run():
+        print(f"Dry run, would stream frames of {in_vid_path} into {out_vid_path} w/ subs of {in_sub_path} burned in")
+        return
+
+    import numpy as np
+
+    probe_data = get_vid_probe_data(in_vid_path)
+    vid_dim_tup = (probe_data.w, probe_data.h)
+    sub_cue_l = sorted(read_subs(in_sub_path), key = lambda cue: cue.start)
+    sub_start_time_l = [cue.start for cue in sub_cue_l]
+
+    overlay_tup = None
+    overlay_cue = None
+    blend_buf = None
+    # Same default quality as the MoviePy engine
+    with Vid_Frame_Writer(out_vid_path, vid_dim_tup, probe_data.fps, audio_src_vid_path = in_vid_path,
+                          encoding_profile = encoding_profile, num_threads = num_threads,
+                          out_arg_l = ["-c:v", "libx264", "-preset", "ultrafast", "-crf", "0", "-pix_fmt", "yuv420p",
+                                       "-c:a", "aac"]) as vid_frame_writer:
+        for frame_i, frame in enumerate(iter_vid_frames(in_vid_path)):
+            frame_time = frame_i / probe_data.fps
+            cue_i = bisect.bisect_right(sub_start_time_l, frame_time) - 1
+            cue = sub_cue_l[cue_i] if cue_i >= 0 and frame_time < sub_cue_l[cue_i].end else None
+
+            if cue is not overlay_cue: # Subs last many frames, so only prep each one's overlay once
+                overlay_cue = cue
+                overlay_tup = None
+                if cue is not None and cue.text.strip():
+                    overlay_tup = _get_sub_overlay_tup(cue.text, vid_dim_tup, sub_pos_tup, font_name, font_size, font_color,
+                                                       stroke_color, stroke_width)
+                    blend_buf = np.empty_like(overlay_tup[2]) if overlay_tup else None
+
+            if overlay_tup is not None:
+                y_slice, x_slice, rgb_x_alpha, inv_alpha = overlay_tup
+                region = frame[y_slice, x_slice]
+                np.multiply(region, inv_alpha, out = blend_buf)
+                blend_buf += rgb_x_alpha
+                region[:] = blend_buf
+
+            vid_frame_writer.write(frame)
+
+
+def _burn_subs_into_vid__ffmpeg(in_vid_path, in_sub_path, out_vid_path, sub_pos_tup, font_name, font_size, font_color,
+                                stroke_color, stroke_width, num_threads, encoding_profile, num_chunks):
+    force_style = _get_ass_force_style(get_vid_dims(in_vid_path)[1], sub_pos_tup, font_name, font_size, font_color,
+                                       stroke_color, stroke_width)
+
+    # Default is same output quality as the MoviePy engine
+    burn_subs_arg_l = _get_encoding_arg_l(encoding_profile, ["-c:v", "libx264",
+                                                             "-preset", "ultrafast",
+                                                             "-crf", "0",
+                                                             "-c:a", "aac"])
+    if num_chunks == 1:
+        burn_subs_arg_l += ["-threads", str(num_threads)]
+    Vid_Pipeline(in_vid_path).burn_subs(in_sub_path, force_style).run(out_vid_path, out_arg_l = burn_subs_arg_l,
+                                                                      num_chunks = num_chunks)
+
+
+@_incremental_op("out_vid_path", ["in_vid_path", "in_sub_path"])
+def burn_subs_into_vid(in_vid_path, in_sub_path, out_vid_path, 
+                       sub_pos_tup = ("center", "bottom"), font_name = 'Arial', font_size = 24, font_color = 'white', stroke_color = 'black', stroke_width = 1, num_threads = 8,
+                       engine = "moviepy", encoding_profile = None, num_chunks = 1):
+    """
+        engine:
+            "moviepy" - Default, renders each sub w/ MoviePy TextClip (ImageMagick) & composites frames in Python,
+                        supports any sub_pos_tup MoviePy does, like pixel positions
+            "ffmpeg"  - Burns subs w/ ffmpeg's subtitles / ass filter (libass), frames never enter Python, much faster
+                        - Font params are mapped to an ASS style, .ass subs keep their own styling
+                        - sub_pos_tup must be strs like ("center", "bottom")
+            "stream"  - Same look as "moviepy", but streams 1 frame at a time between ffmpeg pipes, so memory stays flat
+                        on long vids & many jobs can run at once, see _burn_subs_into_vid__stream()
+        encoding_profile - Key of ENCODING_PROFILE_D, defaults to lossless x264
+        num_chunks - If > 1, splits the vid at keyframes & burns subs into that many chunks in parallel (ffmpeg engine only)
+                     - num_threads is ignored, each chunk gets an even share of the cores
+    """
+    if in_vid_path != out_vid_path:
+        prep_out_path(out_vid_path)
+
+    if FFMPEG_THREADS is not None:
+        num_threads = min(num_threads, FFMPEG_THREADS)
+
+    if engine == "ffmpeg":
+        burn_subs_func = _burn_subs_into_vid__ffmpeg
+    elif engine == "stream":
+        burn_subs_func = _burn_subs_into_vid__stream
+    elif engine == "moviepy":
+        burn_subs_func = _burn_subs_into_vid__moviepy
+    else:
+        raise ValueError(f"Unrecognized {engine=}")
 
+    # Can't have ffmpeg overwrite the vid it's reading from
+    tmp_out_vid_path = out_vid_path
+    if Path(in_vid_path).resolve() == Path(out_vid_path).resolve():
+        tmp_out_vid_path = Path(out_vid_path).with_name(f"{Path(out_vid_path).stem}__burning_subs{Path(out_vid_path).suffix}")
 
+    burn_subs_func(in_vid_path, in_sub_path, tmp_out_vid_path, sub_pos_tup, font_name, font_size, font_color,
+                   stroke_color, stroke_width, num_threads, encoding_profile, num_chunks)
+    if tmp_out_vid_path != out_vid_path and not _is_dry_run():
+        os.replace(tmp_out_vid_path, out_vid_path)
 
     if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
+    return out_vid_path
 
 
 
@@ -523,13 +2841,17 @@ class FFProbeResult(NamedTuple):
     error: str
 
 
+def _get_ffprobe_cmd_l(file_path):
+    return ["ffprobe",
+            "-v", "quiet",
+            "-print_format", "json",
+            "-show_format",
+            "-show_streams",
+            file_path]
+
+
 def _ffprobe(file_path) -> FFProbeResult:
-    command_array = ["ffprobe",
-                     "-v", "quiet",
-                     "-print_format", "json",
-                     "-show_format",
-                     "-show_streams",
-                     file_path]
+    command_array = _get_ffprobe_cmd_l(file_path)
     result = subprocess.run(command_array, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
     return FFProbeResult(return_code=result.returncode,
                          json=result.stdout,
@@ -539,16 +2861,8 @@ def ffprobe_to_d(in_vid_path):
     # fsu.delete_if_exists(out_json_path)
     # Path(out_json_path).parent.mkdir(parents=True, exist_ok=True)
 
-    ffprobe_result = _ffprobe(in_vid_path)
-    if ffprobe_result.return_code == 0:
-        # # Print the raw json string
-        # print(ffprobe_result.json)
-
-        # or print a summary of each stream
-        d = json.loads(ffprobe_result.json)
-        return d
-    else:
-        raise ValueError(f"Return code does not equal 0: {ffprobe_result.return_code=}")
+    # Copy so callers can't modify the cached dict
+    return copy.deepcopy(get_vid_probe_data(in_vid_path).ffprobe_d)
 
 def ffprobe_to_json(in_vid_path, out_json_path):
     # fsu.delete_if_exists(out_json_path)
@@ -557,6 +2871,978 @@ def ffprobe_to_json(in_vid_path, out_json_path):
     ju.write(ffprobe_result_d, out_json_path)
 
 
+####################################################################################################
+# Frame access
+####################################################################################################
+
+def iter_vid_frames(vid_path, out_dim_tup = None, gray = False, every_n_sec = None, reuse_buffer = True):
+    """
+        Yields frames of vid_path as NumPy uint8 arrays, shape (h, w, 3) RGB or (h, w) if gray
+        - Decoded by ffmpeg & read straight from a rawvideo pipe into the array, no per-frame copies like MoviePy
+        - out_dim_tup - (w, h) to downscale to, done inside ffmpeg, so much cheaper than resizing in Python
+        - every_n_sec - Only yield 1 frame per every_n_sec sec (like 0.5), frame i is at i * every_n_sec sec
+        - reuse_buffer - If True, the same array is refilled for every frame, so copy it if you need to keep it
+    """
+    w, h = out_dim_tup or get_vid_dims(vid_path)
+    num_channels = 1 if gray else 3
+
+    filter_str_l = []
+    if every_n_sec:
+        filter_str_l.append(f"fps=1/{every_n_sec}")
+    if out_dim_tup:
+        filter_str_l.append(f"scale={w}:{h}")
+
+    cmd_l = ["ffmpeg", "-hide_banner", "-v", "error", "-i", str(Path(vid_path)), "-map", "0:v:0"]
+    if filter_str_l:
+        cmd_l += ["-vf", ",".join(filter_str_l)]
+    cmd_l += ["-f", "rawvideo", "-pix_fmt", "gray" if gray else "rgb24", "pipe:"]
+
+    return _iter_pipe_frames(cmd_l, (h, w) if gray else (h, w, num_channels), reuse_buffer)
+
+
+def _iter_pipe_frames(cmd_l, frame_shape_tup, reuse_buffer = True):
+    """ Yields frames of frame_shape_tup that ffmpeg cmd_l writes to stdout as rawvideo, see iter_vid_frames() """
+    import numpy as np
+
+    frame_num_bytes = math.prod(frame_shape_tup)
+    proc = sp.Popen(cmd_l, stdout = sp.PIPE)
+    try:
+        frame_buf = np.empty(frame_num_bytes, dtype = np.uint8)
+        while True:
+            if not reuse_buffer:
+                frame_buf = np.empty(frame_num_bytes, dtype = np.uint8)
+
+            # readinto() can return less than a full frame, so keep reading until frame_buf is full
+            frame_buf_mv = memoryview(frame_buf)
+            num_bytes_read = 0
+            while num_bytes_read < frame_num_bytes:
+                chunk_num_bytes = proc.stdout.readinto(frame_buf_mv[num_bytes_read:])
+                if not chunk_num_bytes:
+                    return
+                num_bytes_read += chunk_num_bytes
+
+            yield frame_buf.reshape(frame_shape_tup)
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+
+class Vid_Frame_Writer():
+    """
+        Encodes NumPy uint8 frames into out_vid_path through an ffmpeg rawvideo pipe, use as a context manager
+        - Frames must be shape (h, w, 3) RGB, or (h, w) if gray
+        - audio_src_vid_path - Optional vid to take the audio from
+        - encoding_profile - Key of ENCODING_PROFILE_D, always yuv420p so it plays everywhere, defaults to out_arg_l, or x264
+                             w/ yuv420p
+        - num_threads - Max encoding threads, defaults to FFMPEG_THREADS
+        EXAMPLE:
+            with Vid_Frame_Writer(out_vid_path, (w, h), fps, audio_src_vid_path = in_vid_path) as vid_frame_writer:
+                for frame in iter_vid_frames(in_vid_path):
+                    vid_frame_writer.write(frame)
+    """
+    def __init__(self, out_vid_path, vid_dim_tup, fps, gray = False, audio_src_vid_path = None, encoding_profile = None,
+                 num_threads = None, out_arg_l = None):
+        self.out_vid_path = out_vid_path
+        self.vid_dim_tup = vid_dim_tup
+        self.fps = fps
+        self.gray = gray
+        self.audio_src_vid_path = audio_src_vid_path
+        self.encoding_profile = encoding_profile
+        self.num_threads = num_threads
+        self.out_arg_l = out_arg_l
+        self._proc = None
+
+    def open(self):
+        prep_out_path(self.out_vid_path)
+
+        w, h = self.vid_dim_tup
+        cmd_l = ["ffmpeg", "-y", "-hide_banner", "-v", "error",
+                 "-f", "rawvideo", "-pix_fmt", "gray" if self.gray else "rgb24", "-s", f"{w}x{h}", "-r", str(self.fps),
+                 "-i", "pipe:"]
+        if self.audio_src_vid_path:
+            cmd_l += ["-i", str(Path(self.audio_src_vid_path)), "-map", "0:v", "-map", "1:a?", "-shortest"]
+        cmd_l += ["-threads", str(self.num_threads)] if self.num_threads else _get_ffmpeg_thread_arg_l()
+        encoding_arg_l = _get_encoding_arg_l(self.encoding_profile, self.out_arg_l or ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac"])
+        if self.encoding_profile is not None and "-pix_fmt" not in encoding_arg_l: # Else x264 keeps rgb24's chroma as yuv444p
+            encoding_arg_l += ["-pix_fmt", "yuv420p"]
+        cmd_l += encoding_arg_l
+        cmd_l += [str(Path(self.out_vid_path))]
+
+        self._proc = sp.Popen(cmd_l, stdin = sp.PIPE)
+        return self
+
+    def write(self, frame):
+        import numpy as np
+
+        expected_shape_tup = self.vid_dim_tup[::-1] if self.gray else (*self.vid_dim_tup[::-1], 3)
+        if frame.shape != expected_shape_tup:
+            raise ValueError(f"Frame has wrong shape: {frame.shape=}, {expected_shape_tup=}")
+        self._proc.stdin.write(memoryview(np.ascontiguousarray(frame, dtype = np.uint8)))
+
+    def close(self):
+        self._proc.stdin.close()
+        return_code = self._proc.wait()
+        if return_code != 0:
+            raise ValueError(f"ffmpeg return code does not equal 0: {return_code=}, {self.out_vid_path=}")
+        if file_not_exist_msg(self.out_vid_path): raise FileNotFoundError(file_not_exist_msg(self.out_vid_path)) # Raise Error if output not created
+        return self.out_vid_path
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._proc.kill()
+            self._proc.wait()
+
+
+####################################################################################################
+# Previews
+####################################################################################################
+
+class Vid_Previews(NamedTuple):
+    poster_img_path_l: list
+    sprite_img_path_l: list
+    sprite_vtt_path: str # WebVTT w/ 1 cue per sprite tile, like "sprite_001.jpg#xywh=160,0,160,90", for scrubbing
+    proxy_vid_path: str # None if no proxy was made
+
+
+def _get_sprite_vtt_str(duration, sprite_interval_sec, tile_dim_tup, sprite_grid_tup, sprite_img_name_l):
+    """ Tile i of the sprite sheets shows the frame at i * sprite_interval_sec, filled across each sheet row by row """
+    tile_w, tile_h = tile_dim_tup
+    num_cols, num_rows = sprite_grid_tup
+    sub_cue_l = []
+    for tile_i in range(math.ceil(duration / sprite_interval_sec)):
+        sprite_i, sprite_tile_i = divmod(tile_i, num_cols * num_rows)
+        row_i, col_i = divmod(sprite_tile_i, num_cols)
+        if sprite_i >= len(sprite_img_name_l):
+            break
+        sub_cue_l.append(Sub_Cue(start = tile_i * sprite_interval_sec,
+                                 end = min((tile_i + 1) * sprite_interval_sec, duration),
+                                 text = f"{sprite_img_name_l[sprite_i]}#xywh={col_i * tile_w},{row_i * tile_h},{tile_w},{tile_h}"))
+    return _get_vtt_str(sub_cue_l)
+
+
+def make_vid_previews(vid_path, out_dir_path = None, num_posters = 5, poster_w = 640, sprite_interval_sec = 2,
+                      sprite_tile_w = 160, sprite_grid_tup = (10, 10), proxy_h = 360, proxy_encoding_profile = "draft"):
+    """
+        Makes poster imgs, sprite sheets w/ a WebVTT index & a low-res proxy vid of vid_path in 1 ffmpeg decode pass
+        - If proxy_h is None, only keyframes are decoded (-skip_frame nokey), which is many times faster than a full decode
+        - Posters are spread evenly over the vid, sprite tiles are 1 per sprite_interval_sec, neither is ever upscaled
+        - sprite_grid_tup - (cols, rows) of tiles per sprite sheet, more sheets are added for long vids
+        - Cached per fingerprint of vid_path + these params, so calling again for an unchanged vid just returns the
+          previews made last time, out_dir_path defaults to a dir for each vid version in PREVIEW_CACHE_DIR_PATH
+        - Returns Vid_Previews
+    """
+    vid_probe_data = get_vid_probe_data(vid_path)
+    if vid_probe_data.vid_codec is None or not vid_probe_data.duration:
+        raise Invalid_Vid_Exception(f"Can't make previews of vid w/o a vid stream or duration: {vid_path=}")
+    duration = vid_probe_data.duration
+
+    param_d = {"vid_fingerprint": _get_file_fingerprint(vid_path), "num_posters": num_posters, "poster_w": poster_w,
+               "sprite_interval_sec": sprite_interval_sec, "sprite_tile_w": sprite_tile_w,
+               "sprite_grid_tup": list(sprite_grid_tup), "proxy_h": proxy_h, "proxy_encoding_profile": proxy_encoding_profile}
+    param_hash = hashlib.sha1(json.dumps(param_d).encode("utf-8")).hexdigest()[:16]
+    out_dir_path = os.path.abspath(out_dir_path or Path(PREVIEW_CACHE_DIR_PATH) / f"{Path(vid_path).stem}_{param_hash}")
+    if Path(out_dir_path) in Path(vid_path).resolve().parents:
+        raise ValueError(f"out_dir_path can't contain vid_path, use a sub dir for the previews: {out_dir_path=}, {vid_path=}")
+    manifest_path = os.path.join(out_dir_path, "vid_previews.json")
+
+    # Re-use previews made last time if they were made w/ the same params from the same vid version
+    try:
+        with open(manifest_path) as manifest_file:
+            manifest_d = json.load(manifest_file)
+    except (OSError, ValueError):
+        manifest_d = {}
+    if manifest_d.get("param_d") == json.loads(json.dumps(param_d)):
+        vid_previews = Vid_Previews(**manifest_d["vid_previews_d"])
+        if all(Path(path).is_file() for path in [*vid_previews.poster_img_path_l, *vid_previews.sprite_img_path_l,
+                                                 vid_previews.sprite_vtt_path, vid_previews.proxy_vid_path] if path):
+            print(f"Skipping make_vid_previews(), previews of {vid_path=} are up to date in {out_dir_path=}...")
+            return vid_previews
+
+    tile_h = max(2, round(vid_probe_data.h * sprite_tile_w / vid_probe_data.w / 2) * 2)
+
+    # Everything is written to a unique temp dir & only moved into out_dir_path once done, so a failed run never
+    # leaves half a cache & runs for the same out_dir_path don't write over each other's files
+    if _is_dry_run():
+        tmp_out_dir_path = out_dir_path + ".tmp"
+    else:
+        Path(out_dir_path).parent.mkdir(parents = True, exist_ok = True)
+        tmp_out_dir_path = tempfile.mkdtemp(prefix = f".{Path(out_dir_path).name}.", dir = os.path.dirname(out_dir_path))
+    try:
+        return _make_vid_previews_in_tmp_dir(vid_path, out_dir_path, tmp_out_dir_path, manifest_d, param_d, duration,
+                                             num_posters, poster_w, sprite_interval_sec, sprite_tile_w, tile_h,
+                                             sprite_grid_tup, proxy_h, proxy_encoding_profile)
+    finally:
+        if not _is_dry_run():
+            fsu.delete_if_exists(tmp_out_dir_path)
+
+
+def _make_vid_previews_in_tmp_dir(vid_path, out_dir_path, tmp_out_dir_path, old_manifest_d, param_d, duration,
+                                  num_posters, poster_w, sprite_interval_sec, sprite_tile_w, tile_h,
+                                  sprite_grid_tup, proxy_h, proxy_encoding_profile):
+    """ Runs make_vid_previews()' ffmpeg pass into tmp_out_dir_path, then moves only the files it made into out_dir_path """
+    num_cols, num_rows = sprite_grid_tup
+    poster_interval_sec = duration / num_posters
+
+    filter_str_l = [f"[0:v:0]split={2 if proxy_h is None else 3}[poster_in][sprite_in]{'' if proxy_h is None else '[proxy_in]'}",
+                    f"[poster_in]fps=1/{poster_interval_sec:.6f}:start_time={poster_interval_sec / 2:.6f},"
+                    f"scale='min({poster_w},iw)':-2[poster]",
+                    f"[sprite_in]fps=1/{sprite_interval_sec},scale={sprite_tile_w}:{tile_h},tile={num_cols}x{num_rows}[sprite]"]
+    if proxy_h is not None:
+        filter_str_l.append(f"[proxy_in]scale=-2:'min({proxy_h},ih)'[proxy]")
+
+    cmd_l = ["ffmpeg", "-y", "-hide_banner"]
+    if proxy_h is None:
+        cmd_l += ["-skip_frame", "nokey"]
+    cmd_l += ["-i", str(Path(vid_path)), "-filter_complex", ";".join(filter_str_l),
+              "-map", "[poster]", "-frames:v", str(num_posters), "-q:v", "2", os.path.join(tmp_out_dir_path, "poster_%02d.jpg"),
+              "-map", "[sprite]", "-q:v", "4", os.path.join(tmp_out_dir_path, "sprite_%03d.jpg")]
+    if proxy_h is not None:
+        cmd_l += ["-map", "[proxy]", "-map", "0:a:0?", *_get_ffmpeg_thread_arg_l(),
+                  *_get_encoding_arg_l(proxy_encoding_profile), "-movflags", "+faststart", os.path.join(tmp_out_dir_path, "proxy.mp4")]
+    _run_cmd(cmd_l)
+    if _is_dry_run():
+        return None
+
+    sprite_img_name_l = sorted(path.name for path in Path(tmp_out_dir_path).glob("sprite_*.jpg"))
+    with open(os.path.join(tmp_out_dir_path, "sprites.vtt"), "w", encoding = "utf-8") as vtt_file:
+        vtt_file.write(_get_sprite_vtt_str(duration, sprite_interval_sec, (sprite_tile_w, tile_h), sprite_grid_tup, sprite_img_name_l))
+
+    # Only remove files a previous run made (listed in its manifest), never anything else in out_dir_path
+    Path(out_dir_path).mkdir(parents = True, exist_ok = True)
+    old_vid_previews_d = old_manifest_d.get("vid_previews_d") or {}
+    for old_path in [*old_vid_previews_d.get("poster_img_path_l", []), *old_vid_previews_d.get("sprite_img_path_l", []),
+                     old_vid_previews_d.get("sprite_vtt_path"), old_vid_previews_d.get("proxy_vid_path")]:
+        if old_path and os.path.dirname(os.path.abspath(old_path)) == out_dir_path and os.path.isfile(old_path):
+            os.remove(old_path)
+    poster_img_name_l = sorted(path.name for path in Path(tmp_out_dir_path).glob("poster_*.jpg"))
+    for name in [*poster_img_name_l, *sprite_img_name_l, "sprites.vtt", *([] if proxy_h is None else ["proxy.mp4"])]:
+        if os.path.isfile(os.path.join(tmp_out_dir_path, name)):
+            os.replace(os.path.join(tmp_out_dir_path, name), os.path.join(out_dir_path, name))
+
+    vid_previews = Vid_Previews(poster_img_path_l = [os.path.join(out_dir_path, name) for name in poster_img_name_l],
+                                sprite_img_path_l = [os.path.join(out_dir_path, name) for name in sprite_img_name_l],
+                                sprite_vtt_path = os.path.join(out_dir_path, "sprites.vtt"),
+                                proxy_vid_path = None if proxy_h is None else os.path.join(out_dir_path, "proxy.mp4"))
+    for out_path in [*vid_previews.poster_img_path_l[:1], *vid_previews.sprite_img_path_l[:1], vid_previews.proxy_vid_path]:
+        if out_path and file_not_exist_msg(out_path): raise FileNotFoundError(file_not_exist_msg(out_path)) # Raise Error if output not created
+    if not vid_previews.poster_img_path_l or not vid_previews.sprite_img_path_l:
+        raise FileNotFoundError(f"ERROR: ffmpeg made no poster or sprite imgs of {vid_path=} in {out_dir_path=}")
+
+    tmp_manifest_path = os.path.join(tmp_out_dir_path, "vid_previews.json")
+    with open(tmp_manifest_path, "w") as manifest_file:
+        json.dump({"param_d": param_d, "vid_previews_d": vid_previews._asdict()}, manifest_file, indent = 4)
+    os.replace(tmp_manifest_path, os.path.join(out_dir_path, "vid_previews.json"))
+    return vid_previews
+
+
+
+####################################################################################################
+# Encoding profile benchmark
+####################################################################################################
+
+class Encoding_Benchmark_Result(NamedTuple):
+    op_name: str
+    encoding_profile: str
+    wall_time: float # sec
+    fps: float # Frames output per sec of wall time
+    out_size: int # Bytes
+    psnr: float # dB vs "lossless" output of the same op, inf if identical
+    ssim: float # vs "lossless" output of the same op, 1.0 if identical
+
+
+def make_synthetic_test_vid(out_vid_path, vid_dim_tup = (1280, 720), vid_len = 10, fps = 30):
+    """ Generates a test vid locally w/ ffmpeg's testsrc2 & sine sources, lossless so it doesn't limit the quality of any op """
+    prep_out_path(out_vid_path)
+    _run_cmd(["ffmpeg", "-y", "-hide_banner",
+              "-f", "lavfi", "-i", f"testsrc2=size={vid_dim_tup[0]}x{vid_dim_tup[1]}:rate={fps}:duration={vid_len}",
+              "-f", "lavfi", "-i", f"sine=frequency=440:duration={vid_len}",
+              "-c:v", "libx264", "-preset", "ultrafast", "-crf", "0", "-pix_fmt", "yuv420p",
+              "-c:a", "aac", "-shortest",
+              str(Path(out_vid_path))])
+    if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
+    return out_vid_path
+
+
+def _get_psnr_and_ssim(vid_path, ref_vid_path):
+    """ Returns (psnr, ssim) of vid_path vs ref_vid_path, (None, None) if they couldn't be compared """
+    compare_output = sp.run(["ffmpeg", "-hide_banner", "-i", str(Path(vid_path)), "-i", str(Path(ref_vid_path)),
+                             "-lavfi", "[0:v]split[a0][a1];[1:v]split[b0][b1];[a0][b0]psnr;[a1][b1]ssim",
+                             "-f", "null", "-"],
+                            stdout=sp.PIPE, stderr=sp.STDOUT, universal_newlines=True).stdout
+
+    psnr_match = re.search(r'PSNR .*average:(\S+)', compare_output)
+    ssim_match = re.search(r'SSIM .*All:(\S+)', compare_output)
+    return (float(psnr_match.group(1)) if psnr_match else None,
+            float(ssim_match.group(1)) if ssim_match else None)
+
+
+def benchmark_encoding_profiles(out_dir_path, encoding_profile_l = None, vid_dim_tup = (1280, 720), vid_len = 10, fps = 30):
+    """
+        Runs each encoding op w/ each encoding profile on a synthetic test vid & prints wall time, fps, output size &
+        PSNR / SSIM vs the "lossless" profile, so you can pick the fastest profile that's good enough on this machine
+        - encoding_profile_l defaults to all of ENCODING_PROFILE_D
+        - Everything is written under out_dir_path, nothing needs to be downloaded
+        Returns list of Encoding_Benchmark_Result
+    """
+    if encoding_profile_l is None:
+        encoding_profile_l = list(ENCODING_PROFILE_D.keys())
+    w, h = vid_dim_tup
+
+    test_vid_path = make_synthetic_test_vid(os.path.join(out_dir_path, "test_vid.mp4"), vid_dim_tup, vid_len, fps)
+    test_sub_path = os.path.join(out_dir_path, "test_subs.srt")
+    with open(test_sub_path, "w", encoding = "utf-8") as f:
+        for sub_i in range(vid_len):
+            f.write(f"{sub_i + 1}\n00:00:{sub_i:02d},000 --> 00:00:{sub_i:02d},900\nTest subtitle line {sub_i + 1}\n\n")
+
+    op_func_d = {"scale_vid"          : lambda out_vid_path, encoding_profile: scale_vid((w // 2, h // 2), test_vid_path, out_vid_path, encoding_profile = encoding_profile),
+                 "crop_vid"           : lambda out_vid_path, encoding_profile: crop_vid(w // 2, h, w // 4, 0, test_vid_path, out_vid_path, encoding_profile = encoding_profile),
+                 "stack_vids"         : lambda out_vid_path, encoding_profile: stack_vids(test_vid_path, test_vid_path, out_vid_path, encoding_profile = encoding_profile),
+                 "burn_subs_into_vid" : lambda out_vid_path, encoding_profile: burn_subs_into_vid(test_vid_path, test_sub_path, out_vid_path, engine = "ffmpeg", encoding_profile = encoding_profile)}
+
+    encoding_benchmark_result_l = []
+    for op_name, op_func in op_func_d.items():
+        ref_vid_path = os.path.join(out_dir_path, op_name, "ref__lossless.mp4")
+        op_func(ref_vid_path, "lossless")
+
+        for encoding_profile in encoding_profile_l:
+            out_vid_path = os.path.join(out_dir_path, op_name, f"{encoding_profile}.mp4")
+
+            start_time = time.perf_counter()
+            op_func(out_vid_path, encoding_profile)
+            wall_time = time.perf_counter() - start_time
+
+            psnr, ssim = _get_psnr_and_ssim(out_vid_path, ref_vid_path)
+            encoding_benchmark_result_l.append(Encoding_Benchmark_Result(op_name = op_name,
+                                                                         encoding_profile = encoding_profile,
+                                                                         wall_time = wall_time,
+                                                                         fps = vid_len * fps / wall_time,
+                                                                         out_size = os.path.getsize(out_vid_path),
+                                                                         psnr = psnr,
+                                                                         ssim = ssim))
+
+    print(f"\n{'op_name':<20} {'encoding_profile':<17} {'wall_time':>10} {'fps':>8} {'out_size':>12} {'psnr':>8} {'ssim':>8}")
+    for r in encoding_benchmark_result_l:
+        print(f"{r.op_name:<20} {r.encoding_profile:<17} {r.wall_time:>10.2f} {r.fps:>8.1f} {r.out_size:>12} {r.psnr or 0:>8.2f} {r.ssim or 0:>8.4f}")
+    return encoding_benchmark_result_l
+
+
+####################################################################################################
+# Batch jobs
+####################################################################################################
+
+# Ops that jobs (like run_batch(), Job_Queue & plan_op() jobs) can name, so a job file can't call just any function
+BATCH_OP_NAME_L = ["trim_vid", "trim_vid_multi", "get_vid_index", "scale_vid", "crop_vid", "crop_black_border_from_vid_if_needed",
+                   "crop_sides_of_vid_to_match_aspect_ratio", "crop_sides_of_vid_by_percent", "stack_vids", "composite_vids",
+                   "trim_subs", "extract_all_embedded_subs", "embed_sub_file_into_vid_file", "convert_subs",
+                   "extract_embedded_subs_from_vid_to_separate_file", "remux_vid", "convert_vid_to_diff_format__no_subs",
+                   "convert_to_mp4", "combine_mp4_and_sub_into_mkv", "burn_subs_into_vid", "ffprobe_to_json",
+                   "make_vid_previews", "make_synthetic_test_vid", "get_vid_length", "get_vid_dims", "verify_vid"]
+
+
+@dataclass
+class Batch_Job_Result():
+    job: tuple
+    result: object # Return value of op, None if failed
+    error: str # Traceback str, None if succeeded
+    wall_time: float # sec
+    ffmpeg_event_l: list = field(default_factory = list) # "end" Ffmpeg_Progress_Event of each ffmpeg call the job ran
+
+
+def _get_op_func(op):
+    """ op can be a function or the name of an op in BATCH_OP_NAME_L, like "scale_vid" """
+    if callable(op):
+        return op
+    if op not in BATCH_OP_NAME_L:
+        raise ValueError(f"Unrecognized {op=}, must be a function or one of BATCH_OP_NAME_L")
+    return globals()[op]
+
+
+def plan_op(op, *args, **kwargs):
+    """
+        Returns list of cmds (argv lists) op(*args, **kwargs) would run, w/o running them, see dry_run()
+        - op can be a function or its name, like in run_batch()
+    """
+    with dry_run() as planned_cmd_l:
+        _get_op_func(op)(*args, **kwargs)
+    return planned_cmd_l
+
+
+def _init_batch_worker(ffmpeg_threads):
+    global FFMPEG_THREADS
+    FFMPEG_THREADS = ffmpeg_threads
+
+
+def _run_batch_job(job):
+    """ job = (op, args) or (op, args, kwargs), args can also be a dict of kwargs """
+    start_time = time.perf_counter()
+    with record_ffmpeg_events() as ffmpeg_event_l:
+        try:
+            op, args, kwargs = job if len(job) == 3 else (*job, {})
+            if isinstance(args, dict):
+                args, kwargs = (), {**args, **kwargs}
+            result = _get_op_func(op)(*args, **kwargs)
+            return Batch_Job_Result(job, result, None, time.perf_counter() - start_time, ffmpeg_event_l)
+        except Exception:
+            return Batch_Job_Result(job, None, traceback.format_exc(), time.perf_counter() - start_time, ffmpeg_event_l)
+
+
+def run_batch(job_l, num_workers = None, ffmpeg_threads_per_job = None):
+    """
+        Runs each job in job_l in a process pool, returns a Batch_Job_Result for each job (in the same order as job_l)
+        - A failed job does not stop the batch, check Batch_Job_Result.error
+        - job = (op, args) or (op, args, kwargs), like ("scale_vid", ((1080, 960), in_vid_path, out_vid_path))
+        - num_workers defaults to the num of cores
+        - ffmpeg_threads_per_job defaults to num cores // num_workers, so all jobs together use about 1 thread per core
+        - On Windows, must be called from under if __name__ == "__main__":
+        - Prints the ffmpeg time spent by each op at the end, see print_op_timing_summary()
+    """
+    num_cores = os.cpu_count() or 1
+    if num_workers is None:
+        num_workers = num_cores
+    if ffmpeg_threads_per_job is None:
+        ffmpeg_threads_per_job = max(1, num_cores // num_workers)
+
+    print(f"Running {len(job_l)} jobs w/ {num_workers=} & {ffmpeg_threads_per_job=}...")
+
+    with ProcessPoolExecutor(max_workers = num_workers, initializer = _init_batch_worker,
+                             initargs = (ffmpeg_threads_per_job,)) as executor:
+        future_l = [executor.submit(_run_batch_job, job) for job in job_l]
+
+        batch_job_result_l = []
+        for job, future in zip(job_l, future_l):
+            try:
+                batch_job_result_l.append(future.result())
+            except Exception: # Like the worker process crashing or job not being picklable
+                batch_job_result_l.append(Batch_Job_Result(job, None, traceback.format_exc(), 0.0))
+
+    print_op_timing_summary([event for batch_job_result in batch_job_result_l for event in batch_job_result.ffmpeg_event_l])
+
+    num_failed_jobs = sum(1 for batch_job_result in batch_job_result_l if batch_job_result.error is not None)
+    print(f"Finished batch, {num_failed_jobs} / {len(job_l)} jobs failed")
+    return batch_job_result_l
+
+
+
+####################################################################################################
+# Work queue
+####################################################################################################
+
+QUEUE_LEASE_SEC = 60 # A claimed job goes back to the queue if its worker doesn't heartbeat for this long, like if its node died
+QUEUE_POLL_SEC = 2 # How often idle workers check for new jobs
+QUEUE_MAX_ATTEMPTS = 3 # Times a job is tried before it's marked failed
+
+
+class Queued_Job(NamedTuple):
+    job_id: str
+    job: list # [op, args, kwargs], like run_batch() jobs, but must be JSON serializable, so op must be a name
+    attempt_num: int # 1 on the 1st try
+
+
+def _get_job_l(job):
+    """ Normalizes a run_batch() style job to JSON serializable [op, args, kwargs] """
+    op, args, kwargs = job if len(job) == 3 else (*job, {})
+    if isinstance(args, dict):
+        args, kwargs = [], {**args, **kwargs}
+    if not isinstance(op, str):
+        raise ValueError(f"Queued jobs must name their op, like \"scale_vid\", {op=}")
+    return json.loads(json.dumps([op, list(args), kwargs]))
+
+
+class Job_Queue():
+    """
+        Broker that workers on any node claim jobs from, see run_queue_worker()
+        - Jobs are leased to 1 worker at a time, a lease that isn't renewed w/ heartbeat() expires & the job is retried
+        - Failed jobs are retried until they've been tried max_attempts times
+        - Subclasses: Sqlite_Job_Queue (1 db file, ok on 1 node or a local disk) & Dir_Job_Queue (shared dir, like NFS)
+    """
+    def put_l(self, job_l, max_attempts = None):
+        """ Enqueues run_batch() style jobs, returns their job_ids """
+        raise NotImplementedError
+
+    def claim(self, worker_id, lease_sec = None):
+        """ Returns the oldest claimable Queued_Job, leased to worker_id, or None if no job can be claimed """
+        raise NotImplementedError
+
+    def heartbeat(self, job_id, worker_id, lease_sec = None):
+        """ Renews worker_id's lease on job_id, returns False if the lease was already lost """
+        raise NotImplementedError
+
+    def complete(self, job_id, worker_id, result):
+        """ Marks job_id done, returns False (& changes nothing) if worker_id's lease was already lost """
+        raise NotImplementedError
+
+    def fail(self, job_id, worker_id, error):
+        """ Requeues job_id, or marks it failed if it's been tried max_attempts times, returns False if the lease was lost """
+        raise NotImplementedError
+
+    def get_job_d_l(self, status = None):
+        """ Returns dicts of all jobs (or only those w/ status: "queued", "running", "done" or "failed") """
+        raise NotImplementedError
+
+    def get_status_count_d(self):
+        status_count_d = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        for job_d in self.get_job_d_l():
+            status_count_d[job_d["status"]] += 1
+        return status_count_d
+
+
+class Sqlite_Job_Queue(Job_Queue):
+    """ Job_Queue in 1 SQLite db, claims are atomic w/ BEGIN IMMEDIATE, don't put db_path on a network drive """
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents = True, exist_ok = True)
+        with closing(self._connect()) as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS job (job_id INTEGER PRIMARY KEY AUTOINCREMENT, job_json TEXT,
+                            status TEXT, attempt_num INTEGER, max_attempts INTEGER, worker_id TEXT, lease_expire_time REAL,
+                            result_json TEXT, error TEXT)""")
+
+    def _connect(self):
+        # isolation_level = None so BEGIN IMMEDIATE can take the write lock before reading what to claim
+        return sqlite3.connect(self.db_path, timeout = 60, isolation_level = None)
+
+    def put_l(self, job_l, max_attempts = None):
+        max_attempts = max_attempts or QUEUE_MAX_ATTEMPTS
+        job_id_l = []
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for job in job_l:
+                cursor = conn.execute("INSERT INTO job (job_json, status, attempt_num, max_attempts) VALUES (?, 'queued', 0, ?)",
+                                      (json.dumps(_get_job_l(job)), max_attempts))
+                job_id_l.append(str(cursor.lastrowid))
+            conn.execute("COMMIT")
+        return job_id_l
+
+    def claim(self, worker_id, lease_sec = None):
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("""UPDATE job SET status = 'failed', error = 'Lease expired on last attempt', worker_id = NULL
+                            WHERE status = 'running' AND lease_expire_time < ? AND attempt_num >= max_attempts""", (now,))
+            row = conn.execute("""SELECT job_id, job_json, attempt_num FROM job
+                                  WHERE status = 'queued' OR (status = 'running' AND lease_expire_time < ?)
+                                  ORDER BY job_id LIMIT 1""", (now,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE job SET status = 'running', worker_id = ?, lease_expire_time = ?, attempt_num = ? WHERE job_id = ?",
+                             (worker_id, now + (lease_sec or QUEUE_LEASE_SEC), row[2] + 1, row[0]))
+            conn.execute("COMMIT")
+        if row is None:
+            return None
+        return Queued_Job(str(row[0]), json.loads(row[1]), row[2] + 1)
+
+    def heartbeat(self, job_id, worker_id, lease_sec = None):
+        with closing(self._connect()) as conn:
+            cursor = conn.execute("UPDATE job SET lease_expire_time = ? WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                                  (time.time() + (lease_sec or QUEUE_LEASE_SEC), int(job_id), worker_id))
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result):
+        with closing(self._connect()) as conn:
+            cursor = conn.execute("""UPDATE job SET status = 'done', result_json = ?, error = NULL, worker_id = NULL
+                                     WHERE job_id = ? AND worker_id = ? AND status = 'running'""",
+                                  (json.dumps(result, default = str), int(job_id), worker_id))
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        with closing(self._connect()) as conn:
+            cursor = conn.execute("""UPDATE job SET status = CASE WHEN attempt_num >= max_attempts THEN 'failed' ELSE 'queued' END,
+                                     error = ?, worker_id = NULL WHERE job_id = ? AND worker_id = ? AND status = 'running'""",
+                                  (error, int(job_id), worker_id))
+            return cursor.rowcount == 1
+
+    def get_job_d_l(self, status = None):
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            row_l = conn.execute("SELECT * FROM job" + (" WHERE status = ?" if status else "") + " ORDER BY job_id",
+                                 (status,) if status else ()).fetchall()
+        job_d_l = []
+        for row in row_l:
+            job_d = dict(row)
+            job_d["job_id"] = str(job_d["job_id"])
+            job_d["job"] = json.loads(job_d.pop("job_json"))
+            result_json = job_d.pop("result_json")
+            job_d["result"] = json.loads(result_json) if result_json is not None else None
+            job_d_l.append(job_d)
+        return job_d_l
+
+
+class Dir_Job_Queue(Job_Queue):
+    """
+        Job_Queue as 1 json file per job in <dir_path>/<status>/, for a dir shared by all nodes, like over NFS
+        - Claims are atomic renames from queued/ to running/, so only 1 worker gets each job
+        - Leases are the running file's mtime, heartbeat() touches it
+        - Only <job_id>.json files are jobs, other files in the status dirs are other workers' in-progress renames & writes
+    """
+    STATUS_L = ["queued", "running", "done", "failed"]
+
+    def __init__(self, dir_path):
+        self.dir_path = str(dir_path)
+        for status in self.STATUS_L:
+            Path(self.dir_path, status).mkdir(parents = True, exist_ok = True)
+
+    def _get_job_path(self, status, job_id):
+        return os.path.join(self.dir_path, status, f"{job_id}.json")
+
+    def _write_job_d(self, job_path, job_d):
+        tmp_job_path = f"{job_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_job_path, "w") as job_file:
+            json.dump(job_d, job_file, default = str)
+        os.replace(tmp_job_path, job_path)
+
+    def _read_job_d(self, job_path):
+        try:
+            with open(job_path) as job_file:
+                return json.load(job_file)
+        except (OSError, ValueError): # Moved by another worker or partially written
+            return None
+
+    def put_l(self, job_l, max_attempts = None):
+        job_id_l = []
+        for job in job_l:
+            job_id = f"{time.time_ns()}_{os.urandom(4).hex()}" # Sorts by time, so jobs are claimed in order
+            self._write_job_d(self._get_job_path("queued", job_id),
+                              {"job_id": job_id, "job": _get_job_l(job), "attempt_num": 0,
+                               "max_attempts": max_attempts or QUEUE_MAX_ATTEMPTS, "lease_sec": None,
+                               "worker_id": None, "result": None, "error": None})
+            job_id_l.append(job_id)
+        return job_id_l
+
+    def _requeue_expired_jobs(self):
+        for file_name in os.listdir(os.path.join(self.dir_path, "running")):
+            if not file_name.endswith(".json"):
+                continue
+            running_job_path = os.path.join(self.dir_path, "running", file_name)
+            job_d = self._read_job_d(running_job_path)
+            if job_d is None or job_d.get("lease_sec") is None: # Gone, or not leased yet, so not expired
+                continue
+            try:
+                if os.path.getmtime(running_job_path) + job_d["lease_sec"] >= time.time():
+                    continue
+            except OSError: # Finished or requeued by another worker
+                continue
+            job_d.update(worker_id = None, error = "Lease expired")
+            to_status = "failed" if job_d["attempt_num"] >= job_d["max_attempts"] else "queued"
+            expired_job_path = f"{running_job_path}.{os.getpid()}.{threading.get_ident()}.expired"
+            try: # Rename 1st, so only 1 worker requeues it
+                os.rename(running_job_path, expired_job_path)
+            except OSError:
+                continue
+            self._write_job_d(self._get_job_path(to_status, job_d["job_id"]), job_d)
+            fsu.delete_if_exists(expired_job_path)
+
+    def claim(self, worker_id, lease_sec = None):
+        self._requeue_expired_jobs()
+        for file_name in sorted(os.listdir(os.path.join(self.dir_path, "queued"))):
+            if not file_name.endswith(".json"):
+                continue
+            job_id = file_name[:-len(".json")]
+            # Claimed under a name only this worker uses, so the lease is written before the job shows up in running/
+            claiming_job_path = f"{self._get_job_path('running', job_id)}.{os.getpid()}.{threading.get_ident()}.claiming"
+            try:
+                os.rename(self._get_job_path("queued", job_id), claiming_job_path)
+            except OSError: # Claimed by another worker 1st
+                continue
+            job_d = self._read_job_d(claiming_job_path)
+            job_d.update(attempt_num = job_d["attempt_num"] + 1, worker_id = worker_id, lease_sec = lease_sec or QUEUE_LEASE_SEC)
+            self._write_job_d(claiming_job_path, job_d)
+            os.replace(claiming_job_path, self._get_job_path("running", job_id))
+            return Queued_Job(job_id, job_d["job"], job_d["attempt_num"])
+        return None
+
+    def heartbeat(self, job_id, worker_id, lease_sec = None):
+        running_job_path = self._get_job_path("running", job_id)
+        job_d = self._read_job_d(running_job_path)
+        if job_d is None or job_d["worker_id"] != worker_id:
+            return False
+        if lease_sec and lease_sec != job_d["lease_sec"]:
+            job_d["lease_sec"] = lease_sec
+            self._write_job_d(running_job_path, job_d)
+        try:
+            os.utime(running_job_path)
+        except OSError:
+            return False
+        return True
+
+    def _finish(self, job_id, worker_id, to_status_func, **update_kwargs):
+        running_job_path = self._get_job_path("running", job_id)
+        job_d = self._read_job_d(running_job_path)
+        if job_d is None or job_d["worker_id"] != worker_id: # Lease lost, the job's new worker will finish it
+            return False
+        job_d.update(worker_id = None, **update_kwargs)
+        self._write_job_d(self._get_job_path(to_status_func(job_d), job_id), job_d)
+        fsu.delete_if_exists(running_job_path)
+        return True
+
+    def complete(self, job_id, worker_id, result):
+        return self._finish(job_id, worker_id, lambda job_d: "done", result = result, error = None)
+
+    def fail(self, job_id, worker_id, error):
+        return self._finish(job_id, worker_id, lambda job_d: "failed" if job_d["attempt_num"] >= job_d["max_attempts"] else "queued",
+                            error = error)
+
+    def get_job_d_l(self, status = None):
+        job_d_l = []
+        for status in [status] if status else self.STATUS_L:
+            for file_name in sorted(os.listdir(os.path.join(self.dir_path, status))):
+                job_d = self._read_job_d(os.path.join(self.dir_path, status, file_name)) if file_name.endswith(".json") else None
+                if job_d is not None:
+                    job_d_l.append({**job_d, "status": status})
+        return sorted(job_d_l, key = lambda job_d: job_d["job_id"])
+
+
+def _heartbeat_until_set(job_queue, queued_job, worker_id, lease_sec, stop_event):
+    while not stop_event.wait(lease_sec / 3):
+        if not job_queue.heartbeat(queued_job.job_id, worker_id, lease_sec):
+            print(f"WARNING: Lost lease on job {queued_job.job_id}, another worker may re-run it")
+            return
+
+
+def run_queue_worker(job_queue, worker_id = None, lease_sec = None, poll_sec = None, max_jobs = None, exit_when_empty = False):
+    """
+        Claims & runs jobs from job_queue until killed, returns a Batch_Job_Result for each job it ran
+        - Run on as many nodes as needed, all pointed at the same job_queue, no manual sharding
+        - The lease is renewed in a background thread while a job runs, if the worker dies, the job is retried elsewhere
+        - exit_when_empty - Return once no jobs are queued or running, instead of waiting for more
+        EXAMPLE:
+            job_queue = Dir_Job_Queue("/mnt/shared/vid_jobs")
+            job_queue.put_l([("scale_vid", ((1080, 960), in_vid_path, out_vid_path))]) # On any node
+            run_queue_worker(job_queue) # On each render node
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    lease_sec = lease_sec or QUEUE_LEASE_SEC
+    poll_sec = poll_sec or QUEUE_POLL_SEC
+
+    batch_job_result_l = []
+    while max_jobs is None or len(batch_job_result_l) < max_jobs:
+        queued_job = job_queue.claim(worker_id, lease_sec)
+        if queued_job is None:
+            status_count_d = job_queue.get_status_count_d()
+            if exit_when_empty and not status_count_d["queued"] and not status_count_d["running"]:
+                break
+            time.sleep(poll_sec)
+            continue
+
+        print(f"{worker_id} running job {queued_job.job_id} (attempt {queued_job.attempt_num}): {queued_job.job[0]}...")
+        stop_event = threading.Event()
+        heartbeat_thread = threading.Thread(target = _heartbeat_until_set, daemon = True,
+                                            args = (job_queue, queued_job, worker_id, lease_sec, stop_event))
+        heartbeat_thread.start()
+        try:
+            batch_job_result = _run_batch_job(tuple(queued_job.job))
+        finally:
+            stop_event.set()
+            heartbeat_thread.join()
+
+        if batch_job_result.error is None:
+            is_lease_held = job_queue.complete(queued_job.job_id, worker_id, batch_job_result.result)
+        else:
+            print(f"Job {queued_job.job_id} failed: {batch_job_result.error}")
+            is_lease_held = job_queue.fail(queued_job.job_id, worker_id, batch_job_result.error)
+        if not is_lease_held:
+            print(f"WARNING: Stale lease on job {queued_job.job_id}, its result was dropped, another worker owns it now")
+        batch_job_result_l.append(batch_job_result)
+    return batch_job_result_l
+
+
+def run_queue_workers(job_queue, num_workers = None, ffmpeg_threads_per_job = None, **kwargs):
+    """
+        Runs num_workers run_queue_worker()s on this node in a process pool, like run_batch(), kwargs go to each
+        - Returns Batch_Job_Results of all jobs run by this node's workers
+    """
+    num_cores = os.cpu_count() or 1
+    if num_workers is None:
+        num_workers = num_cores
+    if ffmpeg_threads_per_job is None:
+        ffmpeg_threads_per_job = max(1, num_cores // num_workers)
+
+    with ProcessPoolExecutor(max_workers = num_workers, initializer = _init_batch_worker,
+                             initargs = (ffmpeg_threads_per_job,)) as executor:
+        future_l = [executor.submit(run_queue_worker, job_queue, **kwargs) for _ in range(num_workers)]
+        return [batch_job_result for future in future_l for batch_job_result in future.result()]
+
+
+####################################################################################################
+# Asyncio API
+####################################################################################################
+
+ASYNC_MAX_PROCS = os.cpu_count() or 1 # Max ffmpeg / ffprobe procs the async_* functions run at once, per event loop
+ASYNC_STOP_TIMEOUT = 5 # Sec a cancelled ffmpeg gets to exit after SIGTERM before it's killed
+
+_async_semaphore_d = weakref.WeakKeyDictionary() # Event loop -> asyncio.Semaphore
+_async_probe_future_d = {} # (cmd_tup, file_fingerprint) -> Future of ffprobe's stdout, so async probes of a file share 1 ffprobe
+
+
+def _get_async_semaphore():
+    loop = asyncio.get_running_loop()
+    if loop not in _async_semaphore_d:
+        _async_semaphore_d[loop] = asyncio.Semaphore(ASYNC_MAX_PROCS)
+    return _async_semaphore_d[loop]
+
+
+async def _async_stop_proc(proc):
+    """ SIGTERM lets ffmpeg exit cleanly, kill it if that takes longer than ASYNC_STOP_TIMEOUT """
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        await asyncio.wait_for(proc.wait(), ASYNC_STOP_TIMEOUT)
+    except ProcessLookupError: # Already exited
+        pass
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+
+
+async def _async_run_probe_cmd(cmd_l):
+    """ Returns stdout of ffprobe cmd_l """
+    async with _get_async_semaphore():
+        proc = await asyncio.create_subprocess_exec(*cmd_l, stdin = asyncio.subprocess.DEVNULL,
+                                                    stdout = asyncio.subprocess.PIPE, stderr = asyncio.subprocess.PIPE)
+        try:
+            stdout, stderr = await proc.communicate()
+        except BaseException: # Like asyncio.CancelledError
+            await _async_stop_proc(proc)
+            raise
+
+    if proc.returncode != 0:
+        raise ValueError(f"Return code does not equal 0: {proc.returncode=}, {cmd_l=}, {stderr=}")
+    return stdout.decode()
+
+
+async def _async_get_probe_stdout(cmd_l, file_fingerprint):
+    """ Concurrent & repeated probes of the same version of a file share 1 ffprobe """
+    key = (tuple(cmd_l), file_fingerprint)
+    probe_future = _async_probe_future_d.get(key)
+    if probe_future is None or (not probe_future.done() and probe_future.get_loop() is not asyncio.get_running_loop()):
+        while len(_async_probe_future_d) >= 1024:
+            _async_probe_future_d.pop(next(iter(_async_probe_future_d))) # Oldest
+        probe_future = _async_probe_future_d[key] = asyncio.ensure_future(_async_run_probe_cmd(cmd_l))
+
+    try:
+        return await asyncio.shield(probe_future) # Cancelling 1 caller doesn't cancel the probe for the others
+    except Exception:
+        _async_probe_future_d.pop(key, None)
+        raise
+
+
+async def _async_get_cmd_in_duration_l(cmd_l):
+    in_duration_l = []
+    for in_path, seek_time in _get_cmd_in_path_seek_time_tup_l(cmd_l, vid_only = True):
+        try:
+            in_duration_l.append(max(0.0, await async_get_vid_length(in_path) - seek_time))
+        except Exception: # Not a vid, like a sub file
+            pass
+    return in_duration_l
+
+
+async def _async_run_cmd(cmd_l, partial_out_path_l = (), op_name = None):
+    """
+        Async _run_cmd(), runs at most ASYNC_MAX_PROCS cmds at once
+        - If cancelled, stops the child proc & deletes partial_out_path_l
+        - Returns the "end" Ffmpeg_Progress_Event for ffmpeg cmds, otherwise the return code, None in a dry_run()
+    """
+    if _plan_cmd_if_dry_run(cmd_l):
+        return None
+
+    progress_tracker = None
+    if _tracks_progress(cmd_l):
+        in_duration_l = await _async_get_cmd_in_duration_l(cmd_l) # Before taking a semaphore slot, probing needs one too
+
+    async with _get_async_semaphore():
+        print(f"Running: {sp.list2cmdline(cmd_l)}...")
+        if _tracks_progress(cmd_l):
+            progress_tracker = _Ffmpeg_Progress_Tracker(cmd_l, op_name or _op_name_var.get() or "ffmpeg", in_duration_l)
+            proc = await asyncio.create_subprocess_exec(*_get_progress_cmd_l(cmd_l), stdin = asyncio.subprocess.DEVNULL,
+                                                        stdout = asyncio.subprocess.PIPE)
+        else:
+            proc = await asyncio.create_subprocess_exec(*cmd_l, stdin = asyncio.subprocess.DEVNULL)
+
+        try:
+            if progress_tracker is not None:
+                async for line in proc.stdout:
+                    progress_tracker.feed_line(line.decode())
+            return_code = await proc.wait()
+        except BaseException: # Like asyncio.CancelledError
+            await _async_stop_proc(proc)
+            for partial_out_path in partial_out_path_l:
+                fsu.delete_if_exists(partial_out_path)
+            raise
+
+    if progress_tracker is None:
+        return return_code
+    return progress_tracker.end(return_code)
+
+
+async def async_get_vid_probe_data(vid_file_path):
+    """ Async get_vid_probe_data(), shares its on-disk cache, but not its in-process cache """
+    file_fingerprint = _get_file_fingerprint(vid_file_path)
+    ffprobe_json = _read_probe_cache_db(file_fingerprint)
+    if ffprobe_json is None:
+        ffprobe_json = await _async_get_probe_stdout(_get_ffprobe_cmd_l(file_fingerprint[0]), file_fingerprint)
+        _write_probe_cache_db(file_fingerprint, ffprobe_json)
+    return _ffprobe_d_to_probe_data(json.loads(ffprobe_json))
+
+
+async def async_get_vid_length(filename, error_if_vid_not_exist = True, return_type = "sec_float", time_str_sep = "_"):
+    """ Async get_vid_length() """
+    if error_if_vid_not_exist and not Path(filename).is_file():
+        raise Exception(f"Error: Vid file does not exist: {filename}")
+
+    return _format_vid_length((await async_get_vid_probe_data(filename)).duration, return_type, time_str_sep)
+
+
+async def async_ffprobe_to_d(in_vid_path):
+    """ Async ffprobe_to_d() """
+    return (await async_get_vid_probe_data(in_vid_path)).ffprobe_d # Parsed fresh, so no need to copy
+
+
+async def async_trim_vid(in_vid_path, out_vid_path, time_tup, mode = "copy", encoding_profile = None):
+    """ Async trim_vid(), if cancelled, ffmpeg is stopped & the partial out_vid_path is deleted """
+    probe_data = packet_times_tup = None
+    if mode == "smart":
+        in_vid_fingerprint = _get_file_fingerprint(in_vid_path)
+        probe_data = await async_get_vid_probe_data(in_vid_path)
+        packet_times_tup = _parse_packet_times(await _async_get_probe_stdout(_get_packet_times_cmd_l(in_vid_fingerprint[0]),
+                                                                             in_vid_fingerprint))
+
+    with _op_scope("async_trim_vid"), tempfile.TemporaryDirectory() as tmp_dir_path:
+        for cmd_l in _get_trim_vid_cmd_l(in_vid_path, out_vid_path, time_tup, mode, encoding_profile, tmp_dir_path,
+                                         probe_data, packet_times_tup):
+            await _async_run_cmd(cmd_l, [out_vid_path])
+
+    if file_not_exist_msg(out_vid_path): raise FileNotFoundError(file_not_exist_msg(out_vid_path)) # Raise Error if output not created
+    return out_vid_path
+
+
+async def async_scale_vid(new_vid_dim_tup, in_vid_path, out_vid_path, encoding_profile = None):
+    """ Async scale_vid() """
+    with _op_scope("async_scale_vid"):
+        return await Vid_Pipeline(in_vid_path).scale(new_vid_dim_tup).async_run(out_vid_path, encoding_profile = encoding_profile)
+
+
+async def async_crop_vid(w, h, x, y, in_vid_path, out_vid_path, encoding_profile = None):
+    """ Async crop_vid() """
+    with _op_scope("async_crop_vid"):
+        return await Vid_Pipeline(in_vid_path).crop(w, h, x, y).async_run(out_vid_path, encoding_profile = encoding_profile)
+
+
+async def async_stack_vids(top_vid_path, bottom_vid_path, out_vid_path, encoding_profile = None):
+    """ Async stack_vids() """
+    top_probe_data, bottom_probe_data = await asyncio.gather(async_get_vid_probe_data(top_vid_path),
+                                                             async_get_vid_probe_data(bottom_vid_path))
+    _check_stack_vids_dims((top_probe_data.w, top_probe_data.h), (bottom_probe_data.w, bottom_probe_data.h))
+
+    with _op_scope("async_stack_vids"):
+        return await Vid_Pipeline(top_vid_path).vstack(bottom_vid_path).async_run(out_vid_path,
+                                                                                  out_arg_l = _get_encoding_arg_l(encoding_profile, STACK_VIDS_ARG_L))
+
+
 
 if __name__ == "__main__":
     # import make_tb_vid